@@ -0,0 +1,131 @@
+"""Compares the throughput of HTTP/1.1 and HTTP/2 connection pools against a local stub server.
+
+Every request to the stub server takes `--latency` seconds, like a long-poll `result` call
+that is waiting on a run. With HTTP/1.1 each in-flight request needs its own connection,
+so `--requests` concurrent calls queue on a pool of `--connections` connections, while
+HTTP/2 multiplexes them over a few connections.
+
+Requires `pip install parallel-web[http2] hypercorn trustme`, then run:
+
+    python scripts/benchmarks/http2.py --requests 1000 --connections 20
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+from typing import Any, Dict, List, Callable, Awaitable
+
+import httpx
+import trustme
+from hypercorn.config import Config
+from hypercorn.asyncio import serve
+
+from parallel import AsyncParallel
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def make_app(latency: float) -> Callable[[Scope, Receive, Send], Awaitable[None]]:
+    async def app(scope: Scope, _receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return
+        await asyncio.sleep(latency)
+        body = b'{"run_id":"run_1","status":"completed","is_active":false,"processor":"base"}'
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def start_server(port: int, latency: float, cert_dir: str) -> trustme.CA:
+    ca = trustme.CA()
+    cert = ca.issue_cert("127.0.0.1")
+    cert_file = os.path.join(cert_dir, "cert.pem")
+    key_file = os.path.join(cert_dir, "key.pem")
+    cert.cert_chain_pems[0].write_to_path(cert_file)
+    cert.private_key_pem.write_to_path(key_file)
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.certfile = cert_file
+    config.keyfile = key_file
+    config.alpn_protocols = ["h2", "http/1.1"]
+    config.loglevel = "WARNING"
+    # the default of 100 concurrent streams per connection is what the benchmark should measure
+    config.h2_max_concurrent_streams = 100
+
+    async def run() -> None:
+        # a custom shutdown trigger stops hypercorn from installing signal handlers, which only work on the main thread
+        await serve(make_app(latency), config, shutdown_trigger=asyncio.Event().wait)  # type: ignore[arg-type]
+
+    threading.Thread(target=lambda: asyncio.run(run()), daemon=True).start()
+    # wait for the server to accept connections
+    for _ in range(100):
+        try:
+            httpx.get(f"https://127.0.0.1:{port}", verify=False)
+            break
+        except httpx.TransportError:
+            time.sleep(0.1)
+    return ca
+
+
+async def run_benchmark(*, http2: bool, port: int, requests: int, connections: int) -> float:
+    client = AsyncParallel(
+        api_key="benchmark",
+        base_url=f"https://127.0.0.1:{port}",
+        http2=http2,
+        connection_limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+        max_retries=0,
+    )
+    async with client:
+        # open the connections up front so that the handshakes aren't part of the measurement
+        await client.warmup(n_connections=min(connections, 20))
+
+        start = time.monotonic()
+        results: List[object] = await asyncio.gather(
+            *[client.task_run.retrieve(f"run_{i}") for i in range(requests)],
+        )
+        elapsed = time.monotonic() - start
+
+    assert len(results) == requests
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000, help="number of concurrent requests")
+    parser.add_argument("--connections", type=int, default=20, help="maximum number of pooled connections")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the stub server takes per request")
+    parser.add_argument("--port", type=int, default=8443)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cert_dir:
+        ca = start_server(args.port, args.latency, cert_dir)
+        ca_file = os.path.join(cert_dir, "ca.pem")
+        ca.cert_pem.write_to_path(ca_file)
+        # picked up by httpx when it creates the default SSL context
+        os.environ["SSL_CERT_FILE"] = ca_file
+
+        print(f"{args.requests} requests, {args.connections} connections, {args.latency * 1000:.0f}ms latency")
+        for http2 in (False, True):
+            elapsed = asyncio.run(
+                run_benchmark(http2=http2, port=args.port, requests=args.requests, connections=args.connections)
+            )
+            print(f"{'HTTP/2  ' if http2 else 'HTTP/1.1'}: {elapsed:.2f}s, {args.requests / elapsed:.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
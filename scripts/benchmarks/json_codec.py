@@ -0,0 +1,107 @@
+"""Compares the standard library JSON codec with `OrjsonCodec`.
+
+Measures encoding a large `task_group.add_runs` body and decoding a large `extract`
+response, both on their own and end to end through a client talking to an in-process
+mock transport.
+
+Requires `pip install parallel-web[orjson]`, then run:
+
+    python scripts/benchmarks/json_codec.py
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import argparse
+from typing import Any, Dict, Tuple, Callable
+
+import httpx
+
+from parallel import Parallel, JSONCodec, OrjsonCodec
+from parallel.types import ExtractResponse
+
+
+def add_runs_body(n_runs: int) -> Dict[str, Any]:
+    return {
+        "inputs": [
+            {
+                "input": {"company": f"Company {i}", "website": f"https://example{i}.com", "employees": i * 10},
+                "processor": "core",
+                "metadata": {"batch": "benchmark", "index": i},
+            }
+            for i in range(n_runs)
+        ],
+        "default_task_spec": {
+            "output_schema": {"type": "json", "json_schema": {"type": "object", "properties": {}}},
+        },
+    }
+
+
+def extract_response(n_results: int, content_size: int) -> bytes:
+    paragraph = "Parallel builds a web for AIs — café, naïve, 東京. " * (content_size // 50)
+    return json.dumps(
+        {
+            "extract_id": "extract_1",
+            "results": [
+                {
+                    "url": f"https://example.com/{i}",
+                    "title": f"Page {i}",
+                    "publish_date": "2025-01-01",
+                    "excerpts": [paragraph[:1000]] * 5,
+                    "full_content": paragraph,
+                }
+                for i in range(n_results)
+            ],
+            "errors": [],
+        }
+    ).encode()
+
+
+def timeit(fn: Callable[[], object], repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run_benchmark(codec: JSONCodec, body: Dict[str, Any], response: bytes, repeat: int) -> Tuple[float, float, float]:
+    transport = httpx.MockTransport(
+        lambda _request: httpx.Response(200, content=response, headers={"content-type": "application/json"})
+    )
+    client = Parallel(
+        api_key="benchmark",
+        base_url="http://localhost",
+        json_codec=codec,
+        http_client=httpx.Client(transport=transport),
+    )
+    return (
+        timeit(lambda: codec.dumps(body), repeat),
+        timeit(lambda: codec.loads(response), repeat),
+        timeit(lambda: client.post("/v1/extract", body=body, cast_to=ExtractResponse), repeat),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=1000, help="number of runs in the add_runs body")
+    parser.add_argument("--results", type=int, default=20, help="number of results in the extract response")
+    parser.add_argument("--content-size", type=int, default=100_000, help="characters of full content per result")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    body = add_runs_body(args.runs)
+    response = extract_response(args.results, args.content_size)
+    print(f"add_runs body: {len(JSONCodec().dumps(body)) / 1e6:.1f}MB, extract response: {len(response) / 1e6:.1f}MB")
+
+    for codec in (JSONCodec(), OrjsonCodec()):
+        encode, decode, end_to_end = run_benchmark(codec, body, response, args.repeat)
+        print(
+            f"{type(codec).__name__:>11}: encode {encode:6.2f}ms, decode {decode:6.2f}ms, "
+            f"request + parse {end_to_end:6.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Measures how much `RequestCompression` shrinks a representative `task_group.add_runs` body.
+
+The body holds `--runs` runs, each with a JSON input, metadata and a task spec with an output
+JSON schema. For each encoding the script reports the compressed size, the time it takes to
+compress and the resulting time to upload the body at the given `--bandwidth`.
+
+Requires `pip install parallel-web[zstd]` for zstd, then run:
+
+    python scripts/benchmarks/request_compression.py --runs 1000 --bandwidth 20
+"""
+
+from __future__ import annotations
+
+import time
+import random
+import argparse
+from typing import Any, Dict, List
+
+from parallel import RequestCompression
+from parallel._utils._json import openapi_dumps
+
+WORDS = (
+    "software platform enterprise customers revenue growth market cloud data analytics security payments "
+    "logistics healthcare retail manufacturing acquisition subsidiary founded headquartered employees "
+    "product launch partnership investors funding series board regulatory compliance europe asia america"
+).split()
+
+
+def add_runs_body(n_runs: int) -> Dict[str, Any]:
+    # unique free text per run, as real inputs have, so that the body doesn't compress unrealistically well
+    rng = random.Random(0)
+    output_schema = {
+        "type": "json",
+        "json_schema": {
+            "type": "object",
+            "properties": {
+                "ceo_name": {"type": "string", "description": "Full name of the current chief executive officer."},
+                "founded_year": {"type": "integer", "description": "The year the company was founded."},
+                "headquarters": {"type": "string", "description": "City and country of the headquarters."},
+                "employee_count": {"type": "integer", "description": "Most recently reported number of employees."},
+            },
+            "required": ["ceo_name", "founded_year", "headquarters", "employee_count"],
+            "additionalProperties": False,
+        },
+    }
+    return {
+        "inputs": [
+            {
+                "input": {
+                    "company_name": f"Example Company {i}",
+                    "website": f"https://www.example-company-{i}.com",
+                    "notes": " ".join(rng.choice(WORDS) for _ in range(60)),
+                },
+                "processor": "core",
+                "metadata": {"account_id": f"acct_{rng.getrandbits(48):012x}", "batch": "2025-01-01"},
+                "task_spec": {"output_schema": output_schema},
+            }
+            for i in range(n_runs)
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=1000, help="number of runs in the add_runs body")
+    parser.add_argument("--bandwidth", type=float, default=20, help="upload bandwidth in Mbit/s")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    body = openapi_dumps(add_runs_body(args.runs))
+    bytes_per_second = args.bandwidth * 1_000_000 / 8
+
+    compressions: List[RequestCompression] = [RequestCompression("gzip")]
+    try:
+        compressions.append(RequestCompression("zstd"))
+    except RuntimeError:
+        print("zstandard is not installed, skipping zstd\n")
+
+    print(f"{args.runs} runs at {args.bandwidth:g} Mbit/s")
+    print(f"    none: {len(body) / 1e6:6.2f}MB, upload {len(body) / bytes_per_second * 1000:7.1f}ms")
+    for compression in compressions:
+        compressed = compression.compress(body)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            compression.compress(body)
+        compress_time = (time.perf_counter() - start) / args.repeat
+
+        upload_time = len(compressed) / bytes_per_second
+        print(
+            f"{compression.encoding:>8}: {len(compressed) / 1e6:6.2f}MB ({len(body) / len(compressed):4.1f}x), "
+            f"compress {compress_time * 1000:5.1f}ms + upload {upload_time * 1000:7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Measures the SDK overhead of a small call, without any network IO.
+
+Sends `--calls` small `search` requests to an in-process mock transport, so the time per
+call is spent building the request and parsing the response.
+
+    python scripts/benchmarks/request_overhead.py --calls 2000
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import argparse
+
+import httpx
+
+from parallel import Parallel
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    body = json.dumps({"search_id": "search_1", "results": []}).encode()
+    transport = httpx.MockTransport(
+        lambda _request: httpx.Response(200, content=body, headers={"content-type": "application/json"})
+    )
+    client = Parallel(api_key="benchmark", base_url="http://localhost", http_client=httpx.Client(transport=transport))
+
+    # warm up any lazily built state before timing
+    client.post("/v1beta/search", body={"objective": "foo"}, cast_to=object)
+
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        client.post("/v1beta/search", body={"objective": "foo"}, cast_to=object)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.calls} calls: {elapsed * 1000:7.1f}ms ({elapsed / args.calls * 1000:5.3f}ms per call)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Compares `SSEDecoder` with `IncrementalSSEDecoder` on multi-megabyte event streams.
+
+Two streams are decoded: one with many small progress events and one with a few large result
+events whose data is split over many lines and network chunks, as happens for task runs with
+large JSON outputs.
+
+    python scripts/benchmarks/sse_decoder.py --size 8 --chunk-size 16384
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import argparse
+from typing import List, Callable, Iterator
+
+from parallel._streaming import SSEDecoder, SSEBytesDecoder, IncrementalSSEDecoder
+
+
+def small_events(size: int) -> bytes:
+    events: List[bytes] = []
+    total = 0
+    i = 0
+    while total < size:
+        data = json.dumps({"type": "task_run.progress_msg", "message": f"Searching source {i}", "index": i})
+        event = f"event: task_run.progress_msg\nid: {i}\ndata: {data}\n\n".encode()
+        events.append(event)
+        total += len(event)
+        i += 1
+    return b"".join(events)
+
+
+def large_events(size: int, n_events: int = 4) -> bytes:
+    events: List[bytes] = []
+    line = json.dumps({"field": "value " * 20})
+    lines_per_event = size // n_events // (len(line) + 7)
+    for i in range(n_events):
+        data = "".join(f"data: {line}\n" for _ in range(lines_per_event))
+        events.append(f"event: task_run.state\nid: {i}\n{data}\n".encode())
+    return b"".join(events)
+
+
+def chunked(body: bytes, chunk_size: int) -> Iterator[bytes]:
+    for i in range(0, len(body), chunk_size):
+        yield body[i : i + chunk_size]
+
+
+def run_benchmark(
+    name: str, body: bytes, chunk_size: int, make_decoder: Callable[[], SSEDecoder | SSEBytesDecoder]
+) -> None:
+    start = time.perf_counter()
+    count = sum(1 for _ in make_decoder().iter_bytes(chunked(body, chunk_size)))
+    elapsed = time.perf_counter() - start
+    print(f"{name:>24}: {count:6} events in {elapsed * 1000:8.1f}ms ({len(body) / 1e6 / elapsed:6.1f}MB/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=float, default=8, help="size of each stream in MB")
+    parser.add_argument("--chunk-size", type=int, default=16384, help="size of the network chunks in bytes")
+    args = parser.parse_args()
+
+    size = int(args.size * 1_000_000)
+    for stream, body in [("small events", small_events(size)), ("large events", large_events(size))]:
+        print(f"{stream}, {len(body) / 1e6:.1f}MB in {args.chunk_size} byte chunks")
+        run_benchmark("SSEDecoder", body, args.chunk_size, SSEDecoder)
+        run_benchmark("IncrementalSSEDecoder", body, args.chunk_size, IncrementalSSEDecoder)
+
+
+if __name__ == "__main__":
+    main()
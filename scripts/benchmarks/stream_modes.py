@@ -0,0 +1,80 @@
+"""Compares iterating over a `task_group.events()` stream as models, with `iter_json()` and with `iter_data()`.
+
+The stream is served from memory, so only the client-side cost of decoding each event is measured.
+As the events carry their cursor in the payload instead of an SSE `id` field, the resumable stream
+still parses them with `iter_data()` to keep track of where to resume from.
+
+    python scripts/benchmarks/stream_modes.py --events 20000
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import argparse
+from typing import Any, List, Callable, Iterator
+
+import httpx
+
+from parallel import Parallel, ResumableStream
+
+
+def events_body(n_events: int) -> bytes:
+    events: List[bytes] = []
+    for i in range(n_events):
+        if i % 2:
+            payload: Any = {
+                "type": "task_group_status",
+                "event_id": str(i),
+                "status": {
+                    "num_task_runs": n_events,
+                    "task_run_status_counts": {"queued": n_events - i, "completed": i},
+                    "is_active": True,
+                    "status_message": None,
+                    "modified_at": "2025-01-01T00:00:00Z",
+                },
+            }
+        else:
+            payload = {
+                "type": "task_run.state",
+                "event_id": str(i),
+                "input": None,
+                "output": None,
+                "run": {
+                    "run_id": f"trun_{i}",
+                    "status": "completed",
+                    "is_active": False,
+                    "processor": "core",
+                    "metadata": {"row": i},
+                    "created_at": "2025-01-01T00:00:00Z",
+                    "modified_at": "2025-01-01T00:00:00Z",
+                },
+            }
+        events.append(f"event: {payload['type']}\ndata: {json.dumps(payload)}\n\n".encode())
+    return b"".join(events)
+
+
+def run_benchmark(name: str, body: bytes, iterate: Callable[[ResumableStream[Any]], Iterator[Any]]) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body, request=request)
+
+    client = Parallel(api_key="benchmark", http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+    start = time.perf_counter()
+    count = sum(1 for _ in iterate(client.task_group.events("tgrp_123")))
+    elapsed = time.perf_counter() - start
+    print(f"{name:>10}: {count} events in {elapsed * 1000:7.1f}ms ({elapsed / count * 1e6:5.1f}us per event)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+
+    body = events_body(args.events)
+    run_benchmark("models", body, iter)
+    run_benchmark("iter_json", body, lambda stream: stream.iter_json())
+    run_benchmark("iter_data", body, lambda stream: stream.iter_data())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Measures how `AsyncStream.prefetch()` overlaps reading a stream with a slow consumer.
+
+Each event takes `--network-delay` ms to arrive and `--consumer-delay` ms to handle, e.g. to
+write it to a database. Without prefetching the two add up, with it they overlap.
+
+    python scripts/benchmarks/stream_prefetch.py --events 500 --network-delay 2 --consumer-delay 2
+"""
+
+from __future__ import annotations
+
+import time
+import asyncio
+import argparse
+from typing import Optional, AsyncIterator
+
+import httpx
+
+from parallel import AsyncStream, AsyncParallel
+
+
+async def run_benchmark(args: argparse.Namespace, prefetch: Optional[int]) -> None:
+    async def body() -> AsyncIterator[bytes]:
+        for i in range(args.events):
+            await asyncio.sleep(args.network_delay / 1000)
+            yield f'data: {{"index": {i}}}\n\n'.encode()
+
+    client = AsyncParallel(api_key="benchmark")
+    stream: AsyncStream[object] = AsyncStream(
+        cast_to=object, client=client, response=httpx.Response(200, content=body())
+    )
+    if prefetch is not None:
+        stream.prefetch(prefetch)
+
+    start = time.perf_counter()
+    async with stream:
+        async for _ in stream:
+            await asyncio.sleep(args.consumer_delay / 1000)
+    elapsed = time.perf_counter() - start
+
+    name = "no prefetch" if prefetch is None else f"prefetch({prefetch})"
+    print(f"{name:>14}: {elapsed * 1000:7.1f}ms ({elapsed / args.events * 1000:4.2f}ms per event)")
+    await client.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--network-delay", type=float, default=2, help="time for each event to arrive, in ms")
+    parser.add_argument("--consumer-delay", type=float, default=2, help="time to handle each event, in ms")
+    args = parser.parse_args()
+
+    await run_benchmark(args, None)
+    await run_benchmark(args, 32)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,7 +3,7 @@
 import typing as _t
 
 from . import types
-from ._types import NOT_GIVEN, Omit, NoneType, NotGiven, Transport, ProxiesTypes, omit, not_given
+from ._types import NOT_GIVEN, Omit, RawJSON, NoneType, NotGiven, Transport, ProxiesTypes, omit, not_given
 from ._utils import file_from_path
 from ._client import (
     Client,
@@ -19,7 +19,10 @@ from ._client import (
 from ._models import BaseModel
 from ._version import __title__, __version__
 from ._response import APIResponse as APIResponse, AsyncAPIResponse as AsyncAPIResponse
+from .lib._time import LongPollAttempt, TaskRunTimeoutError
 from ._constants import DEFAULT_TIMEOUT, DEFAULT_MAX_RETRIES, DEFAULT_CONNECTION_LIMITS
+from ._streaming import ResumableStream, AsyncResumableStream
+from .lib._cache import SQLiteCache, CacheBackend, InMemoryCache, ResponseCache
 from ._exceptions import (
     APIError,
     ConflictError,
@@ -38,6 +41,14 @@ from ._exceptions import (
 )
 from ._base_client import DefaultHttpxClient, DefaultAioHttpClient, DefaultAsyncHttpxClient
 from ._utils._logs import setup_logging as _setup_logging
+from .lib._hedging import HedgingPolicy
+from .lib._batching import BatchedTaskRun, TaskRunBatching
+from .lib._json_codec import JSONCodec, OrjsonCodec
+from .lib._rate_limit import RateLimiter
+from .lib._compression import RequestCompression
+from .lib._concurrency import AdaptiveConcurrencyLimiter
+from .lib._run_watcher import AsyncRunWatcher, RunWatcherEvent
+from .lib._execute_many import ExecuteManyItem
 
 __all__ = [
     "types",
@@ -51,6 +62,7 @@ __all__ = [
     "not_given",
     "Omit",
     "omit",
+    "RawJSON",
     "ParallelError",
     "APIError",
     "APIStatusError",
@@ -71,6 +83,8 @@ __all__ = [
     "AsyncClient",
     "Stream",
     "AsyncStream",
+    "ResumableStream",
+    "AsyncResumableStream",
     "Parallel",
     "AsyncParallel",
     "file_from_path",
@@ -81,6 +95,23 @@ __all__ = [
     "DefaultHttpxClient",
     "DefaultAsyncHttpxClient",
     "DefaultAioHttpClient",
+    "RateLimiter",
+    "AdaptiveConcurrencyLimiter",
+    "HedgingPolicy",
+    "ResponseCache",
+    "CacheBackend",
+    "InMemoryCache",
+    "SQLiteCache",
+    "JSONCodec",
+    "OrjsonCodec",
+    "RequestCompression",
+    "AsyncRunWatcher",
+    "RunWatcherEvent",
+    "LongPollAttempt",
+    "TaskRunTimeoutError",
+    "ExecuteManyItem",
+    "TaskRunBatching",
+    "BatchedTaskRun",
 ]
 
 if not _t.TYPE_CHECKING:
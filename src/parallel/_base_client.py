@@ -1,16 +1,15 @@
 from __future__ import annotations
 
 import sys
-import json
 import time
 import uuid
-import email
 import asyncio
 import inspect
 import logging
 import platform
 import warnings
-import email.utils
+import threading
+import concurrent.futures
 from types import TracebackType
 from random import random
 from typing import (
@@ -18,10 +17,12 @@ from typing import (
     Any,
     Dict,
     Type,
+    Tuple,
     Union,
     Generic,
     Mapping,
     TypeVar,
+    Hashable,
     Iterable,
     Iterator,
     Optional,
@@ -30,7 +31,7 @@ from typing import (
     cast,
     overload,
 )
-from typing_extensions import Literal, override, get_origin
+from typing_extensions import Unpack, Literal, override, get_origin
 
 import anyio
 import httpx
@@ -61,7 +62,7 @@ from ._types import (
     ModelBuilderProtocol,
     not_given,
 )
-from ._utils import is_dict, is_list, asyncify, is_given, lru_cache, is_mapping
+from ._utils import is_dict, is_list, asyncify, is_given, lru_cache, is_mapping, parse_retry_after_header
 from ._compat import PYDANTIC_V1, model_copy, model_dump
 from ._models import GenericModel, FinalRequestOptions, validate_type, construct_type
 from ._response import (
@@ -79,14 +80,20 @@ from ._constants import (
     OVERRIDE_CAST_TO_HEADER,
     DEFAULT_CONNECTION_LIMITS,
 )
-from ._streaming import Stream, SSEDecoder, AsyncStream, SSEBytesDecoder
+from ._streaming import Stream, SSEDecoder, AsyncStream, SSEBytesDecoder, IncrementalSSEDecoder
+from .lib._cache import CacheKey, ResponseCache
 from ._exceptions import (
     APIStatusError,
     APITimeoutError,
     APIConnectionError,
     APIResponseValidationError,
 )
-from ._utils._json import openapi_dumps
+from .lib._hedging import HedgingPolicy, HedgingThreads
+from .lib._json_codec import JSONCodec
+from .lib._rate_limit import RateLimiter
+from .lib._compression import RequestCompression
+from .lib._concurrency import AdaptiveConcurrencyLimiter
+from .lib._single_flight import SingleFlight, AsyncSingleFlight
 
 log: logging.Logger = logging.getLogger(__name__)
 
@@ -95,6 +102,9 @@ SyncPageT = TypeVar("SyncPageT", bound="BaseSyncPage[Any]")
 AsyncPageT = TypeVar("AsyncPageT", bound="BaseAsyncPage[Any]")
 
 
+# the number of prepared URLs kept per client, see `BaseClient._prepare_url()`
+_URL_CACHE_SIZE = 512
+
 _T = TypeVar("_T")
 _T_co = TypeVar("_T_co", covariant=True)
 
@@ -378,18 +388,37 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
         _strict_response_validation: bool,
         max_retries: int = DEFAULT_MAX_RETRIES,
         timeout: float | Timeout | None = DEFAULT_TIMEOUT,
+        total_timeout: float | None = None,
+        stream_idle_timeout: float | None = None,
         custom_headers: Mapping[str, str] | None = None,
         custom_query: Mapping[str, object] | None = None,
+        rate_limiter: RateLimiter | None = None,
+        hedging: HedgingPolicy | None = None,
+        response_cache: ResponseCache | None = None,
+        json_codec: JSONCodec | None = None,
+        request_compression: RequestCompression | None = None,
     ) -> None:
         self._version = version
         self._base_url = self._enforce_trailing_slash(URL(base_url))
         self.max_retries = max_retries
         self.timeout = timeout
+        self.total_timeout = total_timeout
+        self.stream_idle_timeout = stream_idle_timeout
         self._custom_headers = custom_headers or {}
         self._custom_query = custom_query or {}
         self._strict_response_validation = _strict_response_validation
         self._idempotency_header = None
         self._platform: Platform | None = None
+        self._rate_limiter = rate_limiter
+        self._hedging = hedging
+        self._response_cache = response_cache
+        self._json_codec = json_codec if json_codec is not None else JSONCodec()
+        self._request_compression = request_compression
+        # the parts of every request that only depend on the client configuration are built once
+        # and reused, see `_default_headers_cached()` and `_prepare_url()`
+        self._headers_cache: Optional[Tuple[Hashable, Dict[str, str], httpx.Headers]] = None
+        self._url_cache: Dict[str, URL] = {}
+        self._url_cache_base: Optional[URL] = None
 
         if max_retries is None:  # pyright: ignore[reportUnnecessaryComparison]
             raise TypeError(
@@ -416,7 +445,7 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
             body = err_text
 
             try:
-                body = json.loads(err_text)
+                body = self._json_codec.loads(err_text)
                 err_msg = f"Error code: {response.status_code} - {body}"
             except Exception:
                 err_msg = err_text or f"Error code: {response.status_code}"
@@ -432,13 +461,29 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
     ) -> _exceptions.APIStatusError:
         raise NotImplementedError()
 
+    def _default_headers_cached(self) -> Tuple[Dict[str, str], httpx.Headers]:
+        """Returns `default_headers` without omitted values, along with the encoded headers.
+
+        These are computed once and only rebuilt when the auth or platform headers change.
+        """
+        key = (self._platform, tuple(self.auth_headers.items()))
+        cached = self._headers_cache
+        if cached is None or cached[0] != key:
+            headers_dict = _merge_mappings(self.default_headers, {})
+            # headers are case-insensitive while dictionaries are not.
+            cached = self._headers_cache = (key, headers_dict, httpx.Headers(headers_dict))
+        return cached[1], cached[2]
+
     def _build_headers(self, options: FinalRequestOptions, *, retries_taken: int = 0) -> httpx.Headers:
         custom_headers = options.headers or {}
-        headers_dict = _merge_mappings(self.default_headers, custom_headers)
-        self._validate_headers(headers_dict, custom_headers)
-
-        # headers are case-insensitive while dictionaries are not.
-        headers = httpx.Headers(headers_dict)
+        default_headers, encoded_default_headers = self._default_headers_cached()
+        if custom_headers:
+            headers_dict = _merge_mappings(default_headers, custom_headers)
+            self._validate_headers(headers_dict, custom_headers)
+            headers = httpx.Headers(headers_dict)
+        else:
+            self._validate_headers(default_headers, custom_headers)
+            headers = encoded_default_headers.copy()
 
         idempotency_header = self._idempotency_header
         if idempotency_header and options.idempotency_key and idempotency_header not in headers:
@@ -463,16 +508,28 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
         Merge a URL argument together with any 'base_url' on the client,
         to create the URL used for the outgoing request.
         """
+        base_url = self.base_url
+        if self._url_cache_base is not base_url:
+            self._url_cache.clear()
+            self._url_cache_base = base_url
+
+        prepared = self._url_cache.get(url)
+        if prepared is not None:
+            return prepared
+
         # Copied from httpx's `_merge_url` method.
-        merge_url = URL(url)
-        if merge_url.is_relative_url:
-            merge_raw_path = self.base_url.raw_path + merge_url.raw_path.lstrip(b"/")
-            return self.base_url.copy_with(raw_path=merge_raw_path)
+        prepared = URL(url)
+        if prepared.is_relative_url:
+            merge_raw_path = base_url.raw_path + prepared.raw_path.lstrip(b"/")
+            prepared = base_url.copy_with(raw_path=merge_raw_path)
 
-        return merge_url
+        if len(self._url_cache) >= _URL_CACHE_SIZE:
+            self._url_cache.clear()
+        self._url_cache[url] = prepared
+        return prepared
 
     def _make_sse_decoder(self) -> SSEDecoder | SSEBytesDecoder:
-        return SSEDecoder()
+        return IncrementalSSEDecoder(loads=self._json_codec.loads)
 
     def _build_request(
         self,
@@ -562,8 +619,22 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
             elif not files:
                 # Don't set content when JSON is sent as multipart/form-data,
                 # since httpx's content param overrides other body arguments
-                kwargs["content"] = openapi_dumps(json_data) if is_given(json_data) and json_data is not None else None
+                kwargs["content"] = (
+                    self._json_codec.dumps(json_data) if is_given(json_data) and json_data is not None else None
+                )
             kwargs["files"] = files
+
+            compression = self._request_compression
+            content = kwargs.get("content")
+            if (
+                compression is not None
+                and isinstance(content, bytes)
+                and compression.should_compress(content)
+                # the body may already be compressed by the caller
+                and "Content-Encoding" not in headers
+            ):
+                kwargs["content"] = compression.compress(content)
+                headers["Content-Encoding"] = compression.encoding
         else:
             headers.pop("Content-Type", None)
             kwargs.pop("data", None)
@@ -629,6 +700,37 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
 
         return cast_to
 
+    def _coalesce_key(self, cast_to: type[object], options: FinalRequestOptions, *, stream: bool) -> Hashable | None:
+        """Returns the key identical in-flight requests are merged on, or `None` if the request can't be merged.
+
+        Only plain GET requests that are parsed into a model can be merged, as every caller
+        receives the same parsed object. Requests are only merged if they're sent with the same
+        timeouts and retries, and by clients with the same base URL, headers and query, as the
+        clients created with `with_options()` share their in-flight requests.
+        """
+        if stream or options.method.lower() != "get" or is_given(options.post_parser):
+            return None
+
+        headers = options.headers if is_given(options.headers) else {}
+        if RAW_RESPONSE_HEADER in headers:
+            return None
+
+        timeout = options.timeout if is_given(options.timeout) else self.timeout
+        total_timeout = options.total_timeout if is_given(options.total_timeout) else self.total_timeout
+        default_headers, _ = self._default_headers_cached()
+        return (
+            cast_to,
+            str(self.base_url),
+            options.url,
+            self.qs.stringify(cast(Mapping[str, Any], options.params)) if options.params else "",
+            self.qs.stringify(self._custom_query) if self._custom_query else "",
+            tuple(sorted((name.lower(), value) for name, value in default_headers.items())),
+            tuple(sorted((name.lower(), value) for name, value in headers.items() if not isinstance(value, Omit))),
+            tuple(timeout.as_dict().items()) if isinstance(timeout, httpx.Timeout) else timeout,
+            total_timeout,
+            options.get_max_retries(self.max_retries),
+        )
+
     def _should_stream_response_body(self, request: httpx.Request) -> bool:
         return request.headers.get(RAW_RESPONSE_HEADER) == "stream"  # type: ignore[no-any-return]
 
@@ -717,36 +819,9 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
     def _parse_retry_after_header(self, response_headers: Optional[httpx.Headers] = None) -> float | None:
         """Returns a float of the number of seconds (not milliseconds) to wait after retrying, or None if unspecified.
 
-        About the Retry-After header: https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Retry-After
-        See also  https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Retry-After#syntax
+        See `parse_retry_after_header()`.
         """
-        if response_headers is None:
-            return None
-
-        # First, try the non-standard `retry-after-ms` header for milliseconds,
-        # which is more precise than integer-seconds `retry-after`
-        try:
-            retry_ms_header = response_headers.get("retry-after-ms", None)
-            return float(retry_ms_header) / 1000
-        except (TypeError, ValueError):
-            pass
-
-        # Next, try parsing `retry-after` header as seconds (allowing nonstandard floats).
-        retry_header = response_headers.get("retry-after")
-        try:
-            # note: the spec indicates that this should only ever be an integer
-            # but if someone sends a float there's no reason for us to not respect it
-            return float(retry_header)
-        except (TypeError, ValueError):
-            pass
-
-        # Last, try parsing `retry-after` as a date.
-        retry_date_tuple = email.utils.parsedate_tz(retry_header)
-        if retry_date_tuple is None:
-            return None
-
-        retry_date = email.utils.mktime_tz(retry_date_tuple)
-        return float(retry_date - time.time())
+        return parse_retry_after_header(response_headers)
 
     def _calculate_retry_timeout(
         self,
@@ -772,6 +847,36 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
         timeout = sleep_seconds * jitter
         return timeout if timeout >= 0 else 0
 
+    def _timeout_before_deadline(self, options: FinalRequestOptions, deadline: float) -> float | Timeout:
+        """Returns the request timeout, shortened so that the request can't run past the given deadline."""
+        remaining = max(deadline - time.monotonic(), 0.0)
+        timeout = self.timeout if isinstance(options.timeout, NotGiven) else options.timeout
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, Timeout):
+            return Timeout(
+                connect=_min_timeout(timeout.connect, remaining),
+                read=_min_timeout(timeout.read, remaining),
+                write=_min_timeout(timeout.write, remaining),
+                pool=_min_timeout(timeout.pool, remaining),
+            )
+        return min(timeout, remaining)
+
+    def _apply_stream_idle_timeout(self, request: httpx.Request, options: FinalRequestOptions) -> None:
+        """Bounds the time a stream can go without receiving any data, including heartbeat comments."""
+        idle_timeout = (
+            self.stream_idle_timeout
+            if isinstance(options.stream_idle_timeout, NotGiven)
+            else options.stream_idle_timeout
+        )
+        if idle_timeout is None:
+            return
+
+        timeout = dict(request.extensions.get("timeout") or {})
+        read = timeout.get("read")
+        timeout["read"] = idle_timeout if read is None else min(read, idle_timeout)
+        request.extensions["timeout"] = timeout
+
     def _should_retry(self, response: httpx.Response) -> bool:
         # Note: this is not a standard header
         should_retry_header = response.headers.get("x-should-retry")
@@ -853,9 +958,19 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
         base_url: str | URL,
         max_retries: int = DEFAULT_MAX_RETRIES,
         timeout: float | Timeout | None | NotGiven = not_given,
+        total_timeout: float | None = None,
+        stream_idle_timeout: float | None = None,
         http_client: httpx.Client | None = None,
+        http2: bool = False,
+        connection_limits: httpx.Limits | None = None,
         custom_headers: Mapping[str, str] | None = None,
         custom_query: Mapping[str, object] | None = None,
+        rate_limiter: RateLimiter | None = None,
+        hedging: HedgingPolicy | None = None,
+        response_cache: ResponseCache | None = None,
+        json_codec: JSONCodec | None = None,
+        request_compression: RequestCompression | None = None,
+        coalesce_requests: bool = False,
         _strict_response_validation: bool,
     ) -> None:
         if not is_given(timeout):
@@ -876,6 +991,13 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
                 f"Invalid `http_client` argument; Expected an instance of `httpx.Client` but got {type(http_client)}"
             )
 
+        if http_client is not None and (http2 or connection_limits is not None):
+            raise ValueError(
+                "The `http2` and `connection_limits` arguments can't be used together with a custom `http_client`, configure the `http_client` instead"
+            )
+        if http2:
+            _ensure_http2_installed()
+
         super().__init__(
             version=version,
             # cast to a valid type because mypy doesn't understand our type narrowing
@@ -884,13 +1006,27 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
             max_retries=max_retries,
             custom_query=custom_query,
             custom_headers=custom_headers,
+            total_timeout=total_timeout,
+            stream_idle_timeout=stream_idle_timeout,
+            rate_limiter=rate_limiter,
+            hedging=hedging,
+            response_cache=response_cache,
+            json_codec=json_codec,
+            request_compression=request_compression,
             _strict_response_validation=_strict_response_validation,
         )
         self._client = http_client or SyncHttpxClientWrapper(
             base_url=base_url,
             # cast to a valid type because mypy doesn't understand our type narrowing
             timeout=cast(Timeout, timeout),
+            http2=http2,
+            limits=connection_limits or DEFAULT_CONNECTION_LIMITS,
         )
+        # the options the connection pool was created with, which copies of the client carry over
+        self._http2 = http2
+        self._connection_limits = connection_limits
+        self._hedging_threads = HedgingThreads()
+        self._single_flight = SingleFlight() if coalesce_requests else None
 
     def is_closed(self) -> bool:
         return self._client.is_closed
@@ -904,6 +1040,35 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
         # may not be present
         if hasattr(self, "_client"):
             self._client.close()
+        if hasattr(self, "_hedging_threads"):
+            self._hedging_threads.shutdown()
+
+    def warmup(self, n_connections: int = 1) -> float:
+        """Open `n_connections` keep-alive connections to the API ahead of the first request,
+        so that it doesn't have to wait for DNS resolution and the TCP and TLS handshakes.
+
+        At most the `max_keepalive_connections` of the client's `connection_limits` are opened,
+        as any more would be closed again once they are idle.
+
+        Returns the number of seconds the warmup took.
+        """
+        n_connections = _warmup_connection_count(n_connections, self._connection_limits)
+
+        start = time.monotonic()
+        # connections are only added to the pool while it has no idle ones, so they have to be opened concurrently
+        with concurrent.futures.ThreadPoolExecutor(max_workers=n_connections) as executor:
+            for future in [executor.submit(self._warmup_connection) for _ in range(n_connections)]:
+                future.result()
+        return time.monotonic() - start
+
+    def _warmup_connection(self) -> None:
+        request = self._client.build_request("HEAD", self.base_url)
+        try:
+            self._client.send(request).close()
+        except httpx.TimeoutException as err:
+            raise APITimeoutError(request=request) from err
+        except Exception as err:
+            raise APIConnectionError(request=request) from err
 
     def __enter__(self: _T) -> _T:
         return self
@@ -923,6 +1088,10 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
         """Hook for mutating the given options"""
         return options
 
+    @property
+    def _overrides_prepare_options(self) -> bool:
+        return getattr(self._prepare_options, "__func__", None) is not SyncAPIClient._prepare_options
+
     def _prepare_request(
         self,
         request: httpx.Request,  # noqa: ARG002
@@ -973,6 +1142,23 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
     ) -> ResponseT | _StreamT:
         cast_to = self._maybe_override_cast_to(cast_to, options)
 
+        coalesce_key = self._coalesce_key(cast_to, options, stream=stream)
+        if self._single_flight is not None and coalesce_key is not None:
+            return self._single_flight.do(
+                coalesce_key,
+                lambda: self._request(cast_to, options, stream=stream, stream_cls=stream_cls),
+            )
+
+        return self._request(cast_to, options, stream=stream, stream_cls=stream_cls)
+
+    def _request(
+        self,
+        cast_to: Type[ResponseT],
+        options: FinalRequestOptions,
+        *,
+        stream: bool,
+        stream_cls: type[_StreamT] | None,
+    ) -> ResponseT | _StreamT:
         # create a copy of the options we were given so that if the
         # options are mutated later & we then retry, the retries are
         # given the original options
@@ -983,14 +1169,32 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
 
         response: httpx.Response | None = None
         max_retries = input_options.get_max_retries(self.max_retries)
+        if _is_one_shot_content(input_options.content):
+            # the body is consumed as it is sent, so it can't be sent again
+            max_retries = 0
+        cache_key: CacheKey | None = None
+        total_timeout = (
+            self.total_timeout if isinstance(input_options.total_timeout, NotGiven) else input_options.total_timeout
+        )
+        deadline = time.monotonic() + total_timeout if total_timeout is not None else None
+
+        # every attempt starts from the original options, which only needs a copy if they are modified
+        copy_per_attempt = self._overrides_prepare_options or deadline is not None
 
         retries_taken = 0
         for retries_taken in range(max_retries + 1):
-            options = model_copy(input_options)
-            options = self._prepare_options(options)
+            if copy_per_attempt:
+                options = model_copy(input_options)
+                options = self._prepare_options(options)
+                if deadline is not None:
+                    options.timeout = self._timeout_before_deadline(options, deadline)
+            else:
+                options = input_options
 
             remaining_retries = max_retries - retries_taken
             request = self._build_request(options, retries_taken=retries_taken)
+            if stream:
+                self._apply_stream_idle_timeout(request, options)
             self._prepare_request(request)
 
             kwargs: HttpxSendArgs = {}
@@ -1000,25 +1204,46 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
             if options.follow_redirects is not None:
                 kwargs["follow_redirects"] = options.follow_redirects
 
+            if (
+                self._response_cache is not None
+                and retries_taken == 0
+                and not stream
+                and not self._should_stream_response_body(request=request)
+            ):
+                cache_key, response = self._response_cache.lookup(request)
+                if response is not None:
+                    log.debug("Serving HTTP Request from cache: %s %s", request.method, request.url)
+                    break
+
+            if self._rate_limiter is not None and not self._rate_limiter.acquire(
+                options.url, timeout=deadline - time.monotonic() if deadline is not None else None
+            ):
+                log.debug(
+                    "Not sending request to %s as the rate limit wait would exceed the total timeout", options.url
+                )
+                raise APITimeoutError(request=request)
+
             log.debug("Sending HTTP Request: %s %s", request.method, request.url)
 
             response = None
             try:
-                response = self._client.send(
+                response = self._send(
                     request,
+                    options=options,
                     stream=stream or self._should_stream_response_body(request=request),
+                    deadline=deadline,
                     **kwargs,
                 )
             except httpx.TimeoutException as err:
                 log.debug("Encountered httpx.TimeoutException", exc_info=True)
 
-                if remaining_retries > 0:
-                    self._sleep_for_retry(
-                        retries_taken=retries_taken,
-                        max_retries=max_retries,
-                        options=input_options,
-                        response=None,
-                    )
+                if remaining_retries > 0 and self._sleep_for_retry(
+                    retries_taken=retries_taken,
+                    max_retries=max_retries,
+                    options=input_options,
+                    response=None,
+                    deadline=deadline,
+                ):
                     continue
 
                 log.debug("Raising timeout error")
@@ -1026,13 +1251,13 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
             except Exception as err:
                 log.debug("Encountered Exception", exc_info=True)
 
-                if remaining_retries > 0:
-                    self._sleep_for_retry(
-                        retries_taken=retries_taken,
-                        max_retries=max_retries,
-                        options=input_options,
-                        response=None,
-                    )
+                if remaining_retries > 0 and self._sleep_for_retry(
+                    retries_taken=retries_taken,
+                    max_retries=max_retries,
+                    options=input_options,
+                    response=None,
+                    deadline=deadline,
+                ):
                     continue
 
                 log.debug("Raising connection error")
@@ -1052,14 +1277,24 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
             except httpx.HTTPStatusError as err:  # thrown on 4xx and 5xx status code
                 log.debug("Encountered httpx.HTTPStatusError", exc_info=True)
 
-                if remaining_retries > 0 and self._should_retry(err.response):
-                    err.response.close()
-                    self._sleep_for_retry(
+                if self._rate_limiter is not None and err.response.status_code == 429:
+                    # hold back every other caller to this endpoint, not just this one
+                    self._rate_limiter.pause(
+                        options.url,
+                        self._calculate_retry_timeout(remaining_retries, input_options, err.response.headers),
+                    )
+
+                if (
+                    remaining_retries > 0
+                    and self._should_retry(err.response)
+                    and self._sleep_for_retry(
                         retries_taken=retries_taken,
                         max_retries=max_retries,
                         options=input_options,
                         response=response,
+                        deadline=deadline,
                     )
+                ):
                     continue
 
                 # If the response is streamed then we need to explicitly read the response
@@ -1070,6 +1305,9 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
                 log.debug("Re-raising status error")
                 raise self._make_status_error_from_response(err.response) from None
 
+            if self._response_cache is not None and cache_key is not None:
+                self._response_cache.store(cache_key, response)
+
             break
 
         assert response is not None, "could not resolve response (should never happen)"
@@ -1082,9 +1320,121 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
             retries_taken=retries_taken,
         )
 
+    def _send(
+        self,
+        request: httpx.Request,
+        *,
+        options: FinalRequestOptions,
+        stream: bool,
+        deadline: float | None = None,
+        **kwargs: Unpack[HttpxSendArgs],
+    ) -> httpx.Response:
+        hedging = self._hedging
+        if hedging is None or stream or not isinstance(request.stream, httpx.ByteStream):
+            return self._client.send(request, stream=stream, **kwargs)
+
+        delay = hedging.hedge_delay(options.url, options.json_data)
+        start = time.monotonic()
+        if delay is None:
+            response = self._client.send(request, stream=stream, **kwargs)
+        else:
+            response = self._send_hedged(
+                request, options=options, delay=delay, hedging=hedging, deadline=deadline, **kwargs
+            )
+        hedging.record_latency(options.url, time.monotonic() - start)
+        return response
+
+    def _send_hedged(
+        self,
+        request: httpx.Request,
+        *,
+        options: FinalRequestOptions,
+        delay: float,
+        hedging: HedgingPolicy,
+        deadline: float | None = None,
+        **kwargs: Unpack[HttpxSendArgs],
+    ) -> httpx.Response:
+        lock = threading.Lock()
+        won = False
+
+        def attempt(request: httpx.Request, *, is_hedge: bool) -> httpx.Response | None:
+            nonlocal won
+            if is_hedge and self._rate_limiter is not None:
+                if not self._rate_limiter.acquire(
+                    options.url, timeout=deadline - time.monotonic() if deadline is not None else None
+                ):
+                    log.debug(
+                        "Not hedging request to %s as the rate limit wait would exceed the total timeout", request.url
+                    )
+                    return None
+            if won:
+                return None
+
+            # sync requests can't be cancelled, so the loser is closed as soon as its headers
+            # arrive instead, without downloading its body
+            response = self._client.send(request, stream=True, **kwargs)
+            try:
+                if not won:
+                    response.read()
+                with lock:
+                    if not won:
+                        won = True
+                        return response
+            except BaseException:
+                response.close()
+                raise
+            response.close()
+            return None
+
+        threads = self._hedging_threads
+        primary = threads.try_submit(lambda: attempt(request, is_hedge=False))
+        if primary is None:
+            log.debug("Not hedging request to %s as every hedging thread is busy", request.url)
+            return self._client.send(request, **kwargs)
+
+        try:
+            return cast(httpx.Response, primary.result(timeout=delay))
+        except concurrent.futures.TimeoutError:
+            pass
+
+        hedge_request = _copy_request(request)
+        hedge = threads.try_submit(lambda: attempt(hedge_request, is_hedge=True)) if hedging.acquire_hedge() else None
+        if hedge is None:
+            return cast(httpx.Response, primary.result())
+        log.debug("Hedging request to %s after %f seconds", request.url, delay)
+
+        error: BaseException | None = None
+        pending = {primary, hedge}
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                exc = future.exception()
+                if exc is not None:
+                    error = error or exc
+                    continue
+                response = future.result()
+                if response is not None:
+                    # the hedge may still be waiting for a thread or for the rate limiter
+                    for other in pending:
+                        other.cancel()
+                    return response
+
+        assert error is not None
+        raise error
+
     def _sleep_for_retry(
-        self, *, retries_taken: int, max_retries: int, options: FinalRequestOptions, response: httpx.Response | None
-    ) -> None:
+        self,
+        *,
+        retries_taken: int,
+        max_retries: int,
+        options: FinalRequestOptions,
+        response: httpx.Response | None,
+        deadline: float | None = None,
+    ) -> bool:
+        """Sleeps before the next retry, returns `False` without sleeping if the retry couldn't finish before `deadline`.
+
+        The `response` that is retried is closed before sleeping, so that its connection is released in the meantime.
+        """
         remaining_retries = max_retries - retries_taken
         if remaining_retries == 1:
             log.debug("1 retry left")
@@ -1092,9 +1442,16 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
             log.debug("%i retries left", remaining_retries)
 
         timeout = self._calculate_retry_timeout(remaining_retries, options, response.headers if response else None)
+        if deadline is not None and time.monotonic() + timeout >= deadline:
+            log.debug("Not retrying request to %s as the total timeout would be exceeded", options.url)
+            return False
+
         log.info("Retrying request to %s in %f seconds", options.url, timeout)
 
+        if response is not None:
+            response.close()
         time.sleep(timeout)
+        return True
 
     def _process_response(
         self,
@@ -1436,9 +1793,20 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
         _strict_response_validation: bool,
         max_retries: int = DEFAULT_MAX_RETRIES,
         timeout: float | Timeout | None | NotGiven = not_given,
+        total_timeout: float | None = None,
+        stream_idle_timeout: float | None = None,
         http_client: httpx.AsyncClient | None = None,
+        http2: bool = False,
+        connection_limits: httpx.Limits | None = None,
         custom_headers: Mapping[str, str] | None = None,
         custom_query: Mapping[str, object] | None = None,
+        rate_limiter: RateLimiter | None = None,
+        hedging: HedgingPolicy | None = None,
+        response_cache: ResponseCache | None = None,
+        json_codec: JSONCodec | None = None,
+        request_compression: RequestCompression | None = None,
+        concurrency_limiter: AdaptiveConcurrencyLimiter | None = None,
+        coalesce_requests: bool = False,
     ) -> None:
         if not is_given(timeout):
             # if the user passed in a custom http client with a non-default
@@ -1458,6 +1826,13 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
                 f"Invalid `http_client` argument; Expected an instance of `httpx.AsyncClient` but got {type(http_client)}"
             )
 
+        if http_client is not None and (http2 or connection_limits is not None):
+            raise ValueError(
+                "The `http2` and `connection_limits` arguments can't be used together with a custom `http_client`, configure the `http_client` instead"
+            )
+        if http2:
+            _ensure_http2_installed()
+
         super().__init__(
             version=version,
             base_url=base_url,
@@ -1466,13 +1841,27 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
             max_retries=max_retries,
             custom_query=custom_query,
             custom_headers=custom_headers,
+            total_timeout=total_timeout,
+            stream_idle_timeout=stream_idle_timeout,
+            rate_limiter=rate_limiter,
+            hedging=hedging,
+            response_cache=response_cache,
+            json_codec=json_codec,
+            request_compression=request_compression,
             _strict_response_validation=_strict_response_validation,
         )
         self._client = http_client or AsyncHttpxClientWrapper(
             base_url=base_url,
             # cast to a valid type because mypy doesn't understand our type narrowing
             timeout=cast(Timeout, timeout),
+            http2=http2,
+            limits=connection_limits or DEFAULT_CONNECTION_LIMITS,
         )
+        # the options the connection pool was created with, which copies of the client carry over
+        self._http2 = http2
+        self._connection_limits = connection_limits
+        self._concurrency_limiter = concurrency_limiter
+        self._single_flight = AsyncSingleFlight() if coalesce_requests else None
 
     def is_closed(self) -> bool:
         return self._client.is_closed
@@ -1484,6 +1873,44 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
         """
         await self._client.aclose()
 
+    async def warmup(self, n_connections: int = 1) -> float:
+        """Open `n_connections` keep-alive connections to the API ahead of the first request,
+        so that it doesn't have to wait for DNS resolution and the TCP and TLS handshakes.
+
+        At most the `max_keepalive_connections` of the client's `connection_limits` are opened,
+        as any more would be closed again once they are idle.
+
+        Returns the number of seconds the warmup took.
+        """
+        n_connections = _warmup_connection_count(n_connections, self._connection_limits)
+
+        start = time.monotonic()
+        # connections are only added to the pool while it has no idle ones, so they have to be opened concurrently
+        errors: list[Exception] = []
+
+        async def warmup_connection() -> None:
+            # collect errors instead of letting them surface as an exception group
+            try:
+                await self._warmup_connection()
+            except Exception as err:
+                errors.append(err)
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(n_connections):
+                tg.start_soon(warmup_connection)
+        if errors:
+            raise errors[0]
+        return time.monotonic() - start
+
+    async def _warmup_connection(self) -> None:
+        request = self._client.build_request("HEAD", self.base_url)
+        try:
+            await (await self._client.send(request)).aclose()
+        except httpx.TimeoutException as err:
+            raise APITimeoutError(request=request) from err
+        except Exception as err:
+            raise APIConnectionError(request=request) from err
+
     async def __aenter__(self: _T) -> _T:
         return self
 
@@ -1502,6 +1929,10 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
         """Hook for mutating the given options"""
         return options
 
+    @property
+    def _overrides_prepare_options(self) -> bool:
+        return getattr(self._prepare_options, "__func__", None) is not AsyncAPIClient._prepare_options
+
     async def _prepare_request(
         self,
         request: httpx.Request,  # noqa: ARG002
@@ -1557,6 +1988,23 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
 
         cast_to = self._maybe_override_cast_to(cast_to, options)
 
+        coalesce_key = self._coalesce_key(cast_to, options, stream=stream)
+        if self._single_flight is not None and coalesce_key is not None:
+            return await self._single_flight.do(
+                coalesce_key,
+                lambda: self._request(cast_to, options, stream=stream, stream_cls=stream_cls),
+            )
+
+        return await self._request(cast_to, options, stream=stream, stream_cls=stream_cls)
+
+    async def _request(
+        self,
+        cast_to: Type[ResponseT],
+        options: FinalRequestOptions,
+        *,
+        stream: bool,
+        stream_cls: type[_AsyncStreamT] | None,
+    ) -> ResponseT | _AsyncStreamT:
         # create a copy of the options we were given so that if the
         # options are mutated later & we then retry, the retries are
         # given the original options
@@ -1567,14 +2015,32 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
 
         response: httpx.Response | None = None
         max_retries = input_options.get_max_retries(self.max_retries)
+        if _is_one_shot_content(input_options.content):
+            # the body is consumed as it is sent, so it can't be sent again
+            max_retries = 0
+        cache_key: CacheKey | None = None
+        total_timeout = (
+            self.total_timeout if isinstance(input_options.total_timeout, NotGiven) else input_options.total_timeout
+        )
+        deadline = time.monotonic() + total_timeout if total_timeout is not None else None
+
+        # every attempt starts from the original options, which only needs a copy if they are modified
+        copy_per_attempt = self._overrides_prepare_options or deadline is not None
 
         retries_taken = 0
         for retries_taken in range(max_retries + 1):
-            options = model_copy(input_options)
-            options = await self._prepare_options(options)
+            if copy_per_attempt:
+                options = model_copy(input_options)
+                options = await self._prepare_options(options)
+                if deadline is not None:
+                    options.timeout = self._timeout_before_deadline(options, deadline)
+            else:
+                options = input_options
 
             remaining_retries = max_retries - retries_taken
             request = self._build_request(options, retries_taken=retries_taken)
+            if stream:
+                self._apply_stream_idle_timeout(request, options)
             await self._prepare_request(request)
 
             kwargs: HttpxSendArgs = {}
@@ -1584,25 +2050,46 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
             if options.follow_redirects is not None:
                 kwargs["follow_redirects"] = options.follow_redirects
 
+            if (
+                self._response_cache is not None
+                and retries_taken == 0
+                and not stream
+                and not self._should_stream_response_body(request=request)
+            ):
+                cache_key, response = self._response_cache.lookup(request)
+                if response is not None:
+                    log.debug("Serving HTTP Request from cache: %s %s", request.method, request.url)
+                    break
+
+            if self._rate_limiter is not None and not await self._rate_limiter.aacquire(
+                options.url, timeout=deadline - time.monotonic() if deadline is not None else None
+            ):
+                log.debug(
+                    "Not sending request to %s as the rate limit wait would exceed the total timeout", options.url
+                )
+                raise APITimeoutError(request=request)
+
             log.debug("Sending HTTP Request: %s %s", request.method, request.url)
 
             response = None
             try:
-                response = await self._client.send(
+                response = await self._send(
                     request,
+                    options=options,
                     stream=stream or self._should_stream_response_body(request=request),
+                    deadline=deadline,
                     **kwargs,
                 )
             except httpx.TimeoutException as err:
                 log.debug("Encountered httpx.TimeoutException", exc_info=True)
 
-                if remaining_retries > 0:
-                    await self._sleep_for_retry(
-                        retries_taken=retries_taken,
-                        max_retries=max_retries,
-                        options=input_options,
-                        response=None,
-                    )
+                if remaining_retries > 0 and await self._sleep_for_retry(
+                    retries_taken=retries_taken,
+                    max_retries=max_retries,
+                    options=input_options,
+                    response=None,
+                    deadline=deadline,
+                ):
                     continue
 
                 log.debug("Raising timeout error")
@@ -1610,13 +2097,13 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
             except Exception as err:
                 log.debug("Encountered Exception", exc_info=True)
 
-                if remaining_retries > 0:
-                    await self._sleep_for_retry(
-                        retries_taken=retries_taken,
-                        max_retries=max_retries,
-                        options=input_options,
-                        response=None,
-                    )
+                if remaining_retries > 0 and await self._sleep_for_retry(
+                    retries_taken=retries_taken,
+                    max_retries=max_retries,
+                    options=input_options,
+                    response=None,
+                    deadline=deadline,
+                ):
                     continue
 
                 log.debug("Raising connection error")
@@ -1636,14 +2123,24 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
             except httpx.HTTPStatusError as err:  # thrown on 4xx and 5xx status code
                 log.debug("Encountered httpx.HTTPStatusError", exc_info=True)
 
-                if remaining_retries > 0 and self._should_retry(err.response):
-                    await err.response.aclose()
-                    await self._sleep_for_retry(
+                if self._rate_limiter is not None and err.response.status_code == 429:
+                    # hold back every other caller to this endpoint, not just this one
+                    self._rate_limiter.pause(
+                        options.url,
+                        self._calculate_retry_timeout(remaining_retries, input_options, err.response.headers),
+                    )
+
+                if (
+                    remaining_retries > 0
+                    and self._should_retry(err.response)
+                    and await self._sleep_for_retry(
                         retries_taken=retries_taken,
                         max_retries=max_retries,
                         options=input_options,
                         response=response,
+                        deadline=deadline,
                     )
+                ):
                     continue
 
                 # If the response is streamed then we need to explicitly read the response
@@ -1654,6 +2151,9 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
                 log.debug("Re-raising status error")
                 raise self._make_status_error_from_response(err.response) from None
 
+            if self._response_cache is not None and cache_key is not None:
+                self._response_cache.store(cache_key, response)
+
             break
 
         assert response is not None, "could not resolve response (should never happen)"
@@ -1666,9 +2166,126 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
             retries_taken=retries_taken,
         )
 
+    async def _send(
+        self,
+        request: httpx.Request,
+        *,
+        options: FinalRequestOptions,
+        stream: bool,
+        deadline: float | None = None,
+        **kwargs: Unpack[HttpxSendArgs],
+    ) -> httpx.Response:
+        hedging = self._hedging
+        if hedging is None or stream or not isinstance(request.stream, httpx.ByteStream):
+            return await self._send_limited(request, stream=stream, **kwargs)
+
+        delay = hedging.hedge_delay(options.url, options.json_data)
+        start = time.monotonic()
+        if delay is None:
+            response = await self._send_limited(request, stream=stream, **kwargs)
+        else:
+            response = await self._send_hedged(
+                request, options=options, delay=delay, hedging=hedging, deadline=deadline, **kwargs
+            )
+        hedging.record_latency(options.url, time.monotonic() - start)
+        return response
+
+    async def _send_limited(
+        self,
+        request: httpx.Request,
+        *,
+        stream: bool,
+        **kwargs: Unpack[HttpxSendArgs],
+    ) -> httpx.Response:
+        limiter = self._concurrency_limiter
+        if limiter is None:
+            return await self._client.send(request, stream=stream, **kwargs)
+
+        acquired_at = await limiter.acquire()
+        try:
+            response = await self._client.send(request, stream=stream, **kwargs)
+        except httpx.TimeoutException:
+            limiter.release(acquired_at, overloaded=True)
+            raise
+        except BaseException:
+            limiter.release(acquired_at)
+            raise
+
+        limiter.release(
+            acquired_at,
+            succeeded=response.is_success,
+            overloaded=response.status_code in (429, 503),
+        )
+        return response
+
+    async def _send_hedged(
+        self,
+        request: httpx.Request,
+        *,
+        options: FinalRequestOptions,
+        delay: float,
+        hedging: HedgingPolicy,
+        deadline: float | None = None,
+        **kwargs: Unpack[HttpxSendArgs],
+    ) -> httpx.Response:
+        winner: httpx.Response | None = None
+        errors: list[Exception] = []
+        primary_done = anyio.Event()
+
+        async def attempt(request: httpx.Request, done: anyio.Event | None) -> None:
+            nonlocal winner
+            try:
+                if done is None and self._rate_limiter is not None:
+                    # the hedge is a request of its own as far as the limiters are concerned
+                    if not await self._rate_limiter.aacquire(
+                        options.url, timeout=deadline - time.monotonic() if deadline is not None else None
+                    ):
+                        log.debug(
+                            "Not hedging request to %s as the rate limit wait would exceed the total timeout",
+                            request.url,
+                        )
+                        return
+                response = await self._send_limited(request, stream=False, **kwargs)
+            except Exception as err:
+                errors.append(err)
+            else:
+                if winner is None:
+                    winner = response
+                    # cancels the other request if it is still in flight
+                    tg.cancel_scope.cancel()
+                else:
+                    await response.aclose()
+            finally:
+                if done is not None:
+                    done.set()
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(attempt, request, primary_done)
+
+            with anyio.move_on_after(delay):
+                await primary_done.wait()
+
+            if not primary_done.is_set() and hedging.acquire_hedge():
+                log.debug("Hedging request to %s after %f seconds", request.url, delay)
+                tg.start_soon(attempt, _copy_request(request), None)
+
+        if winner is None:
+            raise errors[0]
+        return winner
+
     async def _sleep_for_retry(
-        self, *, retries_taken: int, max_retries: int, options: FinalRequestOptions, response: httpx.Response | None
-    ) -> None:
+        self,
+        *,
+        retries_taken: int,
+        max_retries: int,
+        options: FinalRequestOptions,
+        response: httpx.Response | None,
+        deadline: float | None = None,
+    ) -> bool:
+        """Sleeps before the next retry, returns `False` without sleeping if the retry couldn't finish before `deadline`.
+
+        The `response` that is retried is closed before sleeping, so that its connection is released in the meantime.
+        """
         remaining_retries = max_retries - retries_taken
         if remaining_retries == 1:
             log.debug("1 retry left")
@@ -1676,9 +2293,16 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
             log.debug("%i retries left", remaining_retries)
 
         timeout = self._calculate_retry_timeout(remaining_retries, options, response.headers if response else None)
+        if deadline is not None and time.monotonic() + timeout >= deadline:
+            log.debug("Not retrying request to %s as the total timeout would be exceeded", options.url)
+            return False
+
         log.info("Retrying request to %s in %f seconds", options.url, timeout)
 
+        if response is not None:
+            await response.aclose()
         await anyio.sleep(timeout)
+        return True
 
     async def _process_response(
         self,
@@ -1955,6 +2579,7 @@ def make_request_options(
     extra_body: Body | None = None,
     idempotency_key: str | None = None,
     timeout: float | httpx.Timeout | None | NotGiven = not_given,
+    total_timeout: float | None | NotGiven = not_given,
     post_parser: PostParser | NotGiven = not_given,
 ) -> RequestOptions:
     """Create a dict of type RequestOptions without keys of NotGiven values."""
@@ -1974,6 +2599,9 @@ def make_request_options(
     if not isinstance(timeout, NotGiven):
         options["timeout"] = timeout
 
+    if not isinstance(total_timeout, NotGiven):
+        options["total_timeout"] = total_timeout
+
     if idempotency_key is not None:
         options["idempotency_key"] = idempotency_key
 
@@ -2119,6 +2747,42 @@ def get_architecture() -> Arch:
     return "unknown"
 
 
+def _ensure_http2_installed() -> None:
+    try:
+        import h2  # noqa: F401  # pyright: ignore[reportUnusedImport]
+    except ImportError:
+        raise RuntimeError("To use HTTP/2 you must have installed the package with the `http2` extra") from None
+
+
+def _warmup_connection_count(n_connections: int, limits: httpx.Limits | None) -> int:
+    if n_connections < 1:
+        raise ValueError(f"Expected n_connections to be at least 1 but received {n_connections}")
+    # a custom `http_client` doesn't expose its limits, so the default ones are assumed
+    limits = limits or DEFAULT_CONNECTION_LIMITS
+    for limit in (limits.max_keepalive_connections, limits.max_connections):
+        if limit is not None:
+            n_connections = min(n_connections, limit)
+    return n_connections
+
+
+def _min_timeout(timeout: float | None, remaining: float) -> float:
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def _copy_request(request: httpx.Request) -> httpx.Request:
+    return httpx.Request(
+        request.method,
+        request.url,
+        headers=request.headers,
+        content=request.content,
+        extensions=request.extensions,
+    )
+
+
+def _is_one_shot_content(content: object) -> bool:
+    return isinstance(content, (Iterator, AsyncIterator))
+
+
 def _merge_mappings(
     obj1: Mapping[_T_co, Union[_T, Omit]],
     obj2: Mapping[_T_co, Union[_T, Omit]],
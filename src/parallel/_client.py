@@ -41,6 +41,7 @@ from ._response import (
     async_to_streamed_response_wrapper,
 )
 from ._streaming import Stream as Stream, AsyncStream as AsyncStream
+from .lib._cache import CacheBackend, ResponseCache
 from ._exceptions import ParallelError, APIStatusError
 from ._base_client import (
     DEFAULT_MAX_RETRIES,
@@ -48,6 +49,12 @@ from ._base_client import (
     AsyncAPIClient,
     make_request_options,
 )
+from .lib._hedging import HedgingPolicy
+from .lib._batching import TaskRunBatcher, TaskRunBatching, AsyncTaskRunBatcher
+from .lib._json_codec import JSONCodec
+from .lib._rate_limit import RateLimiter
+from .lib._compression import RequestCompression
+from .lib._concurrency import AdaptiveConcurrencyLimiter
 from .types.search_result import SearchResult
 from .types.extract_response import ExtractResponse
 from .types.advanced_search_settings_param import AdvancedSearchSettingsParam
@@ -82,13 +89,40 @@ class Parallel(SyncAPIClient):
         api_key: str | None = None,
         base_url: str | httpx.URL | None = None,
         timeout: float | Timeout | None | NotGiven = not_given,
+        # Upper bound in seconds on the duration of a call, including every retry and the backoff between them.
+        total_timeout: float | None = None,
+        # Maximum time in seconds that an event stream can go without receiving an event or heartbeat, after
+        # which it's resumed or an `APITimeoutError` is raised. Defaults to the read timeout.
+        stream_idle_timeout: float | None = None,
         max_retries: int = DEFAULT_MAX_RETRIES,
         default_headers: Mapping[str, str] | None = None,
         default_query: Mapping[str, object] | None = None,
+        # Throttle requests client-side and pause every caller to an endpoint when it is rate limited.
+        rate_limiter: RateLimiter | None = None,
+        # Send a duplicate of requests that are slower than usual and use whichever response arrives first.
+        hedging: HedgingPolicy | None = None,
+        # Cache search and extract responses, see `ResponseCache`.
+        response_cache: ResponseCache | None = None,
+        # Encode request bodies and decode responses with a faster JSON library, e.g. `OrjsonCodec()`.
+        json_codec: JSONCodec | None = None,
+        # Compress large request bodies, e.g. `task_group.add_runs` batches, see `RequestCompression`.
+        request_compression: RequestCompression | None = None,
+        # Merge identical GET requests that are in flight at the same time into a single HTTP request.
+        coalesce_requests: bool = False,
+        # Store completed task run results and run inputs, which never change, so they are only fetched once.
+        artifact_cache: CacheBackend | None = None,
+        # Create the runs of `task_run.create_batched()` calls in batches with `task_group.add_runs()`.
+        task_run_batching: TaskRunBatching | None = None,
         # Configure a custom httpx client.
         # We provide a `DefaultHttpxClient` class that you can pass to retain the default values we use for `limits`, `timeout` & `follow_redirects`.
         # See the [httpx documentation](https://www.python-httpx.org/api/#client) for more details.
         http_client: httpx.Client | None = None,
+        # Use HTTP/2, which multiplexes many concurrent requests over each connection.
+        # Requires the `http2` extra, i.e. `pip install parallel-web[http2]`.
+        http2: bool = False,
+        # Connection pool limits, defaults to `DEFAULT_CONNECTION_LIMITS`.
+        # Neither of these can be combined with a custom `http_client`.
+        connection_limits: httpx.Limits | None = None,
         # Enable or disable schema validation for data returned by the API.
         # When enabled an error APIResponseValidationError is raised
         # if the API responds with invalid data for the expected schema.
@@ -110,6 +144,9 @@ class Parallel(SyncAPIClient):
                 "The api_key client option must be set either by passing api_key to the client or by setting the PARALLEL_API_KEY environment variable"
             )
         self.api_key = api_key
+        self._artifact_cache = artifact_cache
+        self._task_run_batching = task_run_batching
+        self._task_run_batcher = TaskRunBatcher(task_run_batching) if task_run_batching is not None else None
 
         if base_url is None:
             base_url = os.environ.get("PARALLEL_BASE_URL")
@@ -130,9 +167,19 @@ class Parallel(SyncAPIClient):
             base_url=base_url,
             max_retries=max_retries,
             timeout=timeout,
+            total_timeout=total_timeout,
+            stream_idle_timeout=stream_idle_timeout,
             http_client=http_client,
+            http2=http2,
+            connection_limits=connection_limits,
             custom_headers=default_headers,
             custom_query=default_query,
+            rate_limiter=rate_limiter,
+            hedging=hedging,
+            response_cache=response_cache,
+            json_codec=json_codec,
+            request_compression=request_compression,
+            coalesce_requests=coalesce_requests,
             _strict_response_validation=_strict_response_validation,
         )
 
@@ -226,12 +273,24 @@ class Parallel(SyncAPIClient):
         api_key: str | None = None,
         base_url: str | httpx.URL | None = None,
         timeout: float | Timeout | None | NotGiven = not_given,
+        total_timeout: float | None | NotGiven = not_given,
+        stream_idle_timeout: float | None | NotGiven = not_given,
         http_client: httpx.Client | None = None,
+        http2: bool | NotGiven = not_given,
+        connection_limits: httpx.Limits | None = None,
         max_retries: int | NotGiven = not_given,
         default_headers: Mapping[str, str] | None = None,
         set_default_headers: Mapping[str, str] | None = None,
         default_query: Mapping[str, object] | None = None,
         set_default_query: Mapping[str, object] | None = None,
+        rate_limiter: RateLimiter | None = None,
+        hedging: HedgingPolicy | None = None,
+        response_cache: ResponseCache | None = None,
+        json_codec: JSONCodec | None = None,
+        request_compression: RequestCompression | None = None,
+        coalesce_requests: bool | NotGiven = not_given,
+        artifact_cache: CacheBackend | None = None,
+        task_run_batching: TaskRunBatching | None = None,
         _extra_kwargs: Mapping[str, Any] = {},
     ) -> Self:
         """
@@ -255,17 +314,47 @@ class Parallel(SyncAPIClient):
         elif set_default_query is not None:
             params = set_default_query
 
-        http_client = http_client or self._client
-        return self.__class__(
+        http2 = http2 if is_given(http2) else self._http2
+        connection_limits = connection_limits or self._connection_limits
+        if http_client is None and http2 == self._http2 and connection_limits == self._connection_limits:
+            # otherwise a new HTTP client has to be created with the given options
+            http_client = self._client
+        client = self.__class__(
             api_key=api_key or self.api_key,
             base_url=base_url or self.base_url,
             timeout=self.timeout if isinstance(timeout, NotGiven) else timeout,
+            total_timeout=self.total_timeout if isinstance(total_timeout, NotGiven) else total_timeout,
+            stream_idle_timeout=(
+                self.stream_idle_timeout if isinstance(stream_idle_timeout, NotGiven) else stream_idle_timeout
+            ),
             http_client=http_client,
+            http2=http2 if http_client is None else False,
+            connection_limits=connection_limits if http_client is None else None,
             max_retries=max_retries if is_given(max_retries) else self.max_retries,
             default_headers=headers,
             default_query=params,
+            rate_limiter=rate_limiter or self._rate_limiter,
+            hedging=hedging or self._hedging,
+            response_cache=response_cache or self._response_cache,
+            json_codec=json_codec or self._json_codec,
+            request_compression=request_compression or self._request_compression,
+            coalesce_requests=coalesce_requests if is_given(coalesce_requests) else self._single_flight is not None,
+            artifact_cache=artifact_cache or self._artifact_cache,
+            task_run_batching=task_run_batching or self._task_run_batching,
             **_extra_kwargs,
         )
+        if http_client is self._client:
+            # the copy shares the connection pool, the options it was created with and the threads
+            # that hedged requests are sent from
+            client._http2 = self._http2
+            client._connection_limits = self._connection_limits
+            client._hedging_threads = self._hedging_threads
+        # the copy merges its requests with the ones of this client and adds runs to the same batches
+        if client._single_flight is not None and self._single_flight is not None:
+            client._single_flight = self._single_flight
+        if task_run_batching is None:
+            client._task_run_batcher = self._task_run_batcher
+        return client
 
     # Alias for `copy` for nicer inline usage, e.g.
     # client.with_options(timeout=10).foo.create(...)
@@ -476,13 +565,42 @@ class AsyncParallel(AsyncAPIClient):
         api_key: str | None = None,
         base_url: str | httpx.URL | None = None,
         timeout: float | Timeout | None | NotGiven = not_given,
+        # Upper bound in seconds on the duration of a call, including every retry and the backoff between them.
+        total_timeout: float | None = None,
+        # Maximum time in seconds that an event stream can go without receiving an event or heartbeat, after
+        # which it's resumed or an `APITimeoutError` is raised. Defaults to the read timeout.
+        stream_idle_timeout: float | None = None,
         max_retries: int = DEFAULT_MAX_RETRIES,
         default_headers: Mapping[str, str] | None = None,
         default_query: Mapping[str, object] | None = None,
+        # Throttle requests client-side and pause every caller to an endpoint when it is rate limited.
+        rate_limiter: RateLimiter | None = None,
+        # Send a duplicate of requests that are slower than usual and use whichever response arrives first.
+        hedging: HedgingPolicy | None = None,
+        # Cache search and extract responses, see `ResponseCache`.
+        response_cache: ResponseCache | None = None,
+        # Encode request bodies and decode responses with a faster JSON library, e.g. `OrjsonCodec()`.
+        json_codec: JSONCodec | None = None,
+        # Compress large request bodies, e.g. `task_group.add_runs` batches, see `RequestCompression`.
+        request_compression: RequestCompression | None = None,
+        # Merge identical GET requests that are in flight at the same time into a single HTTP request.
+        coalesce_requests: bool = False,
+        # Store completed task run results and run inputs, which never change, so they are only fetched once.
+        artifact_cache: CacheBackend | None = None,
+        # Create the runs of `task_run.create_batched()` calls in batches with `task_group.add_runs()`.
+        task_run_batching: TaskRunBatching | None = None,
+        # Adapt the number of concurrent requests to what the API can currently sustain.
+        concurrency_limiter: AdaptiveConcurrencyLimiter | None = None,
         # Configure a custom httpx client.
         # We provide a `DefaultAsyncHttpxClient` class that you can pass to retain the default values we use for `limits`, `timeout` & `follow_redirects`.
         # See the [httpx documentation](https://www.python-httpx.org/api/#asyncclient) for more details.
         http_client: httpx.AsyncClient | None = None,
+        # Use HTTP/2, which multiplexes many concurrent requests over each connection.
+        # Requires the `http2` extra, i.e. `pip install parallel-web[http2]`.
+        http2: bool = False,
+        # Connection pool limits, defaults to `DEFAULT_CONNECTION_LIMITS`.
+        # Neither of these can be combined with a custom `http_client`.
+        connection_limits: httpx.Limits | None = None,
         # Enable or disable schema validation for data returned by the API.
         # When enabled an error APIResponseValidationError is raised
         # if the API responds with invalid data for the expected schema.
@@ -504,6 +622,9 @@ class AsyncParallel(AsyncAPIClient):
                 "The api_key client option must be set either by passing api_key to the client or by setting the PARALLEL_API_KEY environment variable"
             )
         self.api_key = api_key
+        self._artifact_cache = artifact_cache
+        self._task_run_batching = task_run_batching
+        self._task_run_batcher = AsyncTaskRunBatcher(task_run_batching) if task_run_batching is not None else None
 
         if base_url is None:
             base_url = os.environ.get("PARALLEL_BASE_URL")
@@ -524,9 +645,20 @@ class AsyncParallel(AsyncAPIClient):
             base_url=base_url,
             max_retries=max_retries,
             timeout=timeout,
+            total_timeout=total_timeout,
+            stream_idle_timeout=stream_idle_timeout,
             http_client=http_client,
+            http2=http2,
+            connection_limits=connection_limits,
             custom_headers=default_headers,
             custom_query=default_query,
+            rate_limiter=rate_limiter,
+            hedging=hedging,
+            response_cache=response_cache,
+            json_codec=json_codec,
+            request_compression=request_compression,
+            coalesce_requests=coalesce_requests,
+            concurrency_limiter=concurrency_limiter,
             _strict_response_validation=_strict_response_validation,
         )
 
@@ -620,12 +752,25 @@ class AsyncParallel(AsyncAPIClient):
         api_key: str | None = None,
         base_url: str | httpx.URL | None = None,
         timeout: float | Timeout | None | NotGiven = not_given,
+        total_timeout: float | None | NotGiven = not_given,
+        stream_idle_timeout: float | None | NotGiven = not_given,
         http_client: httpx.AsyncClient | None = None,
+        http2: bool | NotGiven = not_given,
+        connection_limits: httpx.Limits | None = None,
         max_retries: int | NotGiven = not_given,
         default_headers: Mapping[str, str] | None = None,
         set_default_headers: Mapping[str, str] | None = None,
         default_query: Mapping[str, object] | None = None,
         set_default_query: Mapping[str, object] | None = None,
+        rate_limiter: RateLimiter | None = None,
+        hedging: HedgingPolicy | None = None,
+        response_cache: ResponseCache | None = None,
+        json_codec: JSONCodec | None = None,
+        request_compression: RequestCompression | None = None,
+        coalesce_requests: bool | NotGiven = not_given,
+        concurrency_limiter: AdaptiveConcurrencyLimiter | None = None,
+        artifact_cache: CacheBackend | None = None,
+        task_run_batching: TaskRunBatching | None = None,
         _extra_kwargs: Mapping[str, Any] = {},
     ) -> Self:
         """
@@ -649,17 +794,46 @@ class AsyncParallel(AsyncAPIClient):
         elif set_default_query is not None:
             params = set_default_query
 
-        http_client = http_client or self._client
-        return self.__class__(
+        http2 = http2 if is_given(http2) else self._http2
+        connection_limits = connection_limits or self._connection_limits
+        if http_client is None and http2 == self._http2 and connection_limits == self._connection_limits:
+            # otherwise a new HTTP client has to be created with the given options
+            http_client = self._client
+        client = self.__class__(
             api_key=api_key or self.api_key,
             base_url=base_url or self.base_url,
             timeout=self.timeout if isinstance(timeout, NotGiven) else timeout,
+            total_timeout=self.total_timeout if isinstance(total_timeout, NotGiven) else total_timeout,
+            stream_idle_timeout=(
+                self.stream_idle_timeout if isinstance(stream_idle_timeout, NotGiven) else stream_idle_timeout
+            ),
             http_client=http_client,
+            http2=http2 if http_client is None else False,
+            connection_limits=connection_limits if http_client is None else None,
             max_retries=max_retries if is_given(max_retries) else self.max_retries,
             default_headers=headers,
             default_query=params,
+            rate_limiter=rate_limiter or self._rate_limiter,
+            hedging=hedging or self._hedging,
+            response_cache=response_cache or self._response_cache,
+            json_codec=json_codec or self._json_codec,
+            request_compression=request_compression or self._request_compression,
+            coalesce_requests=coalesce_requests if is_given(coalesce_requests) else self._single_flight is not None,
+            artifact_cache=artifact_cache or self._artifact_cache,
+            task_run_batching=task_run_batching or self._task_run_batching,
+            concurrency_limiter=concurrency_limiter or self._concurrency_limiter,
             **_extra_kwargs,
         )
+        if http_client is self._client:
+            # the copy shares the connection pool, and so the options it was created with
+            client._http2 = self._http2
+            client._connection_limits = self._connection_limits
+        # the copy merges its requests with the ones of this client and adds runs to the same batches
+        if client._single_flight is not None and self._single_flight is not None:
+            client._single_flight = self._single_flight
+        if task_run_batching is None:
+            client._task_run_batcher = self._task_run_batcher
+        return client
 
     # Alias for `copy` for nicer inline usage, e.g.
     # client.with_options(timeout=10).foo.create(...)
@@ -7,6 +7,10 @@ OVERRIDE_CAST_TO_HEADER = "____stainless_override_cast_to"
 
 # default timeout for execution requests which wait for results is 1 hour.
 DEFAULT_EXECUTE_TIMEOUT_SECONDS = 3600
+# waiting for results is split into requests that the server holds for at most this many seconds,
+# plus a grace period before the client gives up on each of them.
+LONG_POLL_CHUNK_SECONDS = 60
+LONG_POLL_GRACE_SECONDS = 5.0
 # default timeout for http requests is 10 minutes.
 DEFAULT_TIMEOUT_SECONDS = 600
 DEFAULT_TIMEOUT = httpx.Timeout(timeout=DEFAULT_TIMEOUT_SECONDS, connect=5.0)
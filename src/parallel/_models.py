@@ -878,6 +878,8 @@ class FinalRequestOptionsInput(TypedDict, total=False):
     headers: Headers
     max_retries: int
     timeout: float | Timeout | None
+    total_timeout: float | None
+    stream_idle_timeout: float | None
     files: HttpxRequestFiles | None
     idempotency_key: str
     content: Union[bytes, bytearray, IO[bytes], Iterable[bytes], AsyncIterable[bytes], None]
@@ -894,6 +896,8 @@ class FinalRequestOptions(pydantic.BaseModel):
     headers: Union[Headers, NotGiven] = NotGiven()
     max_retries: Union[int, NotGiven] = NotGiven()
     timeout: Union[float, Timeout, None, NotGiven] = NotGiven()
+    total_timeout: Union[float, None, NotGiven] = NotGiven()
+    stream_idle_timeout: Union[float, None, NotGiven] = NotGiven()
     files: Union[HttpxRequestFiles, None] = None
     idempotency_key: Union[str, None] = None
     post_parser: Union[Callable[[Any], Any], NotGiven] = NotGiven()
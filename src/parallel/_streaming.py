@@ -2,14 +2,33 @@
 from __future__ import annotations
 
 import json
+import time
+import asyncio
 import inspect
+import logging
 from types import TracebackType
-from typing import TYPE_CHECKING, Any, Generic, TypeVar, Iterator, Optional, AsyncIterator, cast
+from random import random
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Generic,
+    TypeVar,
+    Callable,
+    Iterator,
+    Optional,
+    AsyncIterator,
+    AsyncGenerator,
+    cast,
+)
 from typing_extensions import Self, Protocol, TypeGuard, override, get_origin, runtime_checkable
 
+import anyio
 import httpx
+import sniffio
 
-from ._utils import extract_type_var_from_base
+from ._utils import is_mapping, extract_type_var_from_base
+from ._constants import MAX_RETRY_DELAY, INITIAL_RETRY_DELAY
+from ._exceptions import APIStatusError, APITimeoutError, APIConnectionError
 
 if TYPE_CHECKING:
     from ._client import Parallel, AsyncParallel
@@ -17,6 +36,9 @@ if TYPE_CHECKING:
 
 
 _T = TypeVar("_T")
+_R = TypeVar("_R")
+
+log: logging.Logger = logging.getLogger(__name__)
 
 
 class Stream(Generic[_T]):
@@ -51,19 +73,42 @@ class Stream(Generic[_T]):
     def _iter_events(self) -> Iterator[ServerSentEvent]:
         yield from self._decoder.iter_bytes(self.response.iter_bytes())
 
-    def __stream__(self) -> Iterator[_T]:
-        cast_to = cast(Any, self._cast_to)
-        response = self.response
-        process_data = self._client._process_response_data
-        iterator = self._iter_events()
+    def iter_json(self) -> Iterator[Any]:
+        """Iterates over the JSON payload of each event as plain dicts and lists, use it instead of
+        iterating over the stream itself.
 
+        This skips validating the payloads and constructing models from them, which dominates the
+        cost of iterating when events are only forwarded to another system.
+        """
+        loads = self._client._json_codec.loads
+        return self._iter_processed(lambda sse: loads(sse.data))
+
+    def iter_data(self) -> Iterator[bytes]:
+        """Iterates over the `data` of each event as the raw bytes that were received, without
+        decoding or parsing them, use it instead of iterating over the stream itself.
+        """
+        return self._iter_processed(lambda sse: sse.raw_data)
+
+    def _iter_processed(self, process: Callable[[ServerSentEvent], _R]) -> Iterator[_R]:
+        response = self.response
         try:
-            for sse in iterator:
-                yield process_data(data=sse.json(), cast_to=cast_to, response=response)
+            for sse in self._iter_events():
+                yield process(sse)
+        except httpx.TimeoutException as err:
+            raise APITimeoutError(request=response.request) from err
         finally:
             # Ensure the response is closed even if the consumer doesn't read all data
             response.close()
 
+    def __stream__(self) -> Iterator[_T]:
+        cast_to = cast(Any, self._cast_to)
+        process_data = self._client._process_response_data
+        loads = self._client._json_codec.loads
+
+        yield from self._iter_processed(
+            lambda sse: process_data(data=loads(sse.data), cast_to=cast_to, response=self.response)
+        )
+
     def __enter__(self) -> Self:
         return self
 
@@ -90,6 +135,8 @@ class AsyncStream(Generic[_T]):
     response: httpx.Response
     _options: Optional[FinalRequestOptions] = None
     _decoder: SSEDecoder | SSEBytesDecoder
+    _prefetcher: Optional[_AsyncPrefetcher[Any]] = None
+    _prefetch_size: Optional[int] = None
 
     def __init__(
         self,
@@ -117,18 +164,71 @@ class AsyncStream(Generic[_T]):
         async for sse in self._decoder.aiter_bytes(self.response.aiter_bytes()):
             yield sse
 
+    def iter_json(self) -> AsyncIterator[Any]:
+        """Iterates over the JSON payload of each event as plain dicts and lists, use it instead of
+        iterating over the stream itself.
+
+        This skips validating the payloads and constructing models from them, which dominates the
+        cost of iterating when events are only forwarded to another system.
+        """
+        loads = self._client._json_codec.loads
+        return self._maybe_prefetch(self._iter_processed(lambda sse: loads(sse.data)))
+
+    def iter_data(self) -> AsyncIterator[bytes]:
+        """Iterates over the `data` of each event as the raw bytes that were received, without
+        decoding or parsing them, use it instead of iterating over the stream itself.
+        """
+        return self._maybe_prefetch(self._iter_processed(lambda sse: sse.raw_data))
+
+    async def _iter_processed(self, process: Callable[[ServerSentEvent], _R]) -> AsyncIterator[_R]:
+        response = self.response
+        try:
+            async for sse in self._iter_events():
+                yield process(sse)
+        except httpx.TimeoutException as err:
+            raise APITimeoutError(request=response.request) from err
+        finally:
+            # Ensure the response is closed even if the consumer doesn't read all data
+            await response.aclose()
+
     async def __stream__(self) -> AsyncIterator[_T]:
         cast_to = cast(Any, self._cast_to)
-        response = self.response
         process_data = self._client._process_response_data
-        iterator = self._iter_events()
+        loads = self._client._json_codec.loads
 
+        iterator = self._maybe_prefetch(
+            self._iter_processed(
+                lambda sse: process_data(data=loads(sse.data), cast_to=cast_to, response=self.response)
+            )
+        )
         try:
-            async for sse in iterator:
-                yield process_data(data=sse.json(), cast_to=cast_to, response=response)
+            async for item in iterator:
+                yield item
         finally:
-            # Ensure the response is closed even if the consumer doesn't read all data
-            await response.aclose()
+            # stops reading ahead once this generator is closed or finalized
+            if isinstance(iterator, _AsyncPrefetcher):
+                await iterator.aclose()
+
+    def prefetch(self, max_events: int = 32) -> Self:
+        """Reads and parses up to `max_events` events ahead of the consumer in a background task,
+        so the connection keeps being read while the consumer is busy with earlier events.
+
+        Reading pauses while `max_events` events are buffered. The background task is cancelled by
+        `close()`, when leaving `async with stream`, or once the iterator is closed or garbage
+        collected after the consumer stopped iterating. Call it before iterating, it applies to
+        `iter_json()` and `iter_data()` as well. Prefetching requires asyncio, with other async
+        libraries events are read on demand.
+        """
+        if max_events < 1:
+            raise ValueError(f"Expected max_events to be at least 1 but received {max_events}")
+        self._prefetch_size = max_events
+        return self
+
+    def _maybe_prefetch(self, iterator: AsyncIterator[_R]) -> AsyncIterator[_R]:
+        if self._prefetch_size is None:
+            return iterator
+        self._prefetcher = _AsyncPrefetcher(iterator, max_items=self._prefetch_size)
+        return self._prefetcher
 
     async def __aenter__(self) -> Self:
         return self
@@ -147,25 +247,290 @@ class AsyncStream(Generic[_T]):
 
         Automatically called if the response body is read to completion.
         """
+        if self._prefetcher is not None:
+            await self._prefetcher.aclose()
         await self.response.aclose()
 
 
+class ResumableStream(Stream[_T]):
+    """A `Stream` that reconnects transparently when the connection drops mid-stream.
+
+    The request is sent again with `last_event_id` set to the id of the last event that was
+    received, so the consumer sees one continuous iterator without lost or duplicated events.
+    Reconnects wait for the `retry` interval sent by the server, backing off exponentially on
+    consecutive failures, and the stream gives up after `max_retries` reconnects in a row that
+    don't produce an event. A stream that stalls for longer than the client's `stream_idle_timeout`
+    is resumed the same way.
+
+    Events without an SSE `id` field are resumed from the `event_id` of their payload, so with
+    `iter_data()` the payload of those events is still parsed.
+    """
+
+    last_event_id: Optional[str]
+    """The id of the last event that was received, which the stream resumes from."""
+
+    def __init__(
+        self,
+        *,
+        cast_to: type[_T],
+        response: httpx.Response,
+        client: Parallel,
+        options: Optional[FinalRequestOptions] = None,
+    ) -> None:
+        super().__init__(cast_to=cast_to, response=response, client=client, options=options)
+        self.last_event_id = _initial_last_event_id(options)
+        self._retry: Optional[int] = None
+
+    @override
+    def _iter_processed(self, process: Callable[[ServerSentEvent], _R]) -> Iterator[_R]:
+        max_retries = self._options.get_max_retries(self._client.max_retries) if self._options is not None else 0
+        failures = 0
+
+        try:
+            while True:
+                try:
+                    for sse in self._iter_events():
+                        item = process(sse)
+                        self._record(sse, item)
+                        failures = 0
+                        yield item
+                    return
+                except httpx.TransportError as err:
+                    error: Exception = err
+
+                self.response.close()
+                while True:
+                    failures += 1
+                    if failures > max_retries:
+                        if isinstance(error, httpx.TimeoutException):
+                            raise APITimeoutError(request=self.response.request) from error
+                        raise error
+                    time.sleep(_reconnect_delay(failures, retry=self._retry))
+                    try:
+                        self._reconnect()
+                        break
+                    except (APIConnectionError, APIStatusError) as err:
+                        if isinstance(err, APIStatusError) and not self._client._should_retry(err.response):
+                            raise
+                        error = err
+        finally:
+            # Ensure the response is closed even if the consumer doesn't read all data
+            self.response.close()
+
+    def _record(self, sse: ServerSentEvent, item: object) -> None:
+        event_id = _event_id(sse, item, loads=self._client._json_codec.loads)
+        if event_id is not None:
+            self.last_event_id = event_id
+        if sse.retry is not None:
+            self._retry = sse.retry
+
+    def _reconnect(self) -> None:
+        assert self._options is not None
+        options = _resume_options(self._options, self.last_event_id)
+        log.info("Resuming stream from %s after event %s", options.url, self.last_event_id)
+        self.response = self._client.request(httpx.Response, options, stream=True)
+        self._decoder = self._client._make_sse_decoder()
+
+
+class AsyncResumableStream(AsyncStream[_T]):
+    """The async counterpart of `ResumableStream`."""
+
+    last_event_id: Optional[str]
+    """The id of the last event that was received, which the stream resumes from."""
+
+    def __init__(
+        self,
+        *,
+        cast_to: type[_T],
+        response: httpx.Response,
+        client: AsyncParallel,
+        options: Optional[FinalRequestOptions] = None,
+    ) -> None:
+        super().__init__(cast_to=cast_to, response=response, client=client, options=options)
+        self.last_event_id = _initial_last_event_id(options)
+        self._retry: Optional[int] = None
+
+    @override
+    async def _iter_processed(self, process: Callable[[ServerSentEvent], _R]) -> AsyncIterator[_R]:
+        max_retries = self._options.get_max_retries(self._client.max_retries) if self._options is not None else 0
+        failures = 0
+
+        try:
+            while True:
+                try:
+                    async for sse in self._iter_events():
+                        item = process(sse)
+                        self._record(sse, item)
+                        failures = 0
+                        yield item
+                    return
+                except httpx.TransportError as err:
+                    error: Exception = err
+
+                await self.response.aclose()
+                while True:
+                    failures += 1
+                    if failures > max_retries:
+                        if isinstance(error, httpx.TimeoutException):
+                            raise APITimeoutError(request=self.response.request) from error
+                        raise error
+                    await anyio.sleep(_reconnect_delay(failures, retry=self._retry))
+                    try:
+                        await self._reconnect()
+                        break
+                    except (APIConnectionError, APIStatusError) as err:
+                        if isinstance(err, APIStatusError) and not self._client._should_retry(err.response):
+                            raise
+                        error = err
+        finally:
+            # Ensure the response is closed even if the consumer doesn't read all data
+            await self.response.aclose()
+
+    def _record(self, sse: ServerSentEvent, item: object) -> None:
+        event_id = _event_id(sse, item, loads=self._client._json_codec.loads)
+        if event_id is not None:
+            self.last_event_id = event_id
+        if sse.retry is not None:
+            self._retry = sse.retry
+
+    async def _reconnect(self) -> None:
+        assert self._options is not None
+        options = _resume_options(self._options, self.last_event_id)
+        log.info("Resuming stream from %s after event %s", options.url, self.last_event_id)
+        self.response = await self._client.request(httpx.Response, options, stream=True)
+        self._decoder = self._client._make_sse_decoder()
+
+
+def _initial_last_event_id(options: Optional[FinalRequestOptions]) -> Optional[str]:
+    if options is None or not is_mapping(options.params):
+        return None
+    last_event_id = options.params.get("last_event_id")
+    return last_event_id if isinstance(last_event_id, str) else None
+
+
+def _event_id(sse: ServerSentEvent, item: object, *, loads: Callable[[bytes], Any]) -> Optional[str]:
+    # the API sends the cursor as the `event_id` of the event payload, the SSE `id` field takes precedence
+    if sse.id:
+        return sse.id
+    if isinstance(item, bytes):
+        # `iter_data()` leaves the payload unparsed, but it's needed to resume
+        item = loads(item)
+    event_id = item.get("event_id") if is_mapping(item) else getattr(item, "event_id", None)
+    return event_id if isinstance(event_id, str) and event_id else None
+
+
+def _resume_options(options: FinalRequestOptions, last_event_id: Optional[str]) -> FinalRequestOptions:
+    options = options.model_copy()
+    if last_event_id is not None:
+        options.params = {**options.params, "last_event_id": last_event_id}
+    # failed reconnects are retried by the stream itself, so they count against the same budget
+    options.max_retries = 0
+    return options
+
+
+def _reconnect_delay(failures: int, *, retry: Optional[int]) -> float:
+    """Returns how long to wait before the given reconnect attempt, in seconds.
+
+    The `retry` interval sent by the server, in milliseconds, is waited before the first attempt
+    and doubled for every consecutive attempt after it. Without it, the stream backs off the same
+    way as retried requests.
+    """
+    nb_failures = min(failures - 1, 1000)
+    if retry is not None:
+        interval = retry / 1000
+        return max(min(interval * pow(2.0, nb_failures), max(interval, MAX_RETRY_DELAY)), 0)
+
+    sleep_seconds = min(INITIAL_RETRY_DELAY * pow(2.0, nb_failures), MAX_RETRY_DELAY)
+    return sleep_seconds * (1 - 0.25 * random())
+
+
+class _AsyncPrefetcher(Generic[_R]):
+    """Iterates over `iterator` in a background task, buffering up to `max_items` items."""
+
+    def __init__(self, iterator: AsyncIterator[_R], *, max_items: int) -> None:
+        self._iterator = iterator
+        # the queue itself is unbounded so that the end of the iteration can always be put on it,
+        # the number of buffered items is bounded by `_space` instead
+        self._queue: asyncio.Queue[tuple[bool, Any]] = asyncio.Queue()
+        self._space = asyncio.Semaphore(max_items)
+        self._task: Optional[asyncio.Task[None]] = None
+        self._done = False
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> _R:
+        if self._done:
+            raise StopAsyncIteration
+        if self._task is None:
+            if sniffio.current_async_library() != "asyncio":
+                return await self._iterator.__anext__()
+            # the task mustn't reference the prefetcher, so that a prefetcher that is dropped
+            # without being closed can be garbage collected, which cancels the task
+            self._task = asyncio.get_running_loop().create_task(_fill(self._iterator, self._queue, self._space))
+
+        is_item, value = await self._queue.get()
+        if is_item:
+            self._space.release()
+            return cast(_R, value)
+
+        self._done = True
+        if value is not None:
+            raise value
+        raise StopAsyncIteration
+
+    async def aclose(self) -> None:
+        self._done = True
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if isinstance(self._iterator, AsyncGenerator):
+            await self._iterator.aclose()
+
+    def __del__(self) -> None:
+        task = self._task
+        if task is not None and not task.done() and not task.get_loop().is_closed():
+            task.cancel()
+
+
+async def _fill(iterator: AsyncIterator[Any], queue: asyncio.Queue[tuple[bool, Any]], space: asyncio.Semaphore) -> None:
+    error: Optional[Exception] = None
+    try:
+        async for item in iterator:
+            # waits while the buffer is full, so that the connection isn't read any further
+            await space.acquire()
+            queue.put_nowait((True, item))
+    except Exception as err:
+        error = err
+    finally:
+        # also when the task is cancelled, so that a consumer is never left waiting for an item
+        queue.put_nowait((False, error))
+
+
 class ServerSentEvent:
     def __init__(
         self,
         *,
         event: str | None = None,
-        data: str | None = None,
+        data: str | bytes | None = None,
         id: str | None = None,
         retry: int | None = None,
+        loads: Callable[[str | bytes], Any] | None = None,
     ) -> None:
         if data is None:
             data = ""
 
         self._id = id
-        self._data = data
+        # bytes are only decoded when `data` is accessed
+        self._data: str | None = data if isinstance(data, str) else None
+        self._raw_data: bytes | None = data if isinstance(data, bytes) else None
         self._event = event or None
         self._retry = retry
+        # the client's `JSONCodec.loads()`, if the event was decoded from a client's stream
+        self._loads = loads if loads is not None else json.loads
 
     @property
     def event(self) -> str | None:
@@ -181,10 +546,21 @@ class ServerSentEvent:
 
     @property
     def data(self) -> str:
+        if self._data is None:
+            assert self._raw_data is not None
+            self._data = self._raw_data.decode("utf-8")
         return self._data
 
+    @property
+    def raw_data(self) -> bytes:
+        """The `data` field as the bytes that were received."""
+        if self._raw_data is None:
+            self._raw_data = self.data.encode("utf-8")
+        return self._raw_data
+
     def json(self) -> Any:
-        return json.loads(self.data)
+        # JSON parsers take bytes as well, which saves decoding them first
+        return self._loads(self._raw_data if self._raw_data is not None else self.data)
 
     @override
     def __repr__(self) -> str:
@@ -197,7 +573,8 @@ class SSEDecoder:
     _retry: int | None
     _last_event_id: str | None
 
-    def __init__(self) -> None:
+    def __init__(self, *, loads: Callable[[str | bytes], Any] | None = None) -> None:
+        self._loads = loads
         self._event = None
         self._data = []
         self._last_event_id = None
@@ -259,6 +636,7 @@ class SSEDecoder:
                 data="\n".join(self._data),
                 id=self._last_event_id,
                 retry=self._retry,
+                loads=self._loads,
             )
 
             # NOTE: as per the SSE spec, do not reset last_event_id.
@@ -296,6 +674,122 @@ class SSEDecoder:
         return None
 
 
+class IncrementalSSEDecoder:
+    """An `SSEBytesDecoder` that parses the stream in a single pass over one reusable buffer.
+
+    Unlike `SSEDecoder`, which re-joins each event line by line, every chunk is only scanned for
+    line terminators once and complete lines are split off the buffer in one go. The `data` lines
+    of an event are joined once when it's dispatched and only decoded when `ServerSentEvent.data`
+    is accessed, so the cost of decoding stays linear in the size of large events.
+    """
+
+    _data: list[bytes]
+    _event: str | None
+    _retry: int | None
+    _last_event_id: str | None
+
+    def __init__(self, *, loads: Callable[[str | bytes], Any] | None = None) -> None:
+        self._loads = loads
+        self._buffer = bytearray()
+        # how many bytes at the start of the buffer are known not to contain a line terminator
+        self._scanned = 0
+        self._event = None
+        self._data = []
+        self._last_event_id = None
+        self._retry = None
+
+    def iter_bytes(self, iterator: Iterator[bytes]) -> Iterator[ServerSentEvent]:
+        """Given an iterator that yields raw binary data, iterate over it & yield every event encountered"""
+        for chunk in iterator:
+            yield from self._feed(chunk)
+        yield from self._feed(b"", final=True)
+
+    async def aiter_bytes(self, iterator: AsyncIterator[bytes]) -> AsyncIterator[ServerSentEvent]:
+        """Given an async iterator that yields raw binary data, iterate over it & yield every event encountered"""
+        async for chunk in iterator:
+            for sse in self._feed(chunk):
+                yield sse
+        for sse in self._feed(b"", final=True):
+            yield sse
+
+    def _feed(self, chunk: bytes, *, final: bool = False) -> list[ServerSentEvent]:
+        buffer = self._buffer
+        buffer += chunk
+        size = len(buffer)
+
+        if final:
+            end = size
+        else:
+            # only the bytes that arrived since the last call can hold a new line terminator
+            search = self._scanned
+            # a trailing `\r` might be the first half of a `\r\n` split across chunks
+            end = max(buffer.rfind(b"\n", search), buffer.rfind(b"\r", search, size - 1)) + 1
+            self._scanned = size - 1 if buffer.endswith(b"\r") else size
+            if end == 0:
+                return []
+            self._scanned -= end
+
+        with memoryview(buffer) as view:
+            # splitting before decoding means only `\r`, `\n` and `\r\n` end lines
+            lines = view[:end].tobytes().splitlines()
+        del buffer[:end]
+
+        events: list[ServerSentEvent] = []
+        for line in lines:
+            sse = self._process_line(line)
+            if sse is not None:
+                events.append(sse)
+        return events
+
+    def _process_line(self, line: bytes) -> ServerSentEvent | None:
+        # See: https://html.spec.whatwg.org/multipage/server-sent-events.html#event-stream-interpretation  # noqa: E501
+
+        if not line:
+            if not self._event and not self._data and not self._last_event_id and self._retry is None:
+                return None
+
+            sse = ServerSentEvent(
+                event=self._event,
+                data=b"\n".join(self._data),
+                id=self._last_event_id,
+                retry=self._retry,
+                loads=self._loads,
+            )
+
+            # NOTE: as per the SSE spec, do not reset last_event_id.
+            self._event = None
+            self._data = []
+            self._retry = None
+
+            return sse
+
+        if line.startswith(b":"):
+            return None
+
+        fieldname, _, value = line.partition(b":")
+
+        if value.startswith(b" "):
+            value = value[1:]
+
+        if fieldname == b"data":
+            # decoded once, together with the other lines of the event, after it's dispatched
+            self._data.append(value)
+        elif fieldname == b"event":
+            self._event = value.decode("utf-8")
+        elif fieldname == b"id":
+            if b"\0" not in value:
+                self._last_event_id = value.decode("utf-8")
+        elif fieldname == b"retry":
+            try:
+                self._retry = int(value)
+            except ValueError:
+                pass
+        else:
+            pass  # Field is ignored.
+
+        return None
+
+
 @runtime_checkable
 class SSEBytesDecoder(Protocol):
     def iter_bytes(self, iterator: Iterator[bytes]) -> Iterator[ServerSentEvent]:
@@ -120,6 +120,8 @@ class RequestOptions(TypedDict, total=False):
     headers: Headers
     max_retries: int
     timeout: float | Timeout | None
+    total_timeout: float | None
+    stream_idle_timeout: float | None
     params: Query
     extra_json: AnyMapping
     idempotency_key: str
@@ -184,6 +186,33 @@ class Omit:
 omit = Omit()
 
 
+class RawJSON:
+    """
+    JSON that has already been encoded, e.g. a message read from a queue, which is sent as it is
+    instead of being transformed and encoded again.
+
+    It can be given in place of any value in a request body:
+
+    ```py
+    client.task_group.add_runs(
+        task_group_id,
+        inputs=[RawJSON(message) for message in messages],
+    )
+    ```
+
+    The data isn't validated, so it must be valid JSON of the type the API expects.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Union[str, bytes]) -> None:
+        self.data: bytes = data.encode() if isinstance(data, str) else data
+
+    @override
+    def __repr__(self) -> str:
+        return f"RawJSON({self.data!r})"
+
+
 @runtime_checkable
 class ModelBuilderProtocol(Protocol):
     @classmethod
@@ -30,6 +30,7 @@ from ._utils import (
     get_required_header as get_required_header,
     maybe_coerce_boolean as maybe_coerce_boolean,
     maybe_coerce_integer as maybe_coerce_integer,
+    parse_retry_after_header as parse_retry_after_header,
 )
 from ._compat import (
     get_args as get_args,
@@ -1,10 +1,13 @@
+import re
 import json
-from typing import Any
+import uuid
+from typing import Any, List
 from datetime import datetime
 from typing_extensions import override
 
 import pydantic
 
+from .._types import RawJSON
 from .._compat import model_dump
 
 
@@ -14,22 +17,42 @@ def openapi_dumps(obj: Any) -> bytes:
 
     Extends the standard json.dumps with support for additional types
     commonly used in the SDK, such as `datetime`, `pydantic.BaseModel`, etc.
+    `RawJSON` values are included as they are.
     """
-    return json.dumps(
-        obj,
-        cls=_CustomEncoder,
+    if isinstance(obj, RawJSON):
+        return obj.data
+
+    encoder = _CustomEncoder(
         # Uses the same defaults as httpx's JSON serialization
         ensure_ascii=False,
         separators=(",", ":"),
         allow_nan=False,
-    ).encode()
+    )
+    encoded = encoder.encode(obj).encode()
+    if encoder.raw_values:
+        encoded = encoder.splice_raw_values(encoded)
+    return encoded
 
 
 class _CustomEncoder(json.JSONEncoder):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        # `RawJSON` values are encoded as placeholder strings, which are replaced afterwards
+        self.raw_values: List[bytes] = []
+        self._nonce = uuid.uuid4().hex
+
     @override
     def default(self, o: Any) -> Any:
         if isinstance(o, datetime):
             return o.isoformat()
         if isinstance(o, pydantic.BaseModel):
             return model_dump(o, exclude_unset=True, mode="json", by_alias=True)
+        if isinstance(o, RawJSON):
+            self.raw_values.append(o.data)
+            return f"\x00{self._nonce}:{len(self.raw_values) - 1}\x00"
         return super().default(o)
+
+    def splice_raw_values(self, encoded: bytes) -> bytes:
+        # control characters are always escaped, so the placeholders can't be confused with other strings
+        placeholder = re.compile(rb'"\\u0000' + self._nonce.encode() + rb':(\d+)\\u0000"')
+        return placeholder.sub(lambda match: self.raw_values[int(match.group(1))], encoded)
@@ -3,13 +3,14 @@ from __future__ import annotations
 import io
 import base64
 import pathlib
-from typing import Any, Mapping, TypeVar, cast
+import threading
+from typing import Any, Set, Dict, List, Tuple, Mapping, TypeVar, Callable, Optional, cast
 from datetime import date, datetime
 from typing_extensions import Literal, get_args, override, get_type_hints as _get_type_hints
 
-import anyio
 import pydantic
 
+from ._sync import to_thread
 from ._utils import (
     is_list,
     is_given,
@@ -19,7 +20,8 @@ from ._utils import (
     is_sequence,
 )
 from .._files import is_base64_file_input
-from ._compat import get_origin, is_typeddict
+from .._types import Omit, RawJSON, NotGiven
+from ._compat import get_origin, is_typeddict, is_literal_type
 from ._typing import (
     is_list_type,
     is_union_type,
@@ -32,6 +34,9 @@ from ._typing import (
 )
 
 _T = TypeVar("_T")
+_K = TypeVar("_K")
+
+_Transformer = Callable[[object], object]
 
 
 # TODO: support for drilling globals() and locals()
@@ -108,8 +113,13 @@ def transform(
 
     It should be noted that the transformations that this function does are not represented in the type system.
     """
-    transformed = _transform_recursive(data, annotation=cast(type, expected_type))
-    return cast(_T, transformed)
+    if isinstance(data, RawJSON):
+        return data
+
+    transformer, _ = _compile(cast(type, expected_type), cast(type, expected_type))
+    if transformer is None:
+        return data
+    return cast(_T, transformer(data))
 
 
 @lru_cache(maxsize=8096)
@@ -281,170 +291,286 @@ def _transform_typeddict(
     return result
 
 
-async def async_maybe_transform(
-    data: object,
-    expected_type: object,
-) -> Any | None:
-    """Wrapper over `async_transform()` that allows `None` to be passed.
+# Compiled transformers
+#
+# `_transform_recursive()` inspects the type annotations again for every value it visits. Instead,
+# `_compile()` turns a type into a function that only does the work that type requires, once per
+# type. A type that never needs any aliasing or formatting compiles to `None`, i.e. its values
+# are sent as they are, which lets large payloads of such types skip the recursion entirely.
+#
+# The compiled functions behave like `_transform_recursive()`, with the exception that values of
+# plain scalar types are never transformed, even if they are given a pydantic model instead. They
+# also return dicts and lists as they are, instead of a copy, when none of their entries change,
+# so a value that holds nothing to alias or format isn't rebuilt, e.g. a `RunInputParam` without
+# dates or pydantic models.
 
-    See `async_transform()` for more details.
-    """
-    if data is None:
-        return None
-    return await async_transform(data, expected_type)
+_SCALAR_TYPES: Set[object] = {str, int, float, bool, bytes, type(None)}
 
+# the values of fields that aren't given, see `is_given()`
+_OMITTED_TYPES = (NotGiven, Omit)
 
-async def async_transform(
-    data: _T,
-    expected_type: object,
-) -> _T:
-    """Transform dictionaries based off of type information from the given type, for example:
+# TypedDicts that are currently being compiled, to support recursive TypedDicts
+_compiling: Set[type] = set()
+_compiling_lock = threading.RLock()
 
-    ```py
-    class Params(TypedDict, total=False):
-        card_id: Required[Annotated[str, PropertyInfo(alias="cardID")]]
-
-
-    transformed = transform({"card_id": "<my card ID>"}, Params)
-    # {'cardID': '<my card ID>'}
-    ```
 
-    Any keys / data that does not have type information given will be included as is.
+@lru_cache(maxsize=8096)
+def _compile(annotation: type, inner_type: type) -> Tuple[Optional[_Transformer], bool]:
+    """Compiles the transformation of data of the given type, see `_transform_recursive()` for the arguments.
 
-    It should be noted that the transformations that this function does are not represented in the type system.
+    Returns the transformer, or `None` if the data doesn't need to be transformed, and whether the
+    transformer reads files, which requires the async transformation to use async IO instead.
     """
-    transformed = await _async_transform_recursive(data, annotation=cast(type, expected_type))
-    return cast(_T, transformed)
+    stripped_type = strip_annotated_type(inner_type)
+    origin = get_origin(stripped_type) or stripped_type
 
+    # the transformation for data that doesn't match the structure of the type
+    fallback, reads_files = _compile_leaf(annotation, stripped_type)
 
-async def _async_transform_recursive(
-    data: object,
-    *,
-    annotation: type,
-    inner_type: type | None = None,
-) -> object:
-    """Transform the given data against the expected type.
+    if is_typeddict(stripped_type):
+        transform_fields, fields_read_files = _compile_typeddict(stripped_type)
 
-    Args:
-        annotation: The direct type annotation given to the particular piece of data.
-            This may or may not be wrapped in metadata types, e.g. `Required[T]`, `Annotated[T, ...]` etc
+        def transform_typeddict(data: object) -> object:
+            if _is_mapping(data):
+                return transform_fields(data)
+            return fallback(data) if fallback is not None else data
 
-        inner_type: If applicable, this is the "inside" type. This is useful in certain cases where the outside type
-            is a container type such as `List[T]`. In that case `inner_type` should be set to `T` so that each entry in
-            the list can be transformed using the metadata from the container type.
+        return transform_typeddict, reads_files or fields_read_files
 
-            Defaults to the same value as the `annotation` argument.
-    """
-    from .._compat import model_dump
+    if origin == dict:
+        items_type = get_args(stripped_type)[1]
+        transform_item, items_read_files = _compile(items_type, items_type)
+
+        def transform_dict(data: object) -> object:
+            if _is_mapping(data):
+                if transform_item is None:
+                    return data if isinstance(data, dict) else dict(data)
+
+                # only copied once an item changes
+                result: Optional[Dict[object, object]] = None if isinstance(data, dict) else {}
+                for key, value in data.items():
+                    transformed = transform_item(value)
+                    if result is None:
+                        if transformed is value:
+                            continue
+                        result = _copy_until(data, key)
+                    result[key] = transformed
+                return data if result is None else result
+            return fallback(data) if fallback is not None else data
+
+        return transform_dict, reads_files or items_read_files
+
+    if is_list_type(stripped_type) or is_iterable_type(stripped_type) or is_sequence_type(stripped_type):
+        if is_list_type(stripped_type):
+            matches: Callable[[object], bool] = is_list
+        elif is_iterable_type(stripped_type):
+            matches = _is_iterable_not_str
+        else:
+            matches = _is_sequence_not_str
+
+        transform_entry, entries_read_files = _compile(annotation, extract_type_arg(stripped_type, 0))
+
+        def transform_list(data: object) -> object:
+            if matches(data):
+                # dicts are technically iterable, but it is an iterable on the keys of the dict and is not usually
+                # intended as an iterable, so we don't transform it.
+                if isinstance(data, dict):
+                    return cast(object, data)
+                if transform_entry is None:
+                    # we still need to convert to a list to ensure the data is json-serializable
+                    return data if is_list(data) else list(cast(Any, data))
+                if not is_list(data):
+                    return [transform_entry(entry) for entry in cast(Any, data)]
+
+                # only copied once an entry changes
+                result: Optional[List[object]] = None
+                for index, entry in enumerate(data):
+                    transformed = transform_entry(entry)
+                    if result is None:
+                        if transformed is entry:
+                            continue
+                        result = list(data[:index])
+                    result.append(transformed)
+                return data if result is None else result
+            return fallback(data) if fallback is not None else data
+
+        return transform_list, reads_files or entries_read_files
 
-    if inner_type is None:
-        inner_type = annotation
+    if is_union_type(stripped_type):
+        # For union types we run the transformation against all subtypes to ensure that everything is transformed.
+        transformers: list[_Transformer] = []
+        for subtype in get_args(stripped_type):
+            transform_subtype, subtype_reads_files = _compile(annotation, subtype)
+            reads_files = reads_files or subtype_reads_files
+            if transform_subtype is not None:
+                transformers.append(transform_subtype)
 
-    stripped_type = strip_annotated_type(inner_type)
-    origin = get_origin(stripped_type) or stripped_type
-    if is_typeddict(stripped_type) and is_mapping(data):
-        return await _async_transform_typeddict(data, stripped_type)
+        if not transformers:
+            return None, reads_files
+        if len(transformers) == 1:
+            return transformers[0], reads_files
 
-    if origin == dict and is_mapping(data):
-        items_type = get_args(stripped_type)[1]
-        return {key: _transform_recursive(value, annotation=items_type) for key, value in data.items()}
+        def transform_union(data: object) -> object:
+            for transform_subtype in transformers:
+                data = transform_subtype(data)
+            return data
 
-    if (
-        # List[T]
-        (is_list_type(stripped_type) and is_list(data))
-        # Iterable[T]
-        or (is_iterable_type(stripped_type) and is_iterable(data) and not isinstance(data, str))
-        # Sequence[T]
-        or (is_sequence_type(stripped_type) and is_sequence(data) and not isinstance(data, str))
-    ):
-        # dicts are technically iterable, but it is an iterable on the keys of the dict and is not usually
-        # intended as an iterable, so we don't transform it.
-        if isinstance(data, dict):
-            return cast(object, data)
+        return transform_union, reads_files
 
-        inner_type = extract_type_arg(stripped_type, 0)
-        if _no_transform_needed(inner_type):
-            # for some types there is no need to transform anything, so we can get a small
-            # perf boost from skipping that work.
-            #
-            # but we still need to convert to a list to ensure the data is json-serializable
-            if is_list(data):
-                return data
-            return list(data)
+    return fallback, reads_files
 
-        return [await _async_transform_recursive(d, annotation=annotation, inner_type=inner_type) for d in data]
 
-    if is_union_type(stripped_type):
-        # For union types we run the transformation against all subtypes to ensure that everything is transformed.
-        #
-        # TODO: there may be edge cases where the same normalized field name will transform to two different names
-        # in different subtypes.
-        for subtype in get_args(stripped_type):
-            data = await _async_transform_recursive(data, annotation=annotation, inner_type=subtype)
-        return data
-
-    if isinstance(data, pydantic.BaseModel):
-        return model_dump(data, exclude_unset=True, mode="json")
+def _compile_leaf(annotation: type, stripped_type: type) -> Tuple[Optional[_Transformer], bool]:
+    from .._compat import model_dump
 
+    property_info: PropertyInfo | None = None
     annotated_type = _get_annotated_type(annotation)
-    if annotated_type is None:
+    if annotated_type is not None:
+        # ignore the first argument as it is the actual type
+        for metadata in get_args(annotated_type)[1:]:
+            if isinstance(metadata, PropertyInfo) and metadata.format is not None:
+                property_info = metadata
+                break
+
+    if property_info is None:
+        if stripped_type in _SCALAR_TYPES or is_literal_type(stripped_type):
+            return None, False
+
+        def dump_model(data: object) -> object:
+            if isinstance(data, pydantic.BaseModel):
+                return model_dump(data, exclude_unset=True, mode="json")
+            return data
+
+        return dump_model, False
+
+    format_, format_template = cast(PropertyFormat, property_info.format), property_info.format_template
+
+    def format_data(data: object) -> object:
+        if isinstance(data, pydantic.BaseModel):
+            return model_dump(data, exclude_unset=True, mode="json")
+        return _format_data(data, format_, format_template)
+
+    return format_data, format_ == "base64"
+
+
+def _compile_typeddict(expected_type: type) -> Tuple[Callable[[Mapping[str, object]], object], bool]:
+    with _compiling_lock:
+        if expected_type in _compiling:
+            # a recursive TypedDict, its transformer is looked up once it has been compiled
+            return lambda data: _compile(expected_type, expected_type)[0](data), True  # type: ignore[misc]
+
+        _compiling.add(expected_type)
+        try:
+            fields: Dict[str, Tuple[str, Optional[_Transformer]]] = {}
+            reads_files = False
+            for key, type_ in get_type_hints(expected_type, include_extras=True).items():
+                transformer, field_reads_files = _compile(type_, type_)
+                fields[key] = (_maybe_transform_key(key, type_), transformer)
+                reads_files = reads_files or field_reads_files
+        finally:
+            _compiling.discard(expected_type)
+
+    if all(alias == key and transformer is None for key, (alias, transformer) in fields.items()):
+        # only values that aren't given are removed, which are stripped before the request is sent anyway
+        return _strip_not_given, reads_files
+
+    transformers = {key: transformer for key, (_, transformer) in fields.items() if transformer is not None}
+    aliases = {key: alias for key, (alias, _) in fields.items() if alias != key}
+
+    def transform_fields(data: Mapping[str, object]) -> object:
+        # only copied once a field is aliased, changed or removed
+        result: Optional[Dict[str, object]] = None if isinstance(data, dict) else {}
+        for key, value in data.items():
+            if isinstance(value, _OMITTED_TYPES):
+                if result is None:
+                    result = _copy_until(data, key)
+                continue
+
+            # fields without a type annotation are left as they are
+            transformer = transformers.get(key)
+            transformed = value if transformer is None else transformer(value)
+            alias = aliases.get(key, key) if aliases else key
+            if result is None:
+                if transformed is value and alias is key:
+                    continue
+                result = _copy_until(data, key)
+            result[alias] = transformed
+        return data if result is None else result
+
+    return transform_fields, reads_files
+
+
+def _strip_not_given(data: Mapping[str, object]) -> object:
+    if isinstance(data, dict) and all(is_given(value) for value in data.values()):
         return data
+    return {key: value for key, value in data.items() if is_given(value)}
 
-    # ignore the first argument as it is the actual type
-    annotations = get_args(annotated_type)[1:]
-    for annotation in annotations:
-        if isinstance(annotation, PropertyInfo) and annotation.format is not None:
-            return await _async_format_data(data, annotation.format, annotation.format_template)
 
-    return data
+def _copy_until(data: Mapping[_K, object], stop: _K) -> Dict[_K, object]:
+    """Copies the entries of `data` that come before the `stop` key."""
+    result: Dict[_K, object] = {}
+    for key, value in data.items():
+        if key == stop:
+            break
+        result[key] = value
+    return result
 
 
-async def _async_format_data(data: object, format_: PropertyFormat, format_template: str | None) -> object:
-    if isinstance(data, (date, datetime)):
-        if format_ == "iso8601":
-            return data.isoformat()
+def _is_mapping(data: object) -> bool:
+    # checking for a `dict` first avoids the much slower `isinstance()` check against `Mapping`
+    return isinstance(data, dict) or is_mapping(data)
 
-        if format_ == "custom" and format_template is not None:
-            return data.strftime(format_template)
 
-    if format_ == "base64" and is_base64_file_input(data):
-        binary: str | bytes | None = None
+def _is_iterable_not_str(data: object) -> bool:
+    return is_iterable(data) and not isinstance(data, str)
 
-        if isinstance(data, pathlib.Path):
-            binary = await anyio.Path(data).read_bytes()
-        elif isinstance(data, io.IOBase):
-            binary = data.read()
 
-            if isinstance(binary, str):  # type: ignore[unreachable]
-                binary = binary.encode()
+def _is_sequence_not_str(data: object) -> bool:
+    return is_sequence(data) and not isinstance(data, str)
 
-        if not isinstance(binary, bytes):
-            raise RuntimeError(f"Could not read bytes from {data}; Received {type(binary)}")
 
-        return base64.b64encode(binary).decode("ascii")
+async def async_maybe_transform(
+    data: object,
+    expected_type: object,
+) -> Any | None:
+    """Wrapper over `async_transform()` that allows `None` to be passed.
 
-    return data
+    See `async_transform()` for more details.
+    """
+    if data is None:
+        return None
+    return await async_transform(data, expected_type)
 
 
-async def _async_transform_typeddict(
-    data: Mapping[str, object],
-    expected_type: type,
-) -> Mapping[str, object]:
-    result: dict[str, object] = {}
-    annotations = get_type_hints(expected_type, include_extras=True)
-    for key, value in data.items():
-        if not is_given(value):
-            # we don't need to include omitted values here as they'll
-            # be stripped out before the request is sent anyway
-            continue
+async def async_transform(
+    data: _T,
+    expected_type: object,
+) -> _T:
+    """Transform dictionaries based off of type information from the given type, for example:
 
-        type_ = annotations.get(key)
-        if type_ is None:
-            # we do not have a type annotation for this field, leave it as is
-            result[key] = value
-        else:
-            result[_maybe_transform_key(key, type_)] = await _async_transform_recursive(value, annotation=type_)
-    return result
+    ```py
+    class Params(TypedDict, total=False):
+        card_id: Required[Annotated[str, PropertyInfo(alias="cardID")]]
+
+
+    transformed = transform({"card_id": "<my card ID>"}, Params)
+    # {'cardID': '<my card ID>'}
+    ```
+
+    Any keys / data that does not have type information given will be included as is.
+
+    It should be noted that the transformations that this function does are not represented in the type system.
+    """
+    if isinstance(data, RawJSON):
+        return data
+
+    transformer, reads_files = _compile(cast(type, expected_type), cast(type, expected_type))
+    if transformer is None:
+        return data
+    if reads_files:
+        # base64 file inputs have to be read without blocking the event loop
+        return cast(_T, await to_thread(transformer, data))
+    return cast(_T, transformer(data))
 
 
 @lru_cache(maxsize=8096)
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import os
 import re
+import time
 import inspect
 import functools
+import email.utils
 from typing import (
     Any,
     Tuple,
@@ -11,6 +13,7 @@ from typing import (
     TypeVar,
     Callable,
     Iterable,
+    Optional,
     Sequence,
     cast,
     overload,
@@ -435,3 +438,38 @@ def json_safe(data: object) -> object:
         return data.isoformat()
 
     return data
+
+
+def parse_retry_after_header(response_headers: Optional[HeadersLike] = None) -> float | None:
+    """Returns a float of the number of seconds (not milliseconds) to wait after retrying, or None if unspecified.
+
+    About the Retry-After header: https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Retry-After
+    See also  https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Retry-After#syntax
+    """
+    if response_headers is None:
+        return None
+
+    # First, try the non-standard `retry-after-ms` header for milliseconds,
+    # which is more precise than integer-seconds `retry-after`
+    try:
+        retry_ms_header = response_headers.get("retry-after-ms", None)
+        return float(retry_ms_header) / 1000
+    except (TypeError, ValueError):
+        pass
+
+    # Next, try parsing `retry-after` header as seconds (allowing nonstandard floats).
+    retry_header = response_headers.get("retry-after")
+    try:
+        # note: the spec indicates that this should only ever be an integer
+        # but if someone sends a float there's no reason for us to not respect it
+        return float(retry_header)
+    except (TypeError, ValueError):
+        pass
+
+    # Last, try parsing `retry-after` as a date.
+    retry_date_tuple = email.utils.parsedate_tz(retry_header)
+    if retry_date_tuple is None:
+        return None
+
+    retry_date = email.utils.mktime_tz(retry_date_tuple)
+    return float(retry_date - time.time())
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Dict, List, Union, Optional
+from typing_extensions import Literal
+
+import anyio
+
+from .._models import BaseModel
+from ..types.run_input_param import RunInputParam
+
+if TYPE_CHECKING:
+    from .._client import Parallel, AsyncParallel
+
+__all__ = ["TaskRunBatching", "BatchedTaskRun"]
+
+# the most runs `task_group.add_runs` accepts per request
+MAX_BATCH_SIZE = 1000
+
+
+class TaskRunBatching:
+    """Collects individual `task_run.create_batched()` calls and creates their runs with a single
+    `task_group.add_runs()` request.
+
+    A batch is sent once it holds `max_batch_size` runs, or `max_wait` seconds after its first
+    run was added, whichever comes first. Its runs are added to `task_group_id`, or to a task
+    group that the client creates the first time a batch is sent.
+
+    The first call of a batch always waits for up to `max_wait` seconds for others to join it,
+    so a caller that creates runs one at a time, e.g. in a loop on a single thread, is slowed
+    down by `max_wait` per run without any batching taking place. Enable batching only where
+    many calls are made concurrently.
+
+    `task_run.create()` is never batched. The API only returns the IDs of the new runs, so
+    `create_batched()` returns a `BatchedTaskRun` instead of a `TaskRun`. Every other field, such
+    as `interaction_id`, requires `task_run.retrieve()`. The copies of a client created with
+    `with_options()` add their runs to the same batches.
+
+    ```py
+    client = Parallel(task_run_batching=TaskRunBatching(max_wait=0.05))
+    ```
+    """
+
+    def __init__(
+        self, *, max_batch_size: int = MAX_BATCH_SIZE, max_wait: float = 0.05, task_group_id: Optional[str] = None
+    ) -> None:
+        if not 1 <= max_batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(
+                f"Expected max_batch_size to be between 1 and {MAX_BATCH_SIZE} but received {max_batch_size}"
+            )
+        if max_wait < 0:
+            raise ValueError(f"Expected max_wait to be non-negative but received {max_wait}")
+
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.task_group_id = task_group_id
+
+
+class BatchedTaskRun(BaseModel):
+    """A run created by a `task_run.create_batched()` call.
+
+    Only holds what is known about the run without fetching it, `task_run.retrieve()` returns
+    the full `TaskRun`.
+    """
+
+    run_id: str
+    """ID of the task run."""
+
+    status: Literal["queued"]
+    """Status of the run, which is always `queued` right after it was created."""
+
+    is_active: bool
+    """Whether the run is currently active, which is always `True` right after it was created."""
+
+    processor: str
+    """Processor used for the run."""
+
+    task_group_id: str
+    """ID of the taskgroup to which the run was added."""
+
+    metadata: Optional[Dict[str, Union[str, float, bool]]] = None
+    """User-provided metadata stored with the run."""
+
+
+class _Batch:
+    def __init__(self) -> None:
+        self.runs: List[RunInputParam] = []
+        self.task_group_id: Optional[str] = None
+        self.run_ids: List[str] = []
+        self.error: Optional[Exception] = None
+
+    def result(self, index: int, run: RunInputParam) -> BatchedTaskRun:
+        if self.error is not None:
+            raise self.error
+        assert self.task_group_id is not None
+        return _queued_run(run, run_id=self.run_ids[index], task_group_id=self.task_group_id)
+
+
+class TaskRunBatcher:
+    """Batches the `task_run.create_batched()` calls of a `Parallel` client, across threads.
+
+    The first caller of a batch waits for it to fill up and sends it, the others wait for the
+    response, so that no background thread is needed.
+    """
+
+    def __init__(self, batching: TaskRunBatching) -> None:
+        self.batching = batching
+        self._task_group_id = batching.task_group_id
+        self._lock = threading.Lock()
+        self._group_lock = threading.Lock()
+        self._batch: Optional[_Batch] = None
+        self._full = threading.Event()
+        self._sent = threading.Event()
+
+    def create(self, client: Parallel, run: RunInputParam) -> BatchedTaskRun:
+        with self._lock:
+            batch = self._batch
+            leader = batch is None
+            if batch is None:
+                batch = self._batch = _Batch()
+                self._full, self._sent = full, sent = threading.Event(), threading.Event()
+            else:
+                full, sent = self._full, self._sent
+            index = len(batch.runs)
+            batch.runs.append(run)
+            if len(batch.runs) >= self.batching.max_batch_size:
+                # later calls start a new batch
+                self._batch = None
+                full.set()
+
+        if not leader:
+            sent.wait()
+            return batch.result(index, run)
+
+        full.wait(self.batching.max_wait)
+        with self._lock:
+            if self._batch is batch:
+                self._batch = None
+        try:
+            self._send(client, batch)
+        finally:
+            sent.set()
+        return batch.result(index, run)
+
+    def _send(self, client: Parallel, batch: _Batch) -> None:
+        try:
+            batch.task_group_id = self._get_task_group_id(client)
+            response = client.task_group.add_runs(batch.task_group_id, inputs=batch.runs)
+            batch.run_ids = _check_run_ids(response.run_ids, batch)
+        except Exception as err:
+            batch.error = err
+
+    def _get_task_group_id(self, client: Parallel) -> str:
+        with self._group_lock:
+            if self._task_group_id is None:
+                self._task_group_id = client.task_group.create().task_group_id
+            return self._task_group_id
+
+
+class AsyncTaskRunBatcher:
+    """Batches the `task_run.create_batched()` calls of an `AsyncParallel` client."""
+
+    def __init__(self, batching: TaskRunBatching) -> None:
+        self.batching = batching
+        self._task_group_id = batching.task_group_id
+        # created on first use, as they're bound to the running event loop
+        self._group_lock: Optional[anyio.Lock] = None
+        self._batch: Optional[_Batch] = None
+        self._full: Optional[anyio.Event] = None
+        self._sent: Optional[anyio.Event] = None
+
+    async def create(self, client: AsyncParallel, run: RunInputParam) -> BatchedTaskRun:
+        batch = self._batch
+        if batch is not None:
+            assert self._full is not None and self._sent is not None
+            sent = self._sent
+            index = len(batch.runs)
+            batch.runs.append(run)
+            if len(batch.runs) >= self.batching.max_batch_size:
+                self._batch = None
+                self._full.set()
+            await sent.wait()
+            return batch.result(index, run)
+
+        batch = self._batch = _Batch()
+        batch.runs.append(run)
+        self._full, self._sent = full, sent = anyio.Event(), anyio.Event()
+        if len(batch.runs) >= self.batching.max_batch_size:
+            self._batch = None
+            full.set()
+
+        # the other callers of the batch depend on it being sent, even if this call is cancelled
+        with anyio.CancelScope(shield=True):
+            with anyio.move_on_after(self.batching.max_wait):
+                await full.wait()
+            if self._batch is batch:
+                self._batch = None
+            try:
+                await self._send(client, batch)
+            finally:
+                sent.set()
+        return batch.result(0, run)
+
+    async def _send(self, client: AsyncParallel, batch: _Batch) -> None:
+        try:
+            batch.task_group_id = await self._get_task_group_id(client)
+            response = await client.task_group.add_runs(batch.task_group_id, inputs=batch.runs)
+            batch.run_ids = _check_run_ids(response.run_ids, batch)
+        except Exception as err:
+            batch.error = err
+
+    async def _get_task_group_id(self, client: AsyncParallel) -> str:
+        if self._group_lock is None:
+            self._group_lock = anyio.Lock()
+        async with self._group_lock:
+            if self._task_group_id is None:
+                self._task_group_id = (await client.task_group.create()).task_group_id
+            return self._task_group_id
+
+
+def _check_run_ids(run_ids: List[str], batch: _Batch) -> List[str]:
+    if len(run_ids) != len(batch.runs):
+        raise ValueError(f"Expected {len(batch.runs)} run IDs from `task_group.add_runs` but received {len(run_ids)}")
+    return run_ids
+
+
+def _queued_run(run: RunInputParam, *, run_id: str, task_group_id: str) -> BatchedTaskRun:
+    return BatchedTaskRun(
+        run_id=run_id,
+        status="queued",
+        is_active=True,
+        processor=run["processor"],
+        task_group_id=task_group_id,
+        metadata=run.get("metadata"),
+    )
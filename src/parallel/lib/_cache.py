@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Tuple, Mapping, TypeVar, Iterable, Optional, NamedTuple
+from collections import OrderedDict
+
+import httpx
+
+from .._models import BaseModel, construct_type_unchecked
+from ._compression import decompress_request_body
+
+__all__ = ["CacheBackend", "InMemoryCache", "SQLiteCache", "ResponseCache"]
+
+_ModelT = TypeVar("_ModelT", bound=BaseModel)
+
+# headers that describe the encoding of the body on the wire, which doesn't apply to the decoded body we store
+_EXCLUDED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+# headers that identify the caller, so that a response is never served to someone with other credentials
+_CREDENTIAL_HEADERS = ("authorization", "x-api-key", "proxy-authorization", "cookie")
+# headers that change the response, e.g. the beta features that are enabled, see `ResponseCache(vary=...)`
+DEFAULT_VARY_HEADERS = ("parallel-beta", "accept")
+
+
+class CacheBackend(ABC):
+    """Storage for cached responses.
+
+    Subclass this to store responses somewhere other than the built-in backends, e.g. Redis.
+    Implementations must be safe to call from multiple threads.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the value stored under the given key, or `None` if there is none or it has expired."""
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, *, ttl: Optional[float] = None) -> None:
+        """Stores a value under the given key, expiring after `ttl` seconds or never if `ttl` is `None`."""
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Removes every stored value."""
+        ...
+
+
+class InMemoryCache(CacheBackend):
+    """Keeps up to `max_entries` values in memory, evicting the least recently used value first."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        if max_entries < 1:
+            raise ValueError(f"Expected max_entries to be at least 1 but received {max_entries}")
+
+        self.max_entries = max_entries
+        # key -> (expires at, value)
+        self._entries: OrderedDict[str, Tuple[Optional[float], bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, *, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(CacheBackend):
+    """Stores values in a SQLite database file, so that they can be shared between processes
+    and survive restarts.
+    """
+
+    _PURGE_EVERY = 100
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # connections must not be shared with forked worker processes
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+            )
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT value FROM responses WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                    (key, time.time()),
+                )
+                .fetchone()
+            )
+        return bytes(row[0]) if row is not None else None
+
+    def set(self, key: str, value: bytes, *, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, sqlite3.Binary(value), expires_at),
+            )
+            self._writes += 1
+            if self._writes % self._PURGE_EVERY == 0:
+                connection.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class CacheKey(NamedTuple):
+    """Where the response to a cacheable request is stored, and for how long."""
+
+    key: str
+    ttl: float
+
+
+class ResponseCache:
+    """Caches successful responses from the search and extract endpoints.
+
+    Responses are keyed on the request method, the full URL including the base URL, the
+    credentials the request is sent with, the headers that change the response, such as
+    `parallel-beta`, and the exact JSON body that is sent, and
+    kept for the number of seconds configured for the endpoint in `ttls`, keyed on a path
+    prefix like `RateLimiter` limits. Requests with a `fetch_policy.max_age_seconds` are never
+    served a response older than that.
+
+    To skip the cache for a single request, send a `Cache-Control` header: `no-cache` fetches
+    a fresh response and stores it, `no-store` bypasses the cache entirely, e.g.
+
+    ```py
+    client.search(..., extra_headers={"Cache-Control": "no-cache"})
+    ```
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        *,
+        ttls: Mapping[str, float] | None = None,
+        vary: Iterable[str] = DEFAULT_VARY_HEADERS,
+    ) -> None:
+        """
+        Args:
+          backend: Where responses are stored, defaults to an `InMemoryCache`.
+
+          ttls: Mapping of endpoint path prefix to the number of seconds its responses are kept for.
+            Only endpoints listed here are cached.
+
+          vary: Names of the request headers that change the response, so that requests that
+            differ in any of them are cached separately. Credential headers always are.
+        """
+        self.backend = backend if backend is not None else InMemoryCache()
+        self.ttls = {
+            "/" + prefix.strip("/"): ttl
+            for prefix, ttl in (ttls if ttls is not None else {"/v1/search": 600, "/v1/extract": 600}).items()
+        }
+        self._prefixes = sorted(self.ttls, key=len, reverse=True)
+        self._key_headers = tuple(dict.fromkeys((*_CREDENTIAL_HEADERS, *(name.lower() for name in vary))))
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        """The number of requests that were served from the cache."""
+
+        self.misses = 0
+        """The number of cacheable requests that were sent to the API."""
+
+    def _ttl_for(self, request: httpx.Request) -> Optional[float]:
+        path = "/" + request.url.path.strip("/")
+        for prefix in self._prefixes:
+            if path == prefix or path.startswith(prefix + "/"):
+                ttl = self.ttls[prefix]
+                break
+        else:
+            return None
+
+        max_age = _fetch_policy_max_age(decompress_request_body(request))
+        if max_age is not None:
+            ttl = min(ttl, max_age)
+        return ttl
+
+    def lookup(self, request: httpx.Request) -> Tuple[Optional[CacheKey], Optional[httpx.Response]]:
+        """Returns the key the response to the given request should be stored under, or `None`
+        if it shouldn't be cached, along with the cached response if there is one.
+        """
+        if request.method not in ("GET", "POST") or not isinstance(request.stream, httpx.ByteStream):
+            return None, None
+
+        cache_control = request.headers.get("cache-control", "").lower()
+        if "no-store" in cache_control:
+            return None, None
+
+        # the request body is only parsed once, the TTL is carried over to `store()` in the key
+        ttl = self._ttl_for(request)
+        if ttl is None:
+            return None, None
+
+        digest = hashlib.sha256()
+        digest.update(f"{request.method} {request.url}\n".encode())
+        for name in self._key_headers:
+            digest.update(f"{name}: {request.headers.get(name, '')}\n".encode())
+        digest.update(request.content)
+        key = CacheKey(digest.hexdigest(), ttl)
+
+        value = None if "no-cache" in cache_control else self.backend.get(key.key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if value is None:
+            return key, None
+        return key, _decode_response(value, request)
+
+    def store(self, key: CacheKey, response: httpx.Response) -> None:
+        """Stores the given response, if it was successful."""
+        if response.is_success and key.ttl > 0:
+            self.backend.set(key.key, _encode_response(response), ttl=key.ttl)
+
+
+def load_model(backend: CacheBackend, key: str, type_: type[_ModelT]) -> Optional[_ModelT]:
+    """Returns the model stored under the given key with `store_model()`, if there is one."""
+    value = backend.get(key)
+    if value is None:
+        return None
+    return construct_type_unchecked(value=json.loads(value), type_=type_)
+
+
+def store_model(backend: CacheBackend, key: str, model: BaseModel) -> None:
+    """Stores a model, as it was received from the API, under the given key without an expiry."""
+    backend.set(key, model.to_json(indent=None).encode())
+
+
+def _fetch_policy_max_age(content: bytes) -> Optional[float]:
+    try:
+        body: Any = json.loads(content)
+    except ValueError:
+        return None
+    if not isinstance(body, dict):
+        return None
+
+    settings: Any = body.get("advanced_settings")
+    fetch_policy: Any = settings.get("fetch_policy") if isinstance(settings, dict) else None
+    max_age: Any = fetch_policy.get("max_age_seconds") if isinstance(fetch_policy, dict) else None
+    return float(max_age) if isinstance(max_age, (int, float)) else None
+
+
+def _encode_response(response: httpx.Response) -> bytes:
+    headers: List[List[str]] = [
+        [name, value] for name, value in response.headers.items() if name.lower() not in _EXCLUDED_HEADERS
+    ]
+    metadata: Dict[str, Any] = {"status_code": response.status_code, "headers": headers}
+    return json.dumps(metadata).encode() + b"\n" + response.content
+
+
+def _decode_response(value: bytes, request: httpx.Request) -> httpx.Response:
+    metadata, _, content = value.partition(b"\n")
+    parsed = json.loads(metadata)
+    return httpx.Response(
+        parsed["status_code"],
+        headers=[(name, value) for name, value in parsed["headers"]],
+        content=content,
+        request=request,
+    )
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import time
+from typing import Deque
+from collections import deque
+
+import anyio
+
+__all__ = ["AdaptiveConcurrencyLimiter"]
+
+
+class AdaptiveConcurrencyLimiter:
+    """Caps the number of in-flight requests on an `AsyncParallel` client and adapts the cap
+    to what the API can currently sustain.
+
+    The limit follows an additive-increase / multiplicative-decrease (AIMD) scheme, similar
+    to TCP congestion control:
+
+    - every successful response raises the limit by `additive_increase / limit`, i.e. by
+      roughly `additive_increase` once a full window of requests has succeeded.
+    - a 429, a 503 or a timeout multiplies the limit by `multiplicative_decrease`. Requests
+      that were already in flight when the limit was cut don't cut it again, so one burst of
+      overload errors only counts once.
+
+    The current limit can be read from `.limit` (and the current load from `.in_flight` and
+    `.waiting`), e.g. to export it as a metric.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        additive_increase: float = 1.0,
+        multiplicative_decrease: float = 0.5,
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                f"Expected 1 <= min_limit <= initial_limit <= max_limit but received {min_limit}, {initial_limit}, {max_limit}"
+            )
+        if not 0 < multiplicative_decrease < 1:
+            raise ValueError(
+                f"Expected multiplicative_decrease to be between 0 and 1 but received {multiplicative_decrease}"
+            )
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiters: Deque[anyio.Event] = deque()
+        self._last_decrease = float("-inf")
+
+    @property
+    def limit(self) -> int:
+        """The current maximum number of requests allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests currently in flight."""
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        """The number of requests currently waiting for a free slot."""
+        return len(self._waiters)
+
+    async def acquire(self) -> float:
+        """Wait for a free slot and return the time at which it was acquired.
+
+        The returned value must be passed back to `release()`.
+        """
+        while self._in_flight >= self.limit:
+            event = anyio.Event()
+            self._waiters.append(event)
+            try:
+                await event.wait()
+            except BaseException:
+                if event.is_set():
+                    # we were handed a slot we can no longer use, pass it on
+                    self._wake()
+                else:
+                    self._waiters.remove(event)
+                raise
+
+        self._in_flight += 1
+        return time.monotonic()
+
+    def release(self, acquired_at: float, *, succeeded: bool = False, overloaded: bool = False) -> None:
+        """Free the slot taken by `acquire()` and feed the outcome of the request into the limit."""
+        self._in_flight -= 1
+
+        if overloaded:
+            if acquired_at >= self._last_decrease:
+                self._limit = max(float(self.min_limit), self._limit * self.multiplicative_decrease)
+                self._last_decrease = time.monotonic()
+        elif succeeded:
+            self._limit = min(float(self.max_limit), self._limit + self.additive_increase / self._limit)
+
+        self._wake()
+
+    def _wake(self) -> None:
+        available = self.limit - self._in_flight
+        while available > 0 and self._waiters:
+            self._waiters.popleft().set()
+            available -= 1
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from typing import (
+    Set,
+    Dict,
+    Union,
+    Generic,
+    TypeVar,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Awaitable,
+    AsyncIterable,
+    AsyncIterator,
+)
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+import anyio
+from anyio.streams.memory import MemoryObjectSendStream, MemoryObjectReceiveStream
+
+from .._types import RawJSON
+from ._request_body import _aiter
+
+__all__ = ["ExecuteManyItem", "execute_many", "execute_many_async"]
+
+ResultT = TypeVar("ResultT")
+
+ExecuteInput = Union[str, Dict[str, object], RawJSON]
+
+
+class ExecuteManyItem(Generic[ResultT]):
+    """The outcome of one of the inputs given to `task_run.execute_many()`."""
+
+    def __init__(
+        self, index: int, input: ExecuteInput, *, result: Optional[ResultT] = None, error: Optional[Exception] = None
+    ) -> None:
+        self.index = index
+        """The position of the input in the given inputs."""
+
+        self.input = input
+
+        self.result = result
+        """The result of the run, or `None` if it failed."""
+
+        self.error = error
+        """The error the run failed with, e.g. a `TimeoutError` or an `APIStatusError`."""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return f"ExecuteManyItem(index={self.index}, result={self.result!r}, error={self.error!r})"
+
+
+def execute_many(
+    inputs: Iterable[ExecuteInput],
+    execute: Callable[[ExecuteInput], ResultT],
+    *,
+    max_concurrency: int,
+) -> Iterator[ExecuteManyItem[ResultT]]:
+    """Calls `execute` for each input on a pool of `max_concurrency` threads and yields the
+    outcomes as they complete.
+
+    Inputs are only taken from `inputs` as threads become free, so that a large or lazy
+    iterable isn't read ahead of time.
+    """
+    _validate_max_concurrency(max_concurrency)
+    return _execute_many(inputs, execute, max_concurrency=max_concurrency)
+
+
+def _execute_many(
+    inputs: Iterable[ExecuteInput],
+    execute: Callable[[ExecuteInput], ResultT],
+    *,
+    max_concurrency: int,
+) -> Iterator[ExecuteManyItem[ResultT]]:
+    def run(index: int, input: ExecuteInput) -> ExecuteManyItem[ResultT]:
+        try:
+            return ExecuteManyItem(index, input, result=execute(input))
+        except Exception as err:
+            return ExecuteManyItem(index, input, error=err)
+
+    pending: Set[Future[ExecuteManyItem[ResultT]]] = set()
+    executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="parallel-execute-many")
+    try:
+        remaining = enumerate(inputs)
+        for index, input in remaining:
+            pending.add(executor.submit(run, index, input))
+            if len(pending) >= max_concurrency:
+                break
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for index, input in remaining:
+                pending.add(executor.submit(run, index, input))
+                if len(pending) >= max_concurrency:
+                    break
+            for future in done:
+                yield future.result()
+    finally:
+        # runs that were already started can't be interrupted, but no new ones are started
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def execute_many_async(
+    inputs: Union[Iterable[ExecuteInput], AsyncIterable[ExecuteInput]],
+    execute: Callable[[ExecuteInput], Awaitable[ResultT]],
+    *,
+    max_concurrency: int,
+) -> AsyncIterator[ExecuteManyItem[ResultT]]:
+    """Awaits `execute` for up to `max_concurrency` inputs at a time and yields the outcomes as
+    they complete.
+
+    The runs are tasks of a task group that lives as long as the returned iterator, so an
+    iterator that is left before it is exhausted should be closed with `aclose()`, which
+    cancels the runs that are still in flight.
+    """
+    _validate_max_concurrency(max_concurrency)
+    return _execute_many_async(inputs, execute, max_concurrency=max_concurrency)
+
+
+async def _execute_many_async(
+    inputs: Union[Iterable[ExecuteInput], AsyncIterable[ExecuteInput]],
+    execute: Callable[[ExecuteInput], Awaitable[ResultT]],
+    *,
+    max_concurrency: int,
+) -> AsyncIterator[ExecuteManyItem[ResultT]]:
+    limiter = anyio.CapacityLimiter(max_concurrency)
+    send: MemoryObjectSendStream[ExecuteManyItem[ResultT]]
+    receive: MemoryObjectReceiveStream[ExecuteManyItem[ResultT]]
+    send, receive = anyio.create_memory_object_stream(max_concurrency)
+    # raised once the runs that were started from the inputs before it have been yielded
+    input_error: Optional[Exception] = None
+
+    async def run(
+        index: int, input: ExecuteInput, send: MemoryObjectSendStream[ExecuteManyItem[ResultT]], slot: object
+    ) -> None:
+        async with send:
+            try:
+                item = ExecuteManyItem(index, input, result=await execute(input))
+            except Exception as err:
+                item = ExecuteManyItem(index, input, error=err)
+            limiter.release_on_behalf_of(slot)
+            await send.send(item)
+
+    async def start_runs() -> None:
+        nonlocal input_error
+        async with send:
+            index = 0
+            remaining = _aiter(inputs)
+            while True:
+                # inputs are only taken once a run can start, so that they aren't read ahead of time
+                slot = object()
+                await limiter.acquire_on_behalf_of(slot)
+                try:
+                    input = await remaining.__anext__()
+                except StopAsyncIteration:
+                    limiter.release_on_behalf_of(slot)
+                    return
+                except Exception as err:
+                    limiter.release_on_behalf_of(slot)
+                    input_error = err
+                    return
+                tg.start_soon(run, index, input, send.clone(), slot)
+                index += 1
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(start_runs)
+        async with receive:
+            async for item in receive:
+                try:
+                    yield item
+                except GeneratorExit:
+                    # the consumer stopped iterating early, the runs that are still in flight are
+                    # cancelled, and the task group must not see the `GeneratorExit`
+                    tg.cancel_scope.cancel()
+                    return
+
+    if input_error is not None:
+        raise input_error
+
+
+def _validate_max_concurrency(max_concurrency: int) -> None:
+    if max_concurrency < 1:
+        raise ValueError(f"Expected max_concurrency to be at least 1 but received {max_concurrency}")
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import math
+import threading
+from typing import Dict, Deque, Tuple, TypeVar, Callable, Iterable, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import httpx
+
+__all__ = ["HedgingPolicy"]
+
+_T = TypeVar("_T")
+
+_RECOMPUTE_EVERY = 10
+# the other search modes are expected to take long enough that a duplicate request doesn't pay off
+_HEDGED_SEARCH_MODES = ("turbo", "fast")
+_MAX_THREADS = 32
+
+
+class HedgingPolicy:
+    """Sends a duplicate of slow requests to cut tail latency.
+
+    The client keeps track of recent response times for each hedged endpoint. Once a
+    request has been outstanding for longer than the configured `percentile` of those
+    response times, an identical copy of the request is sent. Whichever response arrives
+    first is used and the other request is cancelled.
+
+    The copy is identical to the original request, so it is only ever sent for requests
+    that are safe to duplicate, such as search and extract calls. Search requests are only
+    hedged in the `turbo` and `fast` modes. To bound the extra load, each request earns
+    `max_hedge_ratio` of a hedge, e.g. with the default of `0.1` at most 1 in 10 requests
+    is hedged over time.
+    """
+
+    def __init__(
+        self,
+        *,
+        endpoints: Iterable[str] = ("/v1/search", "/v1/extract"),
+        percentile: float = 0.95,
+        max_hedge_ratio: float = 0.1,
+        min_samples: int = 20,
+        window: int = 1000,
+        max_burst: float = 10.0,
+    ) -> None:
+        """
+        Args:
+          endpoints: Path prefixes of the endpoints whose requests may be hedged.
+
+          percentile: Response time percentile, between 0 and 1, after which a duplicate request is sent.
+
+          max_hedge_ratio: Maximum fraction of requests that may be hedged.
+
+          min_samples: Number of response times that must be recorded for an endpoint before
+            its requests are hedged.
+
+          window: Number of most recent response times to compute the percentile from.
+
+          max_burst: Maximum number of hedges that can be saved up while requests are fast.
+        """
+        if not 0 < percentile < 1:
+            raise ValueError(f"Expected percentile to be between 0 and 1 but received {percentile}")
+        if not 0 < max_hedge_ratio <= 1:
+            raise ValueError(f"Expected max_hedge_ratio to be between 0 and 1 but received {max_hedge_ratio}")
+
+        self.endpoints = tuple("/" + endpoint.strip("/") for endpoint in endpoints)
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = min_samples
+        self.max_burst = max_burst
+
+        self._window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._recorded: Dict[str, int] = {}
+        # (samples recorded, delay) so that the percentile isn't recomputed on every request
+        self._delays: Dict[str, Tuple[int, float]] = {}
+        self._budget = 0.0
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        """The number of requests that were eligible for hedging."""
+
+        self.hedges = 0
+        """The number of duplicate requests that were sent."""
+
+    def _endpoint_for(self, url: str) -> Optional[str]:
+        path = "/" + httpx.URL(url).path.strip("/")
+        for endpoint in self.endpoints:
+            if path == endpoint or path.startswith(endpoint + "/"):
+                return endpoint
+        return None
+
+    def hedge_delay(self, url: str, body: object = None) -> Optional[float]:
+        """Returns how long to wait before hedging a request to the given endpoint, or `None` if it shouldn't be hedged."""
+        endpoint = self._endpoint_for(url)
+        if endpoint is None:
+            return None
+        if endpoint == "/v1/search" and (not isinstance(body, dict) or body.get("mode") not in _HEDGED_SEARCH_MODES):
+            return None
+
+        with self._lock:
+            self.requests += 1
+            self._budget = min(self.max_burst, self._budget + self.max_hedge_ratio)
+
+            latencies = self._latencies.get(endpoint)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+
+            recorded = self._recorded[endpoint]
+            cached = self._delays.get(endpoint)
+            if cached is not None and recorded - cached[0] < _RECOMPUTE_EVERY:
+                return cached[1]
+
+            ordered = sorted(latencies)
+            delay = ordered[min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)]
+            self._delays[endpoint] = (recorded, delay)
+            return delay
+
+    def acquire_hedge(self) -> bool:
+        """Take a hedge from the budget, returns `False` if the budget is exhausted."""
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            self.hedges += 1
+            return True
+
+    def record_latency(self, url: str, seconds: float) -> None:
+        endpoint = self._endpoint_for(url)
+        if endpoint is None:
+            return
+
+        with self._lock:
+            latencies = self._latencies.get(endpoint)
+            if latencies is None:
+                latencies = self._latencies[endpoint] = deque(maxlen=self._window)
+                self._recorded[endpoint] = 0
+            latencies.append(seconds)
+            self._recorded[endpoint] += 1
+
+
+class HedgingThreads:
+    """The threads that a sync client sends hedged requests from.
+
+    Blocking sends can't be raced against each other in a single thread, so both the original
+    request and its hedge are sent from a background thread. The number of threads is bounded,
+    requests that find every thread busy are sent without a hedge instead of queueing.
+    """
+
+    def __init__(self, max_threads: int = _MAX_THREADS) -> None:
+        self._max_threads = max_threads
+        self._slots = threading.BoundedSemaphore(max_threads)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def try_submit(self, fn: Callable[[], _T]) -> Optional["Future[_T]"]:
+        """Runs `fn` on a free thread, returns `None` without running it if every thread is busy."""
+        if not self._slots.acquire(blocking=False):
+            return None
+
+        def run() -> _T:
+            try:
+                return fn()
+            finally:
+                self._slots.release()
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_threads, thread_name_prefix="parallel-hedging"
+                )
+            future = self._executor.submit(run)
+        # `run` never starts if the future is cancelled
+        future.add_done_callback(lambda future: future.cancelled() and self._slots.release())
+        return future
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+import pydantic
+
+from .._types import RawJSON
+from .._compat import model_dump
+from .._utils._json import openapi_dumps
+
+__all__ = ["JSONCodec", "OrjsonCodec"]
+
+
+class JSONCodec:
+    """Encodes request bodies and decodes response bodies and stream events.
+
+    The default implementation uses the standard library `json` module. Subclass this
+    and override `dumps()` and `loads()` to use a faster JSON library, e.g. `msgspec`;
+    `OrjsonCodec` is provided for `orjson`.
+    """
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serialize a request body to UTF-8 encoded JSON.
+
+        Besides JSON types, the body may contain `datetime` objects, pydantic models and
+        `RawJSON` values, which must be included as they are.
+        """
+        return openapi_dumps(obj)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """Deserialize a JSON document, raising a `ValueError` if it is invalid."""
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """A `JSONCodec` that uses `orjson`, which is several times faster than the standard library.
+
+    Requires the `orjson` extra, i.e. `pip install parallel-web[orjson]`.
+    """
+
+    def __init__(self) -> None:
+        try:
+            import orjson
+        except ImportError:
+            raise RuntimeError(
+                "To use the orjson codec you must have installed the package with the `orjson` extra"
+            ) from None
+
+        self._orjson = orjson
+        # non-string keys are converted like `json.dumps` does, instead of raising
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> bytes:
+        if isinstance(obj, RawJSON):
+            return obj.data
+        return self._orjson.dumps(obj, default=self._default, option=self._options)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._orjson.loads(data)
+
+    def _default(self, o: Any) -> Any:
+        # orjson serializes `datetime` natively in the same format as `datetime.isoformat()`
+        if isinstance(o, pydantic.BaseModel):
+            return model_dump(o, exclude_unset=True, mode="json", by_alias=True)
+        if isinstance(o, RawJSON):
+            return self._orjson.Fragment(o.data)
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
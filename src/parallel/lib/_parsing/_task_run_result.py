@@ -1,38 +1,117 @@
 from __future__ import annotations
 
+import time
 from typing import Any, Type, Union, Callable, Coroutine, cast
 
-from .._time import timeout_retry_context
-from ...types import TaskRunResult, ParsedTaskRunResult
+import anyio
+
+from .._time import _LongPoll, long_poll, long_poll_async
+from ...types import TaskRun, TaskRunResult, ParsedTaskRunResult
 from ..._types import Omit
 from ..._utils import is_str, is_given
 from ..._compat import model_parse, model_parse_json
 from ..._models import construct_type_unchecked
 from .._pydantic import is_basemodel_type
 from ._task_spec import is_output_schema_param
+from ..._streaming import Stream, AsyncStream
+from ..._exceptions import APIStatusError, APIConnectionError
+from ...types.task_run_event import TaskRunEvent
 from ...types.task_spec_param import OutputT, OutputSchema
+from ...types.task_run_events_response import TaskRunEventsResponse
 
 
 def wait_for_result(
     *,
     run_id: str,
     deadline: float,
-    callable: Callable[[str, float], TaskRunResult | ParsedTaskRunResult[OutputT]],
+    callable: Callable[[int, float], TaskRunResult | ParsedTaskRunResult[OutputT]],
 ) -> TaskRunResult | ParsedTaskRunResult[OutputT]:
-    """Wait for a task run to complete within the given timeout."""
-    with timeout_retry_context(run_id, deadline):
-        return callable(run_id, deadline)
+    """Wait for a task run to complete within the given timeout.
+
+    `callable` is called with the `api_timeout` to send and the timeout of the request.
+    """
+    return long_poll(run_id, deadline, callable)
 
 
 async def wait_for_result_async(
     *,
     run_id: str,
     deadline: float,
-    callable: Callable[[str, float], Coroutine[Any, Any, TaskRunResult | ParsedTaskRunResult[OutputT]]],
+    callable: Callable[[int, float], Coroutine[Any, Any, TaskRunResult | ParsedTaskRunResult[OutputT]]],
 ) -> TaskRunResult | ParsedTaskRunResult[OutputT]:
-    """Wait for a task run to complete within the given timeout."""
-    with timeout_retry_context(run_id, deadline):
-        return await callable(run_id, deadline)
+    """Wait for a task run to complete within the given timeout.
+
+    `callable` is called with the `api_timeout` to send and the timeout of the request.
+    """
+    return await long_poll_async(run_id, deadline, callable)
+
+
+def wait_for_terminal_event(
+    *,
+    run_id: str,
+    deadline: float,
+    open_stream: Callable[[float], Stream[TaskRunEventsResponse]],
+    retrieve: Callable[[float], TaskRun],
+) -> None:
+    """Wait for a task run to finish by following its events, instead of holding a `result()` request open.
+
+    The stream is opened again if it ends or times out before the run finished, after the same
+    jittered backoff that `wait_for_result()` uses between failed attempts.
+    """
+    poll = _LongPoll(run_id, deadline)
+    while True:
+        remaining = poll.remaining()
+        try:
+            with open_stream(remaining) as stream:
+                for event in stream:
+                    if _is_terminal(event):
+                        return
+                    poll.failures = 0
+
+            # the stream ended early, e.g. because the server closed the connection
+            remaining = deadline - time.monotonic()
+            if remaining > 0 and not retrieve(remaining).is_active:
+                return
+            delay = poll.backoff()
+        except (APIStatusError, APIConnectionError) as err:
+            delay = poll.retry_delay(err)
+
+        if delay > 0:
+            time.sleep(delay)
+
+
+async def wait_for_terminal_event_async(
+    *,
+    run_id: str,
+    deadline: float,
+    open_stream: Callable[[float], Coroutine[Any, Any, AsyncStream[TaskRunEventsResponse]]],
+    retrieve: Callable[[float], Coroutine[Any, Any, TaskRun]],
+) -> None:
+    """The async counterpart of `wait_for_terminal_event()`."""
+    poll = _LongPoll(run_id, deadline)
+    while True:
+        remaining = poll.remaining()
+        try:
+            async with await open_stream(remaining) as stream:
+                async for event in stream:
+                    if _is_terminal(event):
+                        return
+                    poll.failures = 0
+
+            # the stream ended early, e.g. because the server closed the connection
+            remaining = deadline - time.monotonic()
+            if remaining > 0 and not (await retrieve(remaining)).is_active:
+                return
+            delay = poll.backoff()
+        except (APIStatusError, APIConnectionError) as err:
+            delay = poll.retry_delay(err)
+
+        if delay > 0:
+            await anyio.sleep(delay)
+
+
+def _is_terminal(event: TaskRunEventsResponse) -> bool:
+    return isinstance(event, TaskRunEvent) and not event.run.is_active
 
 
 def task_run_result_parser(
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import time
+import threading
+from typing import Dict, Mapping, Optional
+from collections import OrderedDict
+
+import anyio
+import httpx
+
+__all__ = ["RateLimiter"]
+
+# the most buckets kept for paths that don't match a configured prefix, e.g. one per run ID
+_MAX_DEFAULT_BUCKETS = 1024
+
+
+class _TokenBucket:
+    """A token bucket that hands out reservations instead of rejecting callers.
+
+    Every call to `reserve()` takes a token, even if the bucket is empty, and
+    returns how long the caller has to wait before its token becomes valid. This
+    queues concurrent callers one after another at the configured rate instead of
+    letting them all wake up and race for the same token.
+    """
+
+    def __init__(self, *, rate: Optional[float], burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self._paused_until - now, 0.0)
+            if self.rate is None:
+                return wait
+
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    def cancel(self) -> None:
+        """Hands back a token taken by `reserve()` that won't be used."""
+        with self._lock:
+            if self.rate is not None:
+                self._tokens = min(self.burst, self._tokens + 1)
+
+    def pause_remaining(self) -> float:
+        with self._lock:
+            return max(self._paused_until - time.monotonic(), 0.0)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            if self.rate is not None:
+                # don't let callers that arrive during the pause skip the queue
+                self._tokens = min(self._tokens, 0.0)
+
+
+class RateLimiter:
+    """Client-side rate limiter shared by every request made through a client instance.
+
+    Limits are configured per endpoint as requests per second, keyed on a path prefix
+    (the longest matching prefix wins), e.g.
+
+    ```py
+    RateLimiter({"/v1/search": 20, "/v1/extract": 5, "/v1/tasks/runs": 10})
+    ```
+
+    When the API responds with a 429, the endpoint is paused for the duration given in
+    the `retry-after` / `retry-after-ms` headers, and every caller that is waiting on or
+    sending to that endpoint is held back until the pause is over.
+    """
+
+    def __init__(
+        self,
+        limits: Mapping[str, float] | None = None,
+        *,
+        default: float | None = None,
+        burst: float | None = None,
+    ) -> None:
+        """
+        Args:
+          limits: Mapping of endpoint path prefix to the allowed number of requests per second.
+
+          default: Requests per second for each path that doesn't match any prefix in `limits`.
+            Unmatched paths are not throttled by default but are still paused on 429s, each
+            on its own, so that a 429 from one of them doesn't hold back the others.
+
+          burst: Number of requests that can be sent at once before throttling kicks in.
+            Defaults to one second's worth of requests for each endpoint.
+        """
+        self._buckets: Dict[str, _TokenBucket] = {}
+        for prefix, rate in (limits or {}).items():
+            self._buckets["/" + prefix.strip("/")] = self._make_bucket(rate, burst)
+        self._default_rate = default
+        self._burst = burst
+        # validates the default rate up front, rather than on the first unmatched request
+        self._make_bucket(default, burst)
+        # buckets of unmatched paths, created on first use and least recently used first
+        self._default_buckets: OrderedDict[str, _TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+        # longest prefix first so that e.g. `/v1/tasks/runs` wins over `/v1/tasks`
+        self._prefixes = sorted(self._buckets, key=len, reverse=True)
+
+    @staticmethod
+    def _make_bucket(rate: float | None, burst: float | None) -> _TokenBucket:
+        if rate is not None and rate <= 0:
+            raise ValueError(f"Expected a positive rate limit but received {rate}")
+        return _TokenBucket(rate=rate, burst=burst if burst is not None else max(rate or 1.0, 1.0))
+
+    def _bucket_for(self, url: str | httpx.URL) -> _TokenBucket:
+        path = httpx.URL(url).path if isinstance(url, str) else url.path
+        path = "/" + path.strip("/")
+        for prefix in self._prefixes:
+            if path == prefix or path.startswith(prefix + "/"):
+                return self._buckets[prefix]
+
+        with self._lock:
+            bucket = self._default_buckets.get(path)
+            if bucket is None:
+                bucket = self._default_buckets[path] = self._make_bucket(self._default_rate, self._burst)
+                if len(self._default_buckets) > _MAX_DEFAULT_BUCKETS:
+                    self._default_buckets.popitem(last=False)
+            else:
+                self._default_buckets.move_to_end(path)
+            return bucket
+
+    def acquire(self, url: str | httpx.URL, *, timeout: float | None = None) -> bool:
+        """Block until a request to the given endpoint is allowed to be sent.
+
+        Returns `False` straight away, without taking up a request, if that would take longer than `timeout` seconds.
+        """
+        bucket = self._bucket_for(url)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        wait = bucket.reserve()
+        while wait > 0:
+            if deadline is not None and time.monotonic() + wait > deadline:
+                bucket.cancel()
+                return False
+            time.sleep(wait)
+            # the endpoint may have been paused by another caller in the meantime
+            wait = bucket.pause_remaining()
+        return True
+
+    async def aacquire(self, url: str | httpx.URL, *, timeout: float | None = None) -> bool:
+        """Wait until a request to the given endpoint is allowed to be sent.
+
+        Returns `False` straight away, without taking up a request, if that would take longer than `timeout` seconds.
+        """
+        bucket = self._bucket_for(url)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        wait = bucket.reserve()
+        while wait > 0:
+            if deadline is not None and time.monotonic() + wait > deadline:
+                bucket.cancel()
+                return False
+            await anyio.sleep(wait)
+            wait = bucket.pause_remaining()
+        return True
+
+    def pause(self, url: str | httpx.URL, seconds: float) -> None:
+        """Hold back every request to the given endpoint for the given number of seconds."""
+        if seconds > 0:
+            self._bucket_for(url).pause(seconds)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Any, Tuple, Union, Mapping, Callable, Iterable, Iterator, Awaitable, AsyncIterable, AsyncIterator
+
+__all__ = ["iter_json_body", "aiter_json_body"]
+
+# bodies are sent in chunks of about this many bytes, instead of one write per item
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_json_body(
+    fields: Mapping[str, object],
+    *,
+    array_field: str,
+    items: Iterable[object],
+    encode_item: Callable[[object], bytes],
+    dumps: Callable[[object], bytes],
+) -> Iterator[bytes]:
+    """Encodes a JSON object with the given fields and a potentially very large array under
+    `array_field`, one item at a time, so that the whole body never has to be held in memory.
+    """
+    head, tail = _envelope(fields, array_field=array_field, dumps=dumps)
+    buffer = bytearray(head)
+    first = True
+    for item in items:
+        if not first:
+            buffer += b","
+        first = False
+        buffer += encode_item(item)
+        if len(buffer) >= CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+
+    buffer += tail
+    yield bytes(buffer)
+
+
+async def aiter_json_body(
+    fields: Mapping[str, object],
+    *,
+    array_field: str,
+    items: Union[Iterable[object], AsyncIterable[object]],
+    encode_item: Callable[[object], Awaitable[bytes]],
+    dumps: Callable[[object], bytes],
+) -> AsyncIterator[bytes]:
+    """The async counterpart of `iter_json_body()`, which also accepts an async iterable of items."""
+    head, tail = _envelope(fields, array_field=array_field, dumps=dumps)
+    buffer = bytearray(head)
+    first = True
+    async for item in _aiter(items):
+        if not first:
+            buffer += b","
+        first = False
+        buffer += await encode_item(item)
+        if len(buffer) >= CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+
+    buffer += tail
+    yield bytes(buffer)
+
+
+def _envelope(
+    fields: Mapping[str, object], *, array_field: str, dumps: Callable[[object], bytes]
+) -> Tuple[bytes, bytes]:
+    # e.g. `{"inputs":[` and `],"default_task_spec":{...}}`
+    head = b"{" + dumps(array_field) + b":["
+    encoded_fields = dumps({key: value for key, value in fields.items() if key != array_field})
+    if encoded_fields == b"{}":
+        return head, b"]}"
+    return head, b"]," + encoded_fields[1:]
+
+
+async def _aiter(items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
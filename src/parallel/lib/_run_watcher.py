@@ -0,0 +1,389 @@
+from __future__ import annotations
+
+import logging
+from types import TracebackType
+from typing import TYPE_CHECKING, Dict, Deque, Tuple, Union, Iterable, Optional, AsyncIterator
+from collections import deque
+from typing_extensions import Self, Literal
+
+import anyio
+from anyio.abc import TaskGroup
+from anyio.streams.memory import MemoryObjectSendStream, MemoryObjectReceiveStream
+
+from .._exceptions import APIStatusError, APIConnectionError, AuthenticationError, PermissionDeniedError
+from ..types.task_run_event import TaskRunEvent
+from ..types.task_run_events_response import TaskRunEventsResponse
+
+if TYPE_CHECKING:
+    from .._client import AsyncParallel
+
+__all__ = ["AsyncRunWatcher", "RunWatcherEvent"]
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# the longest time between the polls of a run whose polls keep failing, unless `poll_interval` is longer
+_MAX_POLL_BACKOFF = 60.0
+
+
+class RunWatcherEvent:
+    """An event for one of the runs followed by an `AsyncRunWatcher`."""
+
+    def __init__(
+        self,
+        run_id: str,
+        event: Optional[TaskRunEventsResponse],
+        *,
+        source: Literal["stream", "poll"],
+        error: Optional[APIStatusError] = None,
+    ) -> None:
+        self.run_id = run_id
+
+        self.event = event
+        """The event, or `None` if the run can't be followed, see `error`."""
+
+        self.source: Literal["stream", "poll"] = source
+        """Whether the event was received on the run's event stream or by polling the run."""
+
+        self.error = error
+        """The error polling the run failed with, e.g. a `NotFoundError`, after which it's no longer followed."""
+
+    def __repr__(self) -> str:
+        return (
+            f"RunWatcherEvent(run_id={self.run_id!r}, event={self.event!r}, source={self.source!r}, "
+            f"error={self.error!r})"
+        )
+
+
+class _Follower:
+    def __init__(self, started: float) -> None:
+        self.started = started
+        self.scope: Optional[anyio.CancelScope] = None
+        self.rotate = False
+
+
+class AsyncRunWatcher:
+    """Follows many task runs at once over a bounded number of connections.
+
+    At most `max_streams` runs have their event stream open at a time. Every other run is
+    polled with `task_run.retrieve()` every `poll_interval` seconds, with at most
+    `max_concurrent_polls` requests in flight. Once a stream has been open for `stream_slice`
+    seconds while other runs are waiting, it's closed and handed to the next run, so that
+    every run gets its progress events streamed for part of the time.
+
+    The events of all runs are merged into a single async iterator, which ends once every
+    run has finished. Runs that finish while they're polled produce a `task_run.state`
+    event built from the polled run.
+
+    A poll that fails with a connection error, a 408, 409, 429 or a 5xx is retried with
+    exponential backoff. A run whose poll fails with another client error, e.g. a 404 for an
+    unknown run, is no longer followed and produces an item with that `error` instead of an
+    `event`. Authentication and permission errors apply to every run, so they're raised by
+    the iterator:
+
+    ```py
+    async with AsyncRunWatcher(client, run_ids) as watcher:
+        async for item in watcher:
+            if item.event is not None:
+                print(item.run_id, item.event.type)
+    ```
+    """
+
+    def __init__(
+        self,
+        client: AsyncParallel,
+        run_ids: Iterable[str] = (),
+        *,
+        max_streams: int = 10,
+        stream_slice: float = 60.0,
+        poll_interval: float = 5.0,
+        max_concurrent_polls: int = 10,
+        buffer_size: int = 100,
+    ) -> None:
+        """
+        Args:
+          client: The client to stream and poll the runs with.
+
+          run_ids: The runs to follow, more can be added with `add()`.
+
+          max_streams: Maximum number of event streams that are open at the same time.
+
+          stream_slice: Time in seconds after which a stream is handed to a waiting run.
+
+          poll_interval: Time in seconds between polls of the runs that aren't streamed.
+
+          max_concurrent_polls: Maximum number of `task_run.retrieve()` requests in flight.
+
+          buffer_size: Maximum number of events that are buffered for the consumer, after
+            which streaming and polling pause.
+        """
+        if max_streams < 0:
+            raise ValueError(f"Expected max_streams to be non-negative but received {max_streams}")
+        if max_concurrent_polls < 1:
+            raise ValueError(f"Expected max_concurrent_polls to be at least 1 but received {max_concurrent_polls}")
+
+        self.max_streams = max_streams
+        self.stream_slice = stream_slice
+        self.poll_interval = poll_interval
+        self.max_concurrent_polls = max_concurrent_polls
+        self._buffer_size = buffer_size
+        self._client = client
+
+        # active runs, and the ones that wait for a stream in the order they get one
+        self._runs: Dict[str, None] = {}
+        self._waiting: Deque[str] = deque()
+        self._following: Dict[str, _Follower] = {}
+        self._waiting_changed: Optional[anyio.Event] = None
+        self._finishing = 0
+        # runs whose last polls failed, with the number of failures and when they're polled next
+        self._poll_backoff: Dict[str, Tuple[int, float]] = {}
+
+        self._task_group: Optional[TaskGroup] = None
+        # cancels the workers, but not the code that iterates over the watcher in the task group's scope
+        self._workers_scope: Optional[anyio.CancelScope] = None
+        self._send: Optional[MemoryObjectSendStream[Union[RunWatcherEvent, Exception]]] = None
+        self._receive: Optional[MemoryObjectReceiveStream[Union[RunWatcherEvent, Exception]]] = None
+
+        for run_id in run_ids:
+            self.add(run_id)
+
+    @property
+    def active_runs(self) -> int:
+        """The number of runs that haven't finished yet."""
+        return len(self._runs)
+
+    @property
+    def open_streams(self) -> int:
+        """The number of event streams that are currently open."""
+        return len(self._following)
+
+    def add(self, run_id: str) -> None:
+        """Starts following the given run, if it isn't followed already."""
+        if run_id in self._runs:
+            return
+        self._runs[run_id] = None
+        self._waiting.append(run_id)
+        self._notify_waiting()
+
+    async def __aenter__(self) -> Self:
+        self._send, self._receive = anyio.create_memory_object_stream(self._buffer_size)
+        self._waiting_changed = anyio.Event()
+        self._workers_scope = anyio.CancelScope()
+        self._task_group = anyio.create_task_group()
+        await self._task_group.__aenter__()
+
+        if not self._runs:
+            self._close()
+        else:
+            self._task_group.start_soon(self._run_workers)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        assert self._task_group is not None and self._receive is not None
+        self._close()
+        await self._task_group.__aexit__(None, None, None)
+        await self._receive.aclose()
+
+    async def _run_workers(self) -> None:
+        assert self._workers_scope is not None
+        with self._workers_scope:
+            async with anyio.create_task_group() as tg:
+                for _ in range(self.max_streams):
+                    tg.start_soon(self._stream_worker)
+                tg.start_soon(self._poll_worker)
+                if self.max_streams:
+                    tg.start_soon(self._rotate_worker)
+
+    def __aiter__(self) -> AsyncIterator[RunWatcherEvent]:
+        return self._iter()
+
+    async def _iter(self) -> AsyncIterator[RunWatcherEvent]:
+        if self._receive is None:
+            raise RuntimeError("The watcher has to be entered with `async with` before iterating over it")
+
+        async for item in self._receive:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def _close(self) -> None:
+        assert self._send is not None and self._workers_scope is not None
+        self._send.close()
+        self._workers_scope.cancel()
+
+    def _notify_waiting(self) -> None:
+        if self._waiting_changed is not None:
+            self._waiting_changed.set()
+            self._waiting_changed = anyio.Event()
+
+    async def _emit(
+        self,
+        run_id: str,
+        event: Optional[TaskRunEventsResponse],
+        source: Literal["stream", "poll"],
+        *,
+        error: Optional[APIStatusError] = None,
+    ) -> None:
+        assert self._send is not None
+        try:
+            await self._send.send(RunWatcherEvent(run_id, event, source=source, error=error))
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            # the watcher was closed in the meantime
+            pass
+
+    async def _finish(
+        self,
+        run_id: str,
+        event: Optional[TaskRunEvent],
+        source: Literal["stream", "poll"],
+        *,
+        error: Optional[APIStatusError] = None,
+    ) -> None:
+        if run_id not in self._runs:
+            # already finished through the other channel
+            return
+        del self._runs[run_id]
+        self._poll_backoff.pop(run_id, None)
+        if run_id in self._waiting:
+            self._waiting.remove(run_id)
+
+        self._finishing += 1
+        try:
+            await self._emit(run_id, event, source, error=error)
+        finally:
+            self._finishing -= 1
+        # runs that finished at the same time may still be handing over their last event
+        if not self._runs and not self._finishing:
+            self._close()
+
+    async def _fail(self, error: Exception) -> None:
+        assert self._send is not None
+        try:
+            await self._send.send(error)
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            pass
+        self._close()
+
+    async def _stream_worker(self) -> None:
+        while True:
+            while not self._waiting:
+                assert self._waiting_changed is not None
+                await self._waiting_changed.wait()
+            run_id = self._waiting.popleft()
+
+            failed = False
+            try:
+                finished = await self._follow(run_id)
+            except Exception:
+                # the run is polled until it gets its turn again
+                log.debug("Streaming events for run %s failed", run_id, exc_info=True)
+                finished = False
+                failed = True
+            finally:
+                self._following.pop(run_id, None)
+
+            if not finished:
+                self._requeue(run_id)
+            if failed:
+                # so that runs whose stream can't be opened aren't retried in a busy loop
+                await anyio.sleep(self.poll_interval)
+
+    def _requeue(self, run_id: str) -> None:
+        if run_id in self._runs and run_id not in self._waiting:
+            self._waiting.append(run_id)
+            self._notify_waiting()
+
+    async def _follow(self, run_id: str) -> bool:
+        """Streams the events of the given run until it finishes or its stream is handed to another run."""
+        follower = self._following[run_id] = _Follower(anyio.current_time())
+        stream = await self._client.task_run.events(run_id)
+        async with stream:
+            events = stream.__aiter__()
+            while not follower.rotate:
+                # only reading is cancelled on rotation, never handing an event to the consumer
+                with anyio.CancelScope() as follower.scope:
+                    try:
+                        event = await events.__anext__()
+                    except StopAsyncIteration:
+                        return False
+                follower.scope = None
+                if follower.rotate:
+                    return False
+
+                if isinstance(event, TaskRunEvent) and not event.run.is_active:
+                    await self._finish(run_id, event, "stream")
+                    return True
+                await self._emit(run_id, event, "stream")
+        return False
+
+    async def _rotate_worker(self) -> None:
+        check_interval = min(max(self.stream_slice / 4, 0.01), 1.0)
+        while True:
+            await anyio.sleep(check_interval)
+            if not self._waiting:
+                continue
+
+            now = anyio.current_time()
+            expired = sorted(
+                (follower.started, run_id)
+                for run_id, follower in self._following.items()
+                if not follower.rotate and now - follower.started >= self.stream_slice
+            )
+            for _, run_id in expired[: len(self._waiting)]:
+                follower = self._following[run_id]
+                follower.rotate = True
+                if follower.scope is not None:
+                    follower.scope.cancel()
+
+    async def _poll_worker(self) -> None:
+        limiter = anyio.CapacityLimiter(self.max_concurrent_polls)
+        while True:
+            now = anyio.current_time()
+            async with anyio.create_task_group() as tg:
+                for run_id in list(self._waiting):
+                    backoff = self._poll_backoff.get(run_id)
+                    if backoff is None or backoff[1] <= now:
+                        tg.start_soon(self._poll, run_id, limiter)
+            await anyio.sleep(self.poll_interval)
+
+    async def _poll(self, run_id: str, limiter: anyio.CapacityLimiter) -> None:
+        async with limiter:
+            # the run may have finished or got a stream while waiting for the limiter
+            if run_id not in self._runs or run_id in self._following:
+                return
+            try:
+                run = await self._client.task_run.retrieve(run_id)
+            except (AuthenticationError, PermissionDeniedError) as err:
+                # these apply to every run
+                await self._fail(err)
+                return
+            except APIStatusError as err:
+                if _is_transient(err.status_code):
+                    self._back_off_polling(run_id)
+                else:
+                    await self._finish(run_id, None, "poll", error=err)
+                return
+            except APIConnectionError:
+                self._back_off_polling(run_id)
+                return
+            except Exception as err:
+                await self._fail(err)
+                return
+
+        self._poll_backoff.pop(run_id, None)
+        if not run.is_active:
+            await self._finish(run_id, TaskRunEvent(type="task_run.state", run=run), "poll")
+
+    def _back_off_polling(self, run_id: str) -> None:
+        log.debug("Polling run %s failed", run_id, exc_info=True)
+        failures = self._poll_backoff[run_id][0] + 1 if run_id in self._poll_backoff else 1
+        delay = min(self.poll_interval * 2.0 ** (failures - 1), max(self.poll_interval, _MAX_POLL_BACKOFF))
+        self._poll_backoff[run_id] = (failures, anyio.current_time() + delay)
+
+
+def _is_transient(status_code: int) -> bool:
+    return status_code in (408, 409, 429) or status_code >= 500
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Generic, TypeVar, Callable, Hashable, Optional, Awaitable
+
+import anyio
+
+__all__ = ["SingleFlight", "AsyncSingleFlight"]
+
+_T = TypeVar("_T")
+
+
+class _Call(Generic[_T]):
+    result: _T
+
+    def __init__(self, event: Any) -> None:
+        self.event = event
+        self.error: Optional[Exception] = None
+        self.abandoned = False
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; concurrent callers with the same key wait
+    for the in-flight call and receive its result, or its exception, instead of making
+    their own call.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call[Any]] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], _T]) -> _T:
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is None:
+                    call = self._calls[key] = _Call(threading.Event())
+                    break
+
+            call.event.wait()
+            if call.abandoned:
+                # the leader was interrupted, e.g. by a KeyboardInterrupt, so try again ourselves
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as err:
+            call.error = err
+            raise
+        except BaseException:
+            call.abandoned = True
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+        return call.result
+
+
+class AsyncSingleFlight:
+    """The async counterpart of `SingleFlight`, for callers running in the same event loop."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call[Any]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[_T]]) -> _T:
+        while True:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call(anyio.Event())
+                break
+
+            await call.event.wait()
+            if call.abandoned:
+                # the leader was cancelled, which must not cancel the other callers as well
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = await fn()
+        except Exception as err:
+            call.error = err
+            raise
+        except BaseException:
+            call.abandoned = True
+            raise
+        finally:
+            del self._calls[key]
+            call.event.set()
+
+        return call.result
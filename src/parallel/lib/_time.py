@@ -1,13 +1,33 @@
+from __future__ import annotations
+
 import time
-import contextlib
-from typing import Union, Iterator, NoReturn
+import logging
+from random import random
+from typing import List, Tuple, Union, TypeVar, Callable, Iterable, NoReturn, Optional, Awaitable
 
+import anyio
 import httpx
 
 from .._types import NotGiven
-from .._constants import DEFAULT_EXECUTE_TIMEOUT_SECONDS
-from .._exceptions import APIStatusError, APITimeoutError
-from .._utils._utils import is_given
+from .._constants import (
+    MAX_RETRY_DELAY,
+    INITIAL_RETRY_DELAY,
+    LONG_POLL_CHUNK_SECONDS,
+    LONG_POLL_GRACE_SECONDS,
+    DEFAULT_EXECUTE_TIMEOUT_SECONDS,
+)
+from .._exceptions import APIStatusError, APIConnectionError
+from .._utils._utils import is_given, parse_retry_after_header
+
+__all__ = ["LongPollAttempt", "TaskRunTimeoutError", "long_poll", "long_poll_async", "prepare_timeout_float"]
+
+_T = TypeVar("_T")
+
+# the fraction of its `api_timeout` that a request must have been held for, for a 408 to count as
+# the server timing out as expected rather than as an error
+_HELD_FOR_API_TIMEOUT = 0.9
+
+log: logging.Logger = logging.getLogger(__name__)
 
 
 def prepare_timeout_float(timeout: Union[float, httpx.Timeout, None, NotGiven]) -> float:
@@ -24,8 +44,46 @@ def prepare_timeout_float(timeout: Union[float, httpx.Timeout, None, NotGiven])
     return timeout
 
 
-def _raise_timeout(run_id: str, exc: Union[Exception, None]) -> NoReturn:
-    raise TimeoutError(f"Fetching task run result for run id {run_id} timed out.") from exc
+class LongPollAttempt:
+    """The timing of a single request made while waiting for a task run result."""
+
+    def __init__(
+        self, number: int, *, api_timeout: int, started: float, elapsed: float, error: Optional[Exception]
+    ) -> None:
+        self.number = number
+        """The 1-based number of the attempt."""
+
+        self.api_timeout = api_timeout
+        """How long, in seconds, the server was asked to hold the request."""
+
+        self.started = started
+        """When the attempt started, as a `time.monotonic()` value."""
+
+        self.elapsed = elapsed
+        """How long the attempt took in seconds."""
+
+        self.error = error
+        """The error the attempt failed with, or `None` if it returned the result."""
+
+    def __repr__(self) -> str:
+        return (
+            f"LongPollAttempt(number={self.number}, api_timeout={self.api_timeout}, elapsed={self.elapsed:.3f}, "
+            f"error={self.error!r})"
+        )
+
+
+class TaskRunTimeoutError(TimeoutError):
+    """Raised when a task run doesn't finish before the deadline."""
+
+    def __init__(self, run_id: str, attempts: Iterable[LongPollAttempt] = ()) -> None:
+        super().__init__(f"Fetching task run result for run id {run_id} timed out.")
+        self.run_id = run_id
+        self.attempts: List[LongPollAttempt] = list(attempts)
+        """The requests that were made while waiting, in order."""
+
+
+def _raise_timeout(run_id: str, exc: Union[Exception, None], attempts: Iterable[LongPollAttempt] = ()) -> NoReturn:
+    raise TaskRunTimeoutError(run_id, attempts) from exc
 
 
 def _is_retryable_error(status_code: int) -> bool:
@@ -33,42 +91,144 @@ def _is_retryable_error(status_code: int) -> bool:
 
     We retry the following HTTP status codes within the SDK:
     - 408 (Request Timeout): The server timed out waiting for the request
-    - 503 (Service Unavailable): The server is temporarily unable to handle the request
-    - 504 (Gateway Timeout): The gateway server timed out
+    - 429 (Too Many Requests): The request was rate limited
+    - 500, 502, 503 and 504: The server or a gateway failed or is temporarily unavailable
 
-    These errors typically indicate temporary issues with the server or network
-    that may resolve upon retry. We don't include 429 (Too Many Requests) as this
-    indicates rate limiting, which requires backing off rather than immediate retries.
+    These are the same errors that the client retries for other requests. The requests made
+    while waiting for a task run aren't retried by the client, as the wait is bounded by a
+    deadline that only the long-poll knows about.
 
     Note: This is a low-level retry mechanism within the SDK. Customers may want to
     implement their own retry logic at the application level for other error types.
     """
-    return status_code in (408, 503, 504)
-
-
-@contextlib.contextmanager
-def timeout_retry_context(run_id: str, deadline: float) -> Iterator[None]:
-    """Context manager for handling timeouts and retries when fetching task run results.
-
-    Args:
-        run_id: The ID of the task run
-        deadline: The absolute time (monotonic) by which the operation must complete
+    return status_code in (408, 429, 500, 502, 503, 504)
+
+
+class _LongPoll:
+    """The bookkeeping shared by `long_poll()` and `long_poll_async()`."""
+
+    def __init__(self, run_id: str, deadline: float, chunk: int = LONG_POLL_CHUNK_SECONDS) -> None:
+        self.run_id = run_id
+        self.deadline = deadline
+        self.chunk = chunk
+        self.attempts: List[LongPollAttempt] = []
+        self.failures = 0
+        self.last_error: Optional[Exception] = None
+
+    def remaining(self) -> float:
+        """Returns the time left until the deadline, or raises a `TaskRunTimeoutError` if it has passed."""
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            _raise_timeout(self.run_id, self.last_error, self.attempts)
+        return remaining
+
+    def next_timeouts(self) -> Tuple[int, float]:
+        """Returns the `api_timeout` to send and the client-side timeout for the next attempt."""
+        remaining = self.remaining()
+        api_timeout = max(1, min(self.chunk, int(remaining)))
+        # leave the server some time to answer with a 408 before giving up on the connection
+        return api_timeout, min(remaining, api_timeout + LONG_POLL_GRACE_SECONDS)
+
+    def record(self, api_timeout: int, started: float, error: Optional[Exception]) -> LongPollAttempt:
+        attempt = LongPollAttempt(
+            len(self.attempts) + 1,
+            api_timeout=api_timeout,
+            started=started,
+            elapsed=time.monotonic() - started,
+            error=error,
+        )
+        self.attempts.append(attempt)
+        log.debug("Long-poll attempt for run %s: %s", self.run_id, attempt)
+        return attempt
+
+    def retry_delay(self, error: Exception, attempt: Optional[LongPollAttempt] = None) -> float:
+        """Returns how long to wait before retrying after the given error, or re-raises it."""
+        self.last_error = error
+        if isinstance(error, APIStatusError):
+            if not _is_retryable_error(error.status_code):
+                raise error
+            if (
+                error.status_code == 408
+                and attempt is not None
+                and attempt.elapsed >= attempt.api_timeout * _HELD_FOR_API_TIMEOUT
+            ):
+                # the server held the request for the whole `api_timeout`, which is expected,
+                # whereas a 408 that comes back early is backed off like any other failure
+                self.failures = 0
+                return 0.0
+
+            # wait as long as the API asks us to, if that's reasonable, like the client does
+            retry_after = parse_retry_after_header(error.response.headers)
+            if retry_after is not None and 0 < retry_after <= 60:
+                self.failures += 1
+                return min(retry_after, max(self.deadline - time.monotonic(), 0))
+
+        return self.backoff()
+
+    def backoff(self) -> float:
+        """Returns how long to wait before the next attempt after a failed one."""
+        self.failures += 1
+        delay = min(INITIAL_RETRY_DELAY * 2.0 ** (self.failures - 1), MAX_RETRY_DELAY)
+        # full jitter, so that many runs waiting on the same outage don't retry in lockstep
+        return min(delay * random(), max(self.deadline - time.monotonic(), 0))
+
+
+def long_poll(
+    run_id: str,
+    deadline: float,
+    fetch: Callable[[int, float], _T],
+    *,
+    chunk: int = LONG_POLL_CHUNK_SECONDS,
+) -> _T:
+    """Calls `fetch(api_timeout, timeout)` until it returns or the monotonic `deadline` passes.
+
+    Each call asks the server to hold the request for at most `chunk` seconds, so that no
+    connection sits idle long enough to be cut by a proxy. Server timeouts (408) of requests
+    that were held for their `api_timeout` are retried right away. Early 408s, 429, 500, 502,
+    503 and 504 responses and connection errors are retried after the `retry-after` the API
+    asks for, or with jittered exponential backoff.
 
     Raises:
-        TimeoutError: If the deadline is reached
-        APIStatusError: For non-timeout API errors
+        TaskRunTimeoutError: If the deadline is reached
+        APIStatusError: For non-retryable API errors
     """
-    exc: Union[Exception, None] = None
-    while time.monotonic() < deadline:
+    poll = _LongPoll(run_id, deadline, chunk)
+    while True:
+        api_timeout, timeout = poll.next_timeouts()
+        started = time.monotonic()
+        try:
+            result = fetch(api_timeout, timeout)
+        except (APIStatusError, APIConnectionError) as err:
+            attempt = poll.record(api_timeout, started, err)
+            delay = poll.retry_delay(err, attempt)
+        else:
+            poll.record(api_timeout, started, None)
+            return result
+
+        if delay > 0:
+            time.sleep(delay)
+
+
+async def long_poll_async(
+    run_id: str,
+    deadline: float,
+    fetch: Callable[[int, float], Awaitable[_T]],
+    *,
+    chunk: int = LONG_POLL_CHUNK_SECONDS,
+) -> _T:
+    """The async counterpart of `long_poll()`."""
+    poll = _LongPoll(run_id, deadline, chunk)
+    while True:
+        api_timeout, timeout = poll.next_timeouts()
+        started = time.monotonic()
         try:
-            yield
-            return
-        except APITimeoutError as e:
-            exc = e
-            continue
-        except APIStatusError as e:
-            if _is_retryable_error(e.status_code):
-                exc = e
-                continue
-            raise
-    _raise_timeout(run_id, exc)
+            result = await fetch(api_timeout, timeout)
+        except (APIStatusError, APIConnectionError) as err:
+            attempt = poll.record(api_timeout, started, err)
+            delay = poll.retry_delay(err, attempt)
+        else:
+            poll.record(api_timeout, started, None)
+            return result
+
+        if delay > 0:
+            await anyio.sleep(delay)
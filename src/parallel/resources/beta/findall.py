@@ -18,7 +18,7 @@ from ..._response import (
     async_to_raw_response_wrapper,
     async_to_streamed_response_wrapper,
 )
-from ..._streaming import Stream, AsyncStream
+from ..._streaming import ResumableStream, AsyncResumableStream
 from ...types.beta import (
     findall_create_params,
     findall_enrich_params,
@@ -393,7 +393,7 @@ class FindAllResource(SyncAPIResource):
         extra_query: Query | None = None,
         extra_body: Body | None = None,
         timeout: float | httpx.Timeout | None | NotGiven = not_given,
-    ) -> Stream[FindAllEventsResponse]:
+    ) -> ResumableStream[FindAllEventsResponse]:
         """
         Stream events from a FindAll run.
 
@@ -444,7 +444,7 @@ class FindAllResource(SyncAPIResource):
             ),
             cast_to=cast(Any, FindAllEventsResponse),  # Union types cannot be passed in as arguments in the type system
             stream=True,
-            stream_cls=Stream[FindAllEventsResponse],
+            stream_cls=ResumableStream[FindAllEventsResponse],
         )
 
     def extend(
@@ -999,7 +999,7 @@ class AsyncFindAllResource(AsyncAPIResource):
         extra_query: Query | None = None,
         extra_body: Body | None = None,
         timeout: float | httpx.Timeout | None | NotGiven = not_given,
-    ) -> AsyncStream[FindAllEventsResponse]:
+    ) -> AsyncResumableStream[FindAllEventsResponse]:
         """
         Stream events from a FindAll run.
 
@@ -1050,7 +1050,7 @@ class AsyncFindAllResource(AsyncAPIResource):
             ),
             cast_to=cast(Any, FindAllEventsResponse),  # Union types cannot be passed in as arguments in the type system
             stream=True,
-            stream_cls=AsyncStream[FindAllEventsResponse],
+            stream_cls=AsyncResumableStream[FindAllEventsResponse],
         )
 
     async def extend(
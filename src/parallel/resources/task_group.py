@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Union, Iterable, Optional, cast
+from typing import Any, Dict, List, Union, Mapping, Iterable, Iterator, Optional, AsyncIterable, cast
 from typing_extensions import Literal
 
 import httpx
@@ -13,7 +13,7 @@ from ..types import (
     task_group_add_runs_params,
     task_group_get_runs_params,
 )
-from .._types import Body, Omit, Query, Headers, NotGiven, omit, not_given
+from .._types import Body, Omit, Query, Headers, RawJSON, NotGiven, omit, not_given
 from .._utils import is_given, path_template, maybe_transform, strip_not_given, async_maybe_transform
 from .._compat import cached_property
 from .._resource import SyncAPIResource, AsyncAPIResource
@@ -23,10 +23,11 @@ from .._response import (
     async_to_raw_response_wrapper,
     async_to_streamed_response_wrapper,
 )
-from .._streaming import Stream, AsyncStream
+from .._streaming import ResumableStream, AsyncResumableStream
 from .._base_client import make_request_options
 from ..types.task_run import TaskRun
 from ..types.task_group import TaskGroup
+from ..lib._request_body import iter_json_body, aiter_json_body
 from ..types.run_input_param import RunInputParam
 from ..types.task_spec_param import TaskSpecParam
 from ..types.task_group_run_response import TaskGroupRunResponse
@@ -141,7 +142,7 @@ class TaskGroupResource(SyncAPIResource):
         self,
         task_group_id: str,
         *,
-        inputs: Iterable[RunInputParam],
+        inputs: Union[Iterable[Union[RunInputParam, RawJSON]], RawJSON],
         refresh_status: bool | Omit = omit,
         default_task_spec: Optional[TaskSpecParam] | Omit = omit,
         betas: List[ParallelBetaParam] | Omit = omit,
@@ -158,6 +159,9 @@ class TaskGroupResource(SyncAPIResource):
         Args:
           inputs: List of task runs to execute. Up to 1,000 runs can be specified per request. If
               you'd like to add more runs, split them across multiple TaskGroup POST requests.
+              Runs, or the whole list, can be given as pre-encoded `RawJSON`. Runs given as an
+              iterator, e.g. a generator, are encoded and sent one at a time instead of holding
+              the whole body in memory, in which case the request isn't retried.
 
           default_task_spec: Specification for a task.
 
@@ -182,6 +186,32 @@ class TaskGroupResource(SyncAPIResource):
             **strip_not_given({"parallel-beta": ",".join(str(e) for e in betas) if is_given(betas) else not_given}),
             **(extra_headers or {}),
         }
+        if isinstance(inputs, Iterator):
+            dumps = self._client._json_codec.dumps
+            return self._post(
+                path_template("/v1/tasks/groups/{task_group_id}/runs", task_group_id=task_group_id),
+                content=iter_json_body(
+                    {
+                        **maybe_transform(
+                            {"default_task_spec": default_task_spec}, task_group_add_runs_params.TaskGroupAddRunsParams
+                        ),
+                        **cast(Mapping[str, object], extra_body or {}),
+                    },
+                    array_field="inputs",
+                    items=inputs,
+                    encode_item=lambda run: dumps(maybe_transform(run, RunInputParam)),
+                    dumps=dumps,
+                ),
+                options=make_request_options(
+                    extra_headers=extra_headers,
+                    extra_query=extra_query,
+                    timeout=timeout,
+                    query=maybe_transform(
+                        {"refresh_status": refresh_status}, task_group_add_runs_params.TaskGroupAddRunsParams
+                    ),
+                ),
+                cast_to=TaskGroupRunResponse,
+            )
         return self._post(
             path_template("/v1/tasks/groups/{task_group_id}/runs", task_group_id=task_group_id),
             body=maybe_transform(
@@ -215,7 +245,7 @@ class TaskGroupResource(SyncAPIResource):
         extra_query: Query | None = None,
         extra_body: Body | None = None,
         timeout: float | httpx.Timeout | None | NotGiven = not_given,
-    ) -> Stream[TaskGroupEventsResponse]:
+    ) -> ResumableStream[TaskGroupEventsResponse]:
         """
         Streams events from a TaskGroup: status updates and run completions.
 
@@ -253,7 +283,7 @@ class TaskGroupResource(SyncAPIResource):
                 Any, TaskGroupEventsResponse
             ),  # Union types cannot be passed in as arguments in the type system
             stream=True,
-            stream_cls=Stream[TaskGroupEventsResponse],
+            stream_cls=ResumableStream[TaskGroupEventsResponse],
         )
 
     def get_runs(
@@ -273,7 +303,7 @@ class TaskGroupResource(SyncAPIResource):
         extra_query: Query | None = None,
         extra_body: Body | None = None,
         timeout: float | httpx.Timeout | None | NotGiven = not_given,
-    ) -> Stream[TaskGroupGetRunsResponse]:
+    ) -> ResumableStream[TaskGroupGetRunsResponse]:
         """
         Retrieves task runs in a TaskGroup and optionally their inputs and outputs.
 
@@ -319,7 +349,7 @@ class TaskGroupResource(SyncAPIResource):
                 Any, TaskGroupGetRunsResponse
             ),  # Union types cannot be passed in as arguments in the type system
             stream=True,
-            stream_cls=Stream[TaskGroupGetRunsResponse],
+            stream_cls=ResumableStream[TaskGroupGetRunsResponse],
         )
 
     def retrieve_run(
@@ -468,7 +498,7 @@ class AsyncTaskGroupResource(AsyncAPIResource):
         self,
         task_group_id: str,
         *,
-        inputs: Iterable[RunInputParam],
+        inputs: Union[Iterable[Union[RunInputParam, RawJSON]], AsyncIterable[Union[RunInputParam, RawJSON]], RawJSON],
         refresh_status: bool | Omit = omit,
         default_task_spec: Optional[TaskSpecParam] | Omit = omit,
         betas: List[ParallelBetaParam] | Omit = omit,
@@ -485,6 +515,9 @@ class AsyncTaskGroupResource(AsyncAPIResource):
         Args:
           inputs: List of task runs to execute. Up to 1,000 runs can be specified per request. If
               you'd like to add more runs, split them across multiple TaskGroup POST requests.
+              Runs, or the whole list, can be given as pre-encoded `RawJSON`. Runs given as an
+              iterator or async iterable, e.g. a generator, are encoded and sent one at a time
+              instead of holding the whole body in memory, in which case the request isn't retried.
 
           default_task_spec: Specification for a task.
 
@@ -509,6 +542,36 @@ class AsyncTaskGroupResource(AsyncAPIResource):
             **strip_not_given({"parallel-beta": ",".join(str(e) for e in betas) if is_given(betas) else not_given}),
             **(extra_headers or {}),
         }
+        if isinstance(inputs, (Iterator, AsyncIterable)):
+            dumps = self._client._json_codec.dumps
+
+            async def encode_run(run: object) -> bytes:
+                return dumps(await async_maybe_transform(run, RunInputParam))
+
+            return await self._post(
+                path_template("/v1/tasks/groups/{task_group_id}/runs", task_group_id=task_group_id),
+                content=aiter_json_body(
+                    {
+                        **await async_maybe_transform(
+                            {"default_task_spec": default_task_spec}, task_group_add_runs_params.TaskGroupAddRunsParams
+                        ),
+                        **cast(Mapping[str, object], extra_body or {}),
+                    },
+                    array_field="inputs",
+                    items=inputs,
+                    encode_item=encode_run,
+                    dumps=dumps,
+                ),
+                options=make_request_options(
+                    extra_headers=extra_headers,
+                    extra_query=extra_query,
+                    timeout=timeout,
+                    query=await async_maybe_transform(
+                        {"refresh_status": refresh_status}, task_group_add_runs_params.TaskGroupAddRunsParams
+                    ),
+                ),
+                cast_to=TaskGroupRunResponse,
+            )
         return await self._post(
             path_template("/v1/tasks/groups/{task_group_id}/runs", task_group_id=task_group_id),
             body=await async_maybe_transform(
@@ -542,7 +605,7 @@ class AsyncTaskGroupResource(AsyncAPIResource):
         extra_query: Query | None = None,
         extra_body: Body | None = None,
         timeout: float | httpx.Timeout | None | NotGiven = not_given,
-    ) -> AsyncStream[TaskGroupEventsResponse]:
+    ) -> AsyncResumableStream[TaskGroupEventsResponse]:
         """
         Streams events from a TaskGroup: status updates and run completions.
 
@@ -580,7 +643,7 @@ class AsyncTaskGroupResource(AsyncAPIResource):
                 Any, TaskGroupEventsResponse
             ),  # Union types cannot be passed in as arguments in the type system
             stream=True,
-            stream_cls=AsyncStream[TaskGroupEventsResponse],
+            stream_cls=AsyncResumableStream[TaskGroupEventsResponse],
         )
 
     async def get_runs(
@@ -600,7 +663,7 @@ class AsyncTaskGroupResource(AsyncAPIResource):
         extra_query: Query | None = None,
         extra_body: Body | None = None,
         timeout: float | httpx.Timeout | None | NotGiven = not_given,
-    ) -> AsyncStream[TaskGroupGetRunsResponse]:
+    ) -> AsyncResumableStream[TaskGroupGetRunsResponse]:
         """
         Retrieves task runs in a TaskGroup and optionally their inputs and outputs.
 
@@ -646,7 +709,7 @@ class AsyncTaskGroupResource(AsyncAPIResource):
                 Any, TaskGroupGetRunsResponse
             ),  # Union types cannot be passed in as arguments in the type system
             stream=True,
-            stream_cls=AsyncStream[TaskGroupGetRunsResponse],
+            stream_cls=AsyncResumableStream[TaskGroupGetRunsResponse],
         )
 
     async def retrieve_run(
@@ -3,14 +3,29 @@
 from __future__ import annotations
 
 import time
-from typing import Any, Dict, List, Type, Union, Iterable, Optional, cast, overload
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Type,
+    Union,
+    Iterable,
+    Iterator,
+    Optional,
+    AsyncIterable,
+    AsyncIterator,
+    cast,
+    overload,
+)
+from typing_extensions import Literal
 
 import httpx
 
 from parallel.lib._time import prepare_timeout_float
 
 from ..types import task_run_create_params, task_run_result_params
-from .._types import Body, Omit, Query, Headers, NotGiven, omit, not_given
+from .._types import Body, Omit, Query, Headers, RawJSON, NotGiven, omit, not_given
 from .._utils import is_given, path_template, maybe_transform, strip_not_given, async_maybe_transform
 from .._compat import cached_property
 from .._resource import SyncAPIResource, AsyncAPIResource
@@ -21,10 +36,18 @@ from .._response import (
     async_to_streamed_response_wrapper,
 )
 from .._streaming import Stream, AsyncStream
+from ..lib._cache import load_model, store_model
 from .._base_client import make_request_options
+from ..lib._batching import BatchedTaskRun
 from ..types.task_run import TaskRun
 from ..types.run_input import RunInput
+from ..lib._execute_many import (
+    ExecuteManyItem,
+    execute_many as _execute_many,
+    execute_many_async as _execute_many_async,
+)
 from ..types.webhook_param import WebhookParam
+from ..types.run_input_param import RunInputParam
 from ..types.task_run_result import TaskRunResult
 from ..types.task_spec_param import OutputT, OutputSchema, TaskSpecParam
 from ..types.mcp_server_param import McpServerParam
@@ -34,15 +57,37 @@ from ..lib._parsing._task_run_result import (
     wait_for_result as _wait_for_result,
     wait_for_result_async as _wait_for_result_async,
     task_run_result_parser,
+    wait_for_terminal_event as _wait_for_terminal_event,
+    wait_for_terminal_event_async as _wait_for_terminal_event_async,
 )
 from ..types.beta.parallel_beta_param import ParallelBetaParam
 from ..types.task_run_events_response import TaskRunEventsResponse
 from ..types.shared_params.source_policy import SourcePolicy
 from ..types.task_advanced_settings_param import TaskAdvancedSettingsParam
 
+if TYPE_CHECKING:
+    from .._client import Parallel, AsyncParallel
+
 __all__ = ["TaskRunResource", "AsyncTaskRunResource"]
 
 
+def _artifact_cache_key(
+    kind: str,
+    run_id: str,
+    *,
+    betas: List[ParallelBetaParam] | Omit = omit,
+    extra_headers: Headers | None,
+    extra_query: Query | None,
+    extra_body: Body | None,
+) -> Optional[str]:
+    """Returns the key a run artifact is cached under, or `None` if the call passes extra
+    request options, which could change the response or its type (e.g. `.with_raw_response`).
+    """
+    if extra_headers or extra_query or extra_body:
+        return None
+    return f"task_run.{kind}:{run_id}:{','.join(betas) if is_given(betas) else ''}"
+
+
 class TaskRunResource(SyncAPIResource):
     """The Task API executes web research and extraction tasks.
 
@@ -79,7 +124,7 @@ class TaskRunResource(SyncAPIResource):
     def create(
         self,
         *,
-        input: Union[str, Dict[str, object]],
+        input: Union[str, Dict[str, object], RawJSON],
         processor: str,
         advanced_settings: Optional[TaskAdvancedSettingsParam] | Omit = omit,
         enable_events: Optional[bool] | Omit = omit,
@@ -106,7 +151,8 @@ class TaskRunResource(SyncAPIResource):
         Beta features can be enabled by setting the 'parallel-beta' header.
 
         Args:
-          input: Input to the task, either text or a JSON object.
+          input: Input to the task, either text or a JSON object, which can be given as
+              pre-encoded `RawJSON`.
 
           processor: Processor to use for the task.
 
@@ -286,11 +332,25 @@ class TaskRunResource(SyncAPIResource):
         """
         if not run_id:
             raise ValueError(f"Expected a non-empty value for `run_id` but received {run_id!r}")
+        artifact_cache = self._client._artifact_cache
+        cache_key = _artifact_cache_key(
+            "result",
+            run_id,
+            betas=betas,
+            extra_headers=extra_headers,
+            extra_query=extra_query,
+            extra_body=extra_body,
+        )
+        if artifact_cache is not None and cache_key is not None:
+            cached = load_model(artifact_cache, cache_key, TaskRunResult)
+            if cached is not None:
+                return cached
+
         extra_headers = {
             **strip_not_given({"parallel-beta": ",".join(str(e) for e in betas) if is_given(betas) else not_given}),
             **(extra_headers or {}),
         }
-        return self._get(
+        task_run_result = self._get(
             path_template("/v1/tasks/runs/{run_id}/result", run_id=run_id),
             options=make_request_options(
                 extra_headers=extra_headers,
@@ -301,6 +361,10 @@ class TaskRunResource(SyncAPIResource):
             ),
             cast_to=TaskRunResult,
         )
+        # only completed runs have a result, but check anyway as nothing non-terminal may be cached
+        if artifact_cache is not None and cache_key is not None and task_run_result.run.status == "completed":
+            store_model(artifact_cache, cache_key, task_run_result)
+        return task_run_result
 
     def retrieve_input(
         self,
@@ -327,13 +391,31 @@ class TaskRunResource(SyncAPIResource):
         """
         if not run_id:
             raise ValueError(f"Expected a non-empty value for `run_id` but received {run_id!r}")
-        return self._get(
+        # the input of a run never changes, so it can be cached from the moment the run is created
+        artifact_cache = self._client._artifact_cache
+        cache_key = _artifact_cache_key(
+            "input", run_id, extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body
+        )
+        if artifact_cache is not None and cache_key is not None:
+            cached = load_model(artifact_cache, cache_key, RunInput)
+            if cached is not None:
+                return cached
+
+        run_input = self._get(
             path_template("/v1/tasks/runs/{run_id}/input", run_id=run_id),
             options=make_request_options(
                 extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
             ),
             cast_to=RunInput,
         )
+        if artifact_cache is not None and cache_key is not None:
+            store_model(artifact_cache, cache_key, run_input)
+        return run_input
+
+    @cached_property
+    def _long_poll_client(self) -> Parallel:
+        """A copy of the client without retries, built once, that waits for results with `_wait_for_result()`."""
+        return self._client.with_options(max_retries=0)
 
     def _wait_for_result(
         self,
@@ -349,10 +431,13 @@ class TaskRunResource(SyncAPIResource):
     ) -> TaskRunResult | ParsedTaskRunResult[OutputT]:
         """Wait for a task run to complete within the given timeout."""
 
-        def _fetcher(run_id: str, deadline: float) -> TaskRunResult | ParsedTaskRunResult[OutputT]:
-            timeout = deadline - time.monotonic()
-            task_run_result = self.result(
+        # retries are handled by the long-poll, which knows how much time is left
+        client = self._long_poll_client
+
+        def _fetcher(api_timeout: int, timeout: float) -> TaskRunResult | ParsedTaskRunResult[OutputT]:
+            task_run_result = client.task_run.result(
                 run_id,
+                api_timeout=api_timeout,
                 extra_headers=extra_headers,
                 extra_query=extra_query,
                 extra_body=extra_body,
@@ -362,14 +447,40 @@ class TaskRunResource(SyncAPIResource):
 
         return _wait_for_result(run_id=run_id, deadline=deadline, callable=_fetcher)
 
+    def _wait_for_terminal_event(
+        self,
+        *,
+        run_id: str,
+        deadline: float,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+    ) -> None:
+        """Wait for a task run to finish within the given timeout by following its events."""
+
+        def _open_stream(timeout: float) -> Stream[TaskRunEventsResponse]:
+            return self.events(
+                run_id, extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
+            )
+
+        def _retrieve(timeout: float) -> TaskRun:
+            return self.retrieve(
+                run_id, extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
+            )
+
+        _wait_for_terminal_event(run_id=run_id, deadline=deadline, open_stream=_open_stream, retrieve=_retrieve)
+
     @overload
     def execute(
         self,
         *,
-        input: Union[str, Dict[str, object]],
+        input: Union[str, Dict[str, object], RawJSON],
         processor: str,
         metadata: Optional[Dict[str, Union[str, float, bool]]] | Omit = omit,
         output: Optional[OutputSchema] | Omit = omit,
+        wait_strategy: Literal["result", "events"] = "result",
         # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
         # The extra values given here take precedence over values defined on the client or passed to this method.
         extra_headers: Headers | None = None,
@@ -381,10 +492,11 @@ class TaskRunResource(SyncAPIResource):
     def execute(
         self,
         *,
-        input: Union[str, Dict[str, object]],
+        input: Union[str, Dict[str, object], RawJSON],
         processor: str,
         metadata: Optional[Dict[str, Union[str, float, bool]]] | Omit = omit,
         output: Type[OutputT],
+        wait_strategy: Literal["result", "events"] = "result",
         # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
         # The extra values given here take precedence over values defined on the client or passed to this method.
         extra_headers: Headers | None = None,
@@ -395,10 +507,11 @@ class TaskRunResource(SyncAPIResource):
     def execute(
         self,
         *,
-        input: Union[str, Dict[str, object]],
+        input: Union[str, Dict[str, object], RawJSON],
         processor: str,
         metadata: Optional[Dict[str, Union[str, float, bool]]] | Omit = omit,
         output: Optional[OutputSchema] | Type[OutputT] | Omit = omit,
+        wait_strategy: Literal["result", "events"] = "result",
         # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
         # The extra values given here take precedence over values defined on the client or passed to this method.
         extra_headers: Headers | None = None,
@@ -419,7 +532,8 @@ class TaskRunResource(SyncAPIResource):
         - `APIConnectionError`: If the connection to the API fails.
 
         Args:
-          input: Input to the task, either text or a JSON object.
+          input: Input to the task, either text or a JSON object, which can be given as
+              pre-encoded `RawJSON`.
 
           processor: Processor to use for the task.
 
@@ -429,6 +543,10 @@ class TaskRunResource(SyncAPIResource):
           output: Optional output schema or pydantic type. If pydantic is provided,
             the response will have a parsed field.
 
+          wait_strategy: How to wait for the run to finish. `"result"` holds a `result()`
+            request open until the run completes. `"events"` follows the run's event stream
+            and only fetches the result once the run has finished.
+
           extra_headers: Send extra headers
 
           extra_query: Add additional query parameters to the request
@@ -454,6 +572,15 @@ class TaskRunResource(SyncAPIResource):
             timeout=timeout,
         )
 
+        if wait_strategy == "events":
+            self._wait_for_terminal_event(
+                run_id=task_run.run_id,
+                deadline=deadline,
+                extra_headers=extra_headers,
+                extra_query=extra_query,
+                extra_body=extra_body,
+            )
+
         return self._wait_for_result(
             run_id=task_run.run_id,
             deadline=deadline,
@@ -463,6 +590,157 @@ class TaskRunResource(SyncAPIResource):
             extra_body=extra_body,
         )
 
+    @overload
+    def execute_many(
+        self,
+        inputs: Iterable[Union[str, Dict[str, object], RawJSON]],
+        *,
+        processor: str,
+        metadata: Optional[Dict[str, Union[str, float, bool]]] | Omit = omit,
+        output: Optional[OutputSchema] | Omit = omit,
+        max_concurrency: int = 10,
+        wait_strategy: Literal["result", "events"] = "result",
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = not_given,
+    ) -> Iterator[ExecuteManyItem[TaskRunResult]]: ...
+    @overload
+    def execute_many(
+        self,
+        inputs: Iterable[Union[str, Dict[str, object], RawJSON]],
+        *,
+        processor: str,
+        metadata: Optional[Dict[str, Union[str, float, bool]]] | Omit = omit,
+        output: Type[OutputT],
+        max_concurrency: int = 10,
+        wait_strategy: Literal["result", "events"] = "result",
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = not_given,
+    ) -> Iterator[ExecuteManyItem[ParsedTaskRunResult[OutputT]]]: ...
+    def execute_many(
+        self,
+        inputs: Iterable[Union[str, Dict[str, object], RawJSON]],
+        *,
+        processor: str,
+        metadata: Optional[Dict[str, Union[str, float, bool]]] | Omit = omit,
+        output: Optional[OutputSchema] | Type[OutputT] | Omit = omit,
+        max_concurrency: int = 10,
+        wait_strategy: Literal["result", "events"] = "result",
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = not_given,
+    ) -> Iterator[ExecuteManyItem[TaskRunResult]] | Iterator[ExecuteManyItem[ParsedTaskRunResult[OutputT]]]:
+        """
+        Convenience method to execute a task run for each of many inputs, with at most
+        `max_concurrency` runs in flight at a time.
+
+        Yields an `ExecuteManyItem` per input in the order the runs complete. Each item
+        holds the `index` of its input, and either the `result` of the run or the `error`
+        it failed with, so that a failing run doesn't abort the others.
+
+        Runs are executed on a pool of `max_concurrency` threads. All runs share the client's connection
+        pool and retry policy.
+
+        Args:
+          inputs: Inputs to the tasks, each either text or a JSON object. Inputs are only
+              taken from the iterable as runs complete.
+
+          processor: Processor to use for the tasks.
+
+          metadata: User-provided metadata stored with each run. Keys and values must be strings
+            with a maximum length of 16 and 512 characters respectively.
+
+          output: Optional output schema or pydantic type. If pydantic is provided,
+            the results will have a parsed field.
+
+          max_concurrency: Maximum number of runs that are executed at the same time.
+
+          wait_strategy: How to wait for each run to finish, see `execute()`.
+
+          extra_headers: Send extra headers
+
+          extra_query: Add additional query parameters to the request
+
+          extra_body: Add additional JSON properties to the request
+
+          timeout: Override the client-level default timeout for each run, in seconds.
+            A run that doesn't finish within the timeout fails with a `TimeoutError`.
+        """
+
+        def _execute(input: Union[str, Dict[str, object], RawJSON]) -> TaskRunResult | ParsedTaskRunResult[OutputT]:
+            return self.execute(
+                input=input,
+                processor=processor,
+                metadata=metadata,
+                output=cast(Any, output),
+                wait_strategy=wait_strategy,
+                extra_headers=extra_headers,
+                extra_query=extra_query,
+                extra_body=extra_body,
+                timeout=timeout,
+            )
+
+        return _execute_many(inputs, _execute, max_concurrency=max_concurrency)
+
+    def create_batched(
+        self,
+        *,
+        input: Union[str, Dict[str, object], RawJSON],
+        processor: str,
+        advanced_settings: Optional[TaskAdvancedSettingsParam] | Omit = omit,
+        enable_events: Optional[bool] | Omit = omit,
+        mcp_servers: Optional[Iterable[McpServerParam]] | Omit = omit,
+        memory_scope_key: Optional[str] | Omit = omit,
+        metadata: Optional[Dict[str, Union[str, float, bool]]] | Omit = omit,
+        previous_interaction_id: Optional[str] | Omit = omit,
+        source_policy: Optional[SourcePolicy] | Omit = omit,
+        task_spec: Optional[TaskSpecParam] | Omit = omit,
+        webhook: Optional[WebhookParam] | Omit = omit,
+    ) -> BatchedTaskRun:
+        """
+        Initiates a task run as part of a batch of the client's `task_run_batching`.
+
+        The runs of concurrent calls are created with a single `task_group.add_runs()` request,
+        see `TaskRunBatching`. The API only returns the IDs of the new runs, so this returns a
+        `BatchedTaskRun` in status 'queued', and `retrieve()` returns the full `TaskRun`.
+
+        The arguments are the same as for `create()`. Batches can't carry per-call request
+        options, so runs that need `betas` or other request options have to use `create()`.
+
+        Raises a `ValueError` if the client wasn't created with `task_run_batching`.
+        """
+        batcher = self._client._task_run_batcher
+        if batcher is None:
+            raise ValueError("`create_batched()` requires a client created with `task_run_batching`")
+
+        run = {
+            "input": input,
+            "processor": processor,
+            "advanced_settings": advanced_settings,
+            "enable_events": enable_events,
+            "mcp_servers": mcp_servers,
+            "memory_scope_key": memory_scope_key,
+            "metadata": metadata,
+            "previous_interaction_id": previous_interaction_id,
+            "source_policy": source_policy,
+            "task_spec": task_spec,
+            "webhook": webhook,
+        }
+        return batcher.create(
+            self._client, cast(RunInputParam, {key: value for key, value in run.items() if is_given(value)})
+        )
+
+
 class AsyncTaskRunResource(AsyncAPIResource):
     """The Task API executes web research and extraction tasks.
 
@@ -499,7 +777,7 @@ class AsyncTaskRunResource(AsyncAPIResource):
     async def create(
         self,
         *,
-        input: Union[str, Dict[str, object]],
+        input: Union[str, Dict[str, object], RawJSON],
         processor: str,
         advanced_settings: Optional[TaskAdvancedSettingsParam] | Omit = omit,
         enable_events: Optional[bool] | Omit = omit,
@@ -526,7 +804,8 @@ class AsyncTaskRunResource(AsyncAPIResource):
         Beta features can be enabled by setting the 'parallel-beta' header.
 
         Args:
-          input: Input to the task, either text or a JSON object.
+          input: Input to the task, either text or a JSON object, which can be given as
+              pre-encoded `RawJSON`.
 
           processor: Processor to use for the task.
 
@@ -706,11 +985,25 @@ class AsyncTaskRunResource(AsyncAPIResource):
         """
         if not run_id:
             raise ValueError(f"Expected a non-empty value for `run_id` but received {run_id!r}")
+        artifact_cache = self._client._artifact_cache
+        cache_key = _artifact_cache_key(
+            "result",
+            run_id,
+            betas=betas,
+            extra_headers=extra_headers,
+            extra_query=extra_query,
+            extra_body=extra_body,
+        )
+        if artifact_cache is not None and cache_key is not None:
+            cached = load_model(artifact_cache, cache_key, TaskRunResult)
+            if cached is not None:
+                return cached
+
         extra_headers = {
             **strip_not_given({"parallel-beta": ",".join(str(e) for e in betas) if is_given(betas) else not_given}),
             **(extra_headers or {}),
         }
-        return await self._get(
+        task_run_result = await self._get(
             path_template("/v1/tasks/runs/{run_id}/result", run_id=run_id),
             options=make_request_options(
                 extra_headers=extra_headers,
@@ -723,6 +1016,10 @@ class AsyncTaskRunResource(AsyncAPIResource):
             ),
             cast_to=TaskRunResult,
         )
+        # only completed runs have a result, but check anyway as nothing non-terminal may be cached
+        if artifact_cache is not None and cache_key is not None and task_run_result.run.status == "completed":
+            store_model(artifact_cache, cache_key, task_run_result)
+        return task_run_result
 
     async def retrieve_input(
         self,
@@ -749,13 +1046,31 @@ class AsyncTaskRunResource(AsyncAPIResource):
         """
         if not run_id:
             raise ValueError(f"Expected a non-empty value for `run_id` but received {run_id!r}")
-        return await self._get(
+        # the input of a run never changes, so it can be cached from the moment the run is created
+        artifact_cache = self._client._artifact_cache
+        cache_key = _artifact_cache_key(
+            "input", run_id, extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body
+        )
+        if artifact_cache is not None and cache_key is not None:
+            cached = load_model(artifact_cache, cache_key, RunInput)
+            if cached is not None:
+                return cached
+
+        run_input = await self._get(
             path_template("/v1/tasks/runs/{run_id}/input", run_id=run_id),
             options=make_request_options(
                 extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
             ),
             cast_to=RunInput,
         )
+        if artifact_cache is not None and cache_key is not None:
+            store_model(artifact_cache, cache_key, run_input)
+        return run_input
+
+    @cached_property
+    def _long_poll_client(self) -> AsyncParallel:
+        """A copy of the client without retries, built once, that waits for results with `_wait_for_result()`."""
+        return self._client.with_options(max_retries=0)
 
     async def _wait_for_result(
         self,
@@ -771,10 +1086,13 @@ class AsyncTaskRunResource(AsyncAPIResource):
     ) -> TaskRunResult | ParsedTaskRunResult[OutputT]:
         """Wait for a task run to complete within the given timeout."""
 
-        async def _fetcher(run_id: str, deadline: float) -> TaskRunResult | ParsedTaskRunResult[OutputT]:
-            timeout = deadline - time.monotonic()
-            task_run_result = await self.result(
+        # retries are handled by the long-poll, which knows how much time is left
+        client = self._long_poll_client
+
+        async def _fetcher(api_timeout: int, timeout: float) -> TaskRunResult | ParsedTaskRunResult[OutputT]:
+            task_run_result = await client.task_run.result(
                 run_id,
+                api_timeout=api_timeout,
                 extra_headers=extra_headers,
                 extra_query=extra_query,
                 extra_body=extra_body,
@@ -784,14 +1102,42 @@ class AsyncTaskRunResource(AsyncAPIResource):
 
         return await _wait_for_result_async(run_id=run_id, deadline=deadline, callable=_fetcher)
 
+    async def _wait_for_terminal_event(
+        self,
+        *,
+        run_id: str,
+        deadline: float,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+    ) -> None:
+        """Wait for a task run to finish within the given timeout by following its events."""
+
+        async def _open_stream(timeout: float) -> AsyncStream[TaskRunEventsResponse]:
+            return await self.events(
+                run_id, extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
+            )
+
+        async def _retrieve(timeout: float) -> TaskRun:
+            return await self.retrieve(
+                run_id, extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
+            )
+
+        await _wait_for_terminal_event_async(
+            run_id=run_id, deadline=deadline, open_stream=_open_stream, retrieve=_retrieve
+        )
+
     @overload
     async def execute(
         self,
         *,
-        input: Union[str, Dict[str, object]],
+        input: Union[str, Dict[str, object], RawJSON],
         processor: str,
         metadata: Optional[Dict[str, Union[str, float, bool]]] | Omit = omit,
         output: Optional[OutputSchema] | Omit = omit,
+        wait_strategy: Literal["result", "events"] = "result",
         extra_headers: Headers | None = None,
         extra_query: Query | None = None,
         extra_body: Body | None = None,
@@ -801,10 +1147,11 @@ class AsyncTaskRunResource(AsyncAPIResource):
     async def execute(
         self,
         *,
-        input: Union[str, Dict[str, object]],
+        input: Union[str, Dict[str, object], RawJSON],
         processor: str,
         metadata: Optional[Dict[str, Union[str, float, bool]]] | Omit = omit,
         output: Type[OutputT],
+        wait_strategy: Literal["result", "events"] = "result",
         extra_headers: Headers | None = None,
         extra_query: Query | None = None,
         extra_body: Body | None = None,
@@ -813,10 +1160,11 @@ class AsyncTaskRunResource(AsyncAPIResource):
     async def execute(
         self,
         *,
-        input: Union[str, Dict[str, object]],
+        input: Union[str, Dict[str, object], RawJSON],
         processor: str,
         metadata: Optional[Dict[str, Union[str, float, bool]]] | Omit = omit,
         output: Optional[OutputSchema] | Type[OutputT] | Omit = omit,
+        wait_strategy: Literal["result", "events"] = "result",
         # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
         # The extra values given here take precedence over values defined on the client or passed to this method.
         extra_headers: Headers | None = None,
@@ -837,7 +1185,8 @@ class AsyncTaskRunResource(AsyncAPIResource):
         - `APIConnectionError`: If the connection to the API fails.
 
         Args:
-          input: Input to the task, either text or a JSON object.
+          input: Input to the task, either text or a JSON object, which can be given as
+              pre-encoded `RawJSON`.
 
           processor: Processor to use for the task.
 
@@ -847,6 +1196,10 @@ class AsyncTaskRunResource(AsyncAPIResource):
           output: Optional output schema or pydantic type. If pydantic is provided,
             the response will have a parsed field.
 
+          wait_strategy: How to wait for the run to finish. `"result"` holds a `result()`
+            request open until the run completes. `"events"` follows the run's event stream
+            and only fetches the result once the run has finished.
+
           extra_headers: Send extra headers
 
           extra_query: Add additional query parameters to the request
@@ -872,6 +1225,15 @@ class AsyncTaskRunResource(AsyncAPIResource):
             timeout=timeout,
         )
 
+        if wait_strategy == "events":
+            await self._wait_for_terminal_event(
+                run_id=task_run.run_id,
+                deadline=deadline,
+                extra_headers=extra_headers,
+                extra_query=extra_query,
+                extra_body=extra_body,
+            )
+
         return await self._wait_for_result(
             run_id=task_run.run_id,
             deadline=deadline,
@@ -881,6 +1243,167 @@ class AsyncTaskRunResource(AsyncAPIResource):
             extra_body=extra_body,
         )
 
+    @overload
+    def execute_many(
+        self,
+        inputs: Union[
+            Iterable[Union[str, Dict[str, object], RawJSON]], AsyncIterable[Union[str, Dict[str, object], RawJSON]]
+        ],
+        *,
+        processor: str,
+        metadata: Optional[Dict[str, Union[str, float, bool]]] | Omit = omit,
+        output: Optional[OutputSchema] | Omit = omit,
+        max_concurrency: int = 10,
+        wait_strategy: Literal["result", "events"] = "result",
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = not_given,
+    ) -> AsyncIterator[ExecuteManyItem[TaskRunResult]]: ...
+    @overload
+    def execute_many(
+        self,
+        inputs: Union[
+            Iterable[Union[str, Dict[str, object], RawJSON]], AsyncIterable[Union[str, Dict[str, object], RawJSON]]
+        ],
+        *,
+        processor: str,
+        metadata: Optional[Dict[str, Union[str, float, bool]]] | Omit = omit,
+        output: Type[OutputT],
+        max_concurrency: int = 10,
+        wait_strategy: Literal["result", "events"] = "result",
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = not_given,
+    ) -> AsyncIterator[ExecuteManyItem[ParsedTaskRunResult[OutputT]]]: ...
+    def execute_many(
+        self,
+        inputs: Union[
+            Iterable[Union[str, Dict[str, object], RawJSON]], AsyncIterable[Union[str, Dict[str, object], RawJSON]]
+        ],
+        *,
+        processor: str,
+        metadata: Optional[Dict[str, Union[str, float, bool]]] | Omit = omit,
+        output: Optional[OutputSchema] | Type[OutputT] | Omit = omit,
+        max_concurrency: int = 10,
+        wait_strategy: Literal["result", "events"] = "result",
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = not_given,
+    ) -> AsyncIterator[ExecuteManyItem[TaskRunResult]] | AsyncIterator[ExecuteManyItem[ParsedTaskRunResult[OutputT]]]:
+        """
+        Convenience method to execute a task run for each of many inputs, with at most
+        `max_concurrency` runs in flight at a time.
+
+        Yields an `ExecuteManyItem` per input in the order the runs complete. Each item
+        holds the `index` of its input, and either the `result` of the run or the `error`
+        it failed with, so that a failing run doesn't abort the others.
+
+        Runs are executed concurrently as the tasks of an anyio task group, with asyncio or
+        trio. All runs share the client's connection pool and retry policy. An iterator that is
+        left before it is exhausted should be closed with `aclose()`, which cancels the runs
+        that are still in flight.
+
+        Args:
+          inputs: Inputs to the tasks, each either text or a JSON object. Inputs are only
+              taken from the iterable, which may also be an async iterable, as runs complete.
+
+          processor: Processor to use for the tasks.
+
+          metadata: User-provided metadata stored with each run. Keys and values must be strings
+            with a maximum length of 16 and 512 characters respectively.
+
+          output: Optional output schema or pydantic type. If pydantic is provided,
+            the results will have a parsed field.
+
+          max_concurrency: Maximum number of runs that are executed at the same time.
+
+          wait_strategy: How to wait for each run to finish, see `execute()`.
+
+          extra_headers: Send extra headers
+
+          extra_query: Add additional query parameters to the request
+
+          extra_body: Add additional JSON properties to the request
+
+          timeout: Override the client-level default timeout for each run, in seconds.
+            A run that doesn't finish within the timeout fails with a `TimeoutError`.
+        """
+
+        async def _execute(
+            input: Union[str, Dict[str, object], RawJSON],
+        ) -> TaskRunResult | ParsedTaskRunResult[OutputT]:
+            return await self.execute(
+                input=input,
+                processor=processor,
+                metadata=metadata,
+                output=cast(Any, output),
+                wait_strategy=wait_strategy,
+                extra_headers=extra_headers,
+                extra_query=extra_query,
+                extra_body=extra_body,
+                timeout=timeout,
+            )
+
+        return _execute_many_async(inputs, _execute, max_concurrency=max_concurrency)
+
+    async def create_batched(
+        self,
+        *,
+        input: Union[str, Dict[str, object], RawJSON],
+        processor: str,
+        advanced_settings: Optional[TaskAdvancedSettingsParam] | Omit = omit,
+        enable_events: Optional[bool] | Omit = omit,
+        mcp_servers: Optional[Iterable[McpServerParam]] | Omit = omit,
+        memory_scope_key: Optional[str] | Omit = omit,
+        metadata: Optional[Dict[str, Union[str, float, bool]]] | Omit = omit,
+        previous_interaction_id: Optional[str] | Omit = omit,
+        source_policy: Optional[SourcePolicy] | Omit = omit,
+        task_spec: Optional[TaskSpecParam] | Omit = omit,
+        webhook: Optional[WebhookParam] | Omit = omit,
+    ) -> BatchedTaskRun:
+        """
+        Initiates a task run as part of a batch of the client's `task_run_batching`.
+
+        The runs of concurrent calls are created with a single `task_group.add_runs()` request,
+        see `TaskRunBatching`. The API only returns the IDs of the new runs, so this returns a
+        `BatchedTaskRun` in status 'queued', and `retrieve()` returns the full `TaskRun`.
+
+        The arguments are the same as for `create()`. Batches can't carry per-call request
+        options, so runs that need `betas` or other request options have to use `create()`.
+
+        Raises a `ValueError` if the client wasn't created with `task_run_batching`.
+        """
+        batcher = self._client._task_run_batcher
+        if batcher is None:
+            raise ValueError("`create_batched()` requires a client created with `task_run_batching`")
+
+        run = {
+            "input": input,
+            "processor": processor,
+            "advanced_settings": advanced_settings,
+            "enable_events": enable_events,
+            "mcp_servers": mcp_servers,
+            "memory_scope_key": memory_scope_key,
+            "metadata": metadata,
+            "previous_interaction_id": previous_interaction_id,
+            "source_policy": source_policy,
+            "task_spec": task_spec,
+            "webhook": webhook,
+        }
+        return await batcher.create(
+            self._client, cast(RunInputParam, {key: value for key, value in run.items() if is_given(value)})
+        )
+
+
 class TaskRunResourceWithRawResponse:
     def __init__(self, task_run: TaskRunResource) -> None:
         self._task_run = task_run
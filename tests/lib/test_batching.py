@@ -0,0 +1,189 @@
+import os
+import json
+import threading
+from typing import Any, Dict, List
+
+import anyio
+import httpx
+import pytest
+
+from parallel import Parallel, AsyncParallel, APIStatusError, BatchedTaskRun, TaskRunBatching
+from parallel.types import TaskRun
+
+base_url = os.environ.get("TEST_API_BASE_URL", "http://127.0.0.1:4010")
+
+_status = {"is_active": True, "num_task_runs": 0, "task_run_status_counts": {}}
+
+
+class FakeAPI:
+    def __init__(self, *, fail_add_runs: bool = False) -> None:
+        self.fail_add_runs = fail_add_runs
+        self.groups_created = 0
+        self.batches: List[List[Dict[str, Any]]] = []
+        self.single_creates = 0
+        self.lock = threading.Lock()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v1/tasks/groups":
+            self.groups_created += 1
+            return httpx.Response(200, json={"taskgroup_id": "tgrp_1", "status": _status})
+        if path == "/v1/tasks/groups/tgrp_1/runs":
+            if self.fail_add_runs:
+                return httpx.Response(400, json={"error": {"message": "invalid runs"}})
+            inputs = json.loads(request.read())["inputs"]
+            with self.lock:
+                offset = sum(len(batch) for batch in self.batches)
+                self.batches.append(inputs)
+            run_ids = [f"trun_{offset + i}" for i in range(len(inputs))]
+            return httpx.Response(200, json={"run_ids": run_ids, "status": _status})
+        assert path == "/v1/tasks/runs"
+        self.single_creates += 1
+        run = {"run_id": "trun_single", "interaction_id": "int_1", "status": "queued", "is_active": True}
+        return httpx.Response(202, json={**run, "processor": "base"})
+
+
+def _client(api: FakeAPI, batching: TaskRunBatching) -> Parallel:
+    return Parallel(
+        base_url=base_url,
+        api_key="My API Key",
+        max_retries=0,
+        task_run_batching=batching,
+        http_client=httpx.Client(transport=httpx.MockTransport(api.handler)),
+    )
+
+
+def _async_client(api: FakeAPI, batching: TaskRunBatching) -> AsyncParallel:
+    return AsyncParallel(
+        base_url=base_url,
+        api_key="My API Key",
+        max_retries=0,
+        task_run_batching=batching,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(api.handler)),
+    )
+
+
+def test_batches_creates_from_many_threads() -> None:
+    api = FakeAPI()
+    client = _client(api, TaskRunBatching(max_wait=0.2))
+    run_ids: Dict[int, str] = {}
+
+    def create(i: int) -> None:
+        run = client.task_run.create_batched(input=f"question {i}", processor="base", metadata={"i": i})
+        assert isinstance(run, BatchedTaskRun)
+        assert run.status == "queued" and run.task_group_id == "tgrp_1" and run.metadata == {"i": i}
+        run_ids[i] = run.run_id
+
+    threads = [threading.Thread(target=create, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert api.groups_created == 1
+    # usually a single batch, unless the threads are slow to start
+    assert sum(len(batch) for batch in api.batches) == 20
+    assert len(api.batches) < 5
+    # every caller gets the run ID at the position of its own input
+    runs = [run for batch in api.batches for run in batch]
+    for position, run in enumerate(runs):
+        assert run_ids[run["metadata"]["i"]] == f"trun_{position}"
+
+
+def test_batches_are_sent_when_full() -> None:
+    api = FakeAPI()
+    client = _client(api, TaskRunBatching(max_batch_size=5, max_wait=10))
+
+    threads = [
+        threading.Thread(target=client.task_run.create_batched, kwargs={"input": str(i), "processor": "base"})
+        for i in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert [len(batch) for batch in api.batches] == [5, 5]
+
+
+def test_create_is_not_batched() -> None:
+    api = FakeAPI()
+    client = _client(api, TaskRunBatching(task_group_id="tgrp_1"))
+
+    run = client.task_run.create(input="question", processor="base")
+
+    assert isinstance(run, TaskRun)
+    assert run.run_id == "trun_single"
+    assert api.single_creates == 1
+    assert api.batches == []
+
+
+def test_create_batched_requires_batching() -> None:
+    client = Parallel(base_url=base_url, api_key="My API Key")
+    with pytest.raises(ValueError, match="task_run_batching"):
+        client.task_run.create_batched(input="question", processor="base")
+
+
+def test_client_copies_share_batches() -> None:
+    api = FakeAPI()
+    client = _client(api, TaskRunBatching(max_batch_size=2, max_wait=10))
+    copies = [client.with_options(max_retries=1), client.with_options(timeout=30)]
+
+    threads = [
+        threading.Thread(target=copy.task_run.create_batched, kwargs={"input": str(i), "processor": "base"})
+        for i, copy in enumerate(copies)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    # a single flush into a single task group
+    assert [len(batch) for batch in api.batches] == [2]
+    assert api.groups_created == 1
+
+
+def test_batch_errors_are_raised_to_every_caller() -> None:
+    api = FakeAPI(fail_add_runs=True)
+    client = _client(api, TaskRunBatching(task_group_id="tgrp_1", max_wait=0.1))
+    errors: List[Exception] = []
+
+    def create() -> None:
+        try:
+            client.task_run.create_batched(input="question", processor="base")
+        except APIStatusError as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=create) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3
+    assert api.groups_created == 0
+
+
+async def test_async_batches_concurrent_creates() -> None:
+    api = FakeAPI()
+    client = _async_client(api, TaskRunBatching(max_batch_size=4, max_wait=0.05))
+    run_ids: Dict[int, str] = {}
+
+    async def create(i: int) -> None:
+        run_ids[i] = (await client.task_run.create_batched(input=str(i), processor="base", metadata={"i": i})).run_id
+
+    async with anyio.create_task_group() as tg:
+        for i in range(10):
+            tg.start_soon(create, i)
+
+    assert api.groups_created == 1
+    assert [len(batch) for batch in api.batches] == [4, 4, 2]
+    assert sorted(run_ids.values()) == sorted(f"trun_{i}" for i in range(10))
+    for offset, batch in zip((0, 4, 8), api.batches):
+        for position, run in enumerate(batch):
+            assert run_ids[run["metadata"]["i"]] == f"trun_{offset + position}"
+
+
+def test_validates_batch_size() -> None:
+    with pytest.raises(ValueError, match="max_batch_size"):
+        TaskRunBatching(max_batch_size=1001)
@@ -0,0 +1,243 @@
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from parallel import Parallel, SQLiteCache, CacheBackend, AsyncParallel, InMemoryCache, ResponseCache
+
+base_url = "http://127.0.0.1:4010"
+api_key = "My API Key"
+
+
+def test_in_memory_cache_evicts_least_recently_used() -> None:
+    cache = InMemoryCache(max_entries=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    assert cache.get("a") == b"1"
+
+    cache.set("c", b"3")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+    assert len(cache) == 2
+
+
+def test_in_memory_cache_ttl() -> None:
+    cache = InMemoryCache()
+    cache.set("a", b"1", ttl=0.05)
+    cache.set("b", b"2")
+    assert cache.get("a") == b"1"
+
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.get("b") == b"2"
+
+
+def test_sqlite_cache_is_shared(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite"
+    first = SQLiteCache(path)
+    second = SQLiteCache(path)
+
+    first.set("a", b"\x00\x01", ttl=60)
+    first.set("b", b"2", ttl=-1)
+    assert second.get("a") == b"\x00\x01"
+    assert second.get("b") is None
+
+    second.clear()
+    assert first.get("a") is None
+
+    first.close()
+    second.close()
+
+
+def _search_request(body: bytes, **headers: str) -> httpx.Request:
+    return httpx.Request("POST", "https://api.parallel.ai/v1/search", content=body, headers=headers)
+
+
+def test_response_cache_round_trip() -> None:
+    cache = ResponseCache()
+
+    request = _search_request(b'{"objective":"foo"}')
+    key, response = cache.lookup(request)
+    assert key is not None
+    assert response is None
+
+    cache.store(
+        key,
+        httpx.Response(200, json={"search_id": "abc"}, headers={"x-request-id": "req_1"}, request=request),
+    )
+
+    key, response = cache.lookup(_search_request(b'{"objective":"foo"}'))
+    assert response is not None
+    assert response.json() == {"search_id": "abc"}
+    assert response.headers["x-request-id"] == "req_1"
+
+    # a different body is a different entry
+    _, response = cache.lookup(_search_request(b'{"objective":"bar"}'))
+    assert response is None
+
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_response_cache_is_keyed_on_credentials_and_base_url() -> None:
+    cache = ResponseCache()
+    request = _search_request(b"{}", **{"x-api-key": "key_1"})
+    key, _ = cache.lookup(request)
+    assert key is not None
+    cache.store(key, httpx.Response(200, json={}, request=request))
+
+    _, response = cache.lookup(_search_request(b"{}", **{"x-api-key": "key_1"}))
+    assert response is not None
+
+    _, response = cache.lookup(_search_request(b"{}", **{"x-api-key": "key_2"}))
+    assert response is None
+
+    _, response = cache.lookup(
+        httpx.Request("POST", "https://eu.api.parallel.ai/v1/search", content=b"{}", headers={"x-api-key": "key_1"})
+    )
+    assert response is None
+
+
+def test_response_cache_is_keyed_on_headers_that_change_the_response() -> None:
+    cache = ResponseCache()
+    request = _search_request(b"{}", **{"x-api-key": "key_1"})
+    key, _ = cache.lookup(request)
+    assert key is not None
+    cache.store(key, httpx.Response(200, json={}, request=request))
+
+    # a beta can change the shape of the response
+    _, response = cache.lookup(_search_request(b"{}", **{"x-api-key": "key_1", "parallel-beta": "search-2025"}))
+    assert response is None
+
+    # other headers are only part of the key if they're listed in `vary`
+    _, response = cache.lookup(_search_request(b"{}", **{"x-api-key": "key_1", "x-custom": "a"}))
+    assert response is not None
+
+    cache = ResponseCache(vary=["X-Custom"])
+    key, _ = cache.lookup(request)
+    assert key is not None
+    cache.store(key, httpx.Response(200, json={}, request=request))
+    _, response = cache.lookup(_search_request(b"{}", **{"x-api-key": "key_1", "x-custom": "a"}))
+    assert response is None
+
+
+def test_cache_backend_is_abstract() -> None:
+    class Incomplete(CacheBackend):
+        def get(self, key: str) -> bytes:
+            return key.encode()
+
+    with pytest.raises(TypeError):
+        Incomplete()  # type: ignore[abstract]
+
+
+def test_response_cache_bypass() -> None:
+    cache = ResponseCache()
+    request = _search_request(b"{}")
+    key, _ = cache.lookup(request)
+    assert key is not None
+    cache.store(key, httpx.Response(200, json={}, request=request))
+
+    key, response = cache.lookup(_search_request(b"{}", **{"Cache-Control": "no-cache"}))
+    assert key is not None
+    assert response is None
+
+    key, response = cache.lookup(_search_request(b"{}", **{"Cache-Control": "no-store"}))
+    assert key is None
+    assert response is None
+
+    # endpoints without a TTL are never cached
+    key, response = cache.lookup(httpx.Request("POST", "https://api.parallel.ai/v1/tasks/runs", content=b"{}"))
+    assert key is None
+
+
+def test_response_cache_honours_fetch_policy() -> None:
+    backend = InMemoryCache()
+    cache = ResponseCache(backend, ttls={"/v1/extract": 3600})
+
+    request = httpx.Request(
+        "POST",
+        "https://api.parallel.ai/v1/extract",
+        content=b'{"urls":[],"advanced_settings":{"fetch_policy":{"max_age_seconds":0}}}',
+    )
+    key, _ = cache.lookup(request)
+    assert key is not None
+    cache.store(key, httpx.Response(200, json={}, request=request))
+    assert len(backend) == 0
+
+    # errors are never stored
+    request = httpx.Request("POST", "https://api.parallel.ai/v1/extract", content=b'{"urls":[]}')
+    key, _ = cache.lookup(request)
+    assert key is not None
+    cache.store(key, httpx.Response(500, json={}, request=request))
+    assert len(backend) == 0
+
+
+def _task_run_result(status: str) -> object:
+    return {
+        "output": {"type": "text", "content": "foo", "basis": []},
+        "run": {
+            "run_id": "run_1",
+            "status": status,
+            "is_active": False,
+            "processor": "base",
+            "created_at": "2025-01-01T00:00:00Z",
+            "modified_at": "2025-01-01T00:00:00Z",
+        },
+    }
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_artifact_cache(respx_mock: MockRouter, tmp_path: Path) -> None:
+    backend = SQLiteCache(tmp_path / "artifacts.sqlite")
+    client = Parallel(base_url=base_url, api_key=api_key, artifact_cache=backend)
+
+    result_route = respx_mock.get("/v1/tasks/runs/run_1/result").mock(
+        return_value=httpx.Response(200, json=_task_run_result("completed"))
+    )
+    input_route = respx_mock.get("/v1/tasks/runs/run_1/input").mock(
+        return_value=httpx.Response(200, json={"input": "foo", "processor": "base"})
+    )
+
+    first = client.task_run.result("run_1")
+    second = client.task_run.result("run_1")
+    assert result_route.call_count == 1
+    assert second.run.status == "completed"
+    assert second.to_dict() == first.to_dict()
+
+    # calls with extra request options always go to the API
+    response = client.task_run.with_raw_response.result("run_1")
+    assert response.parse().run.run_id == "run_1"
+    assert result_route.call_count == 2
+
+    assert client.task_run.retrieve_input("run_1").input == "foo"
+    assert client.task_run.retrieve_input("run_1").processor == "base"
+    assert input_route.call_count == 1
+
+    # the cache outlives the client
+    other = Parallel(base_url=base_url, api_key=api_key, artifact_cache=SQLiteCache(tmp_path / "artifacts.sqlite"))
+    assert other.task_run.result("run_1").run.run_id == "run_1"
+    assert result_route.call_count == 2
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_artifact_cache_skips_non_terminal_runs(respx_mock: MockRouter) -> None:
+    backend = InMemoryCache()
+    client = AsyncParallel(base_url=base_url, api_key=api_key, artifact_cache=backend)
+
+    route = respx_mock.get("/v1/tasks/runs/run_1/result").mock(
+        side_effect=[
+            httpx.Response(200, json=_task_run_result("running")),
+            httpx.Response(200, json=_task_run_result("completed")),
+            httpx.Response(200, json=_task_run_result("completed")),
+        ]
+    )
+
+    assert (await client.task_run.result("run_1")).run.status == "running"
+    assert (await client.task_run.result("run_1")).run.status == "completed"
+    assert (await client.task_run.result("run_1")).run.status == "completed"
+    assert route.call_count == 2
+    assert len(backend) == 1
+    assert client.with_options(max_retries=0)._artifact_cache is backend
@@ -0,0 +1,79 @@
+import gzip
+import json
+from typing import Any, Dict
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from parallel import Parallel, AsyncParallel, ResponseCache, RequestCompression
+from parallel._models import FinalRequestOptions
+
+base_url = "http://127.0.0.1:4010"
+api_key = "My API Key"
+
+BODY: Dict[str, Any] = {"inputs": [{"input": f"What does company {i} do?", "processor": "base"} for i in range(100)]}
+
+
+def _build_request(client: Parallel, body: object, **kwargs: Any) -> httpx.Request:
+    return client._build_request(
+        FinalRequestOptions(method="post", url="/v1/tasks/groups/tgrp_1/runs", json_data=body, **kwargs)
+    )
+
+
+def test_compresses_bodies_above_threshold() -> None:
+    client = Parallel(base_url=base_url, api_key=api_key, request_compression=RequestCompression(threshold=1024))
+
+    request = _build_request(client, BODY)
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(request.content)) == BODY
+    assert int(request.headers["Content-Length"]) == len(request.content)
+    # the output is deterministic, so that it can be used as a cache key
+    assert _build_request(client, BODY).content == request.content
+
+    request = _build_request(client, {"input": "small", "processor": "base"})
+    assert "Content-Encoding" not in request.headers
+    assert json.loads(request.content) == {"input": "small", "processor": "base"}
+
+    # bodies that the caller already compressed are left alone
+    request = _build_request(client, gzip.compress(json.dumps(BODY).encode()), headers={"Content-Encoding": "gzip"})
+    assert json.loads(gzip.decompress(request.content)) == BODY
+
+    assert "Content-Encoding" not in _build_request(client.with_options(request_compression=None), {}).headers
+    assert client.with_options(max_retries=0)._request_compression is client._request_compression
+
+
+def test_zstd() -> None:
+    zstandard = pytest.importorskip("zstandard")
+    client = Parallel(base_url=base_url, api_key=api_key, request_compression=RequestCompression("zstd", threshold=0))
+
+    request = _build_request(client, BODY)
+    assert request.headers["Content-Encoding"] == "zstd"
+    assert json.loads(zstandard.ZstdDecompressor().decompressobj().decompress(request.content)) == BODY
+
+
+def test_invalid_options() -> None:
+    with pytest.raises(ValueError, match="Expected encoding to be one of"):
+        RequestCompression("br")  # type: ignore[arg-type]
+
+    with pytest.raises(ValueError, match="Expected threshold to be non-negative"):
+        RequestCompression(threshold=-1)
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_compressed_requests_are_cached(respx_mock: MockRouter) -> None:
+    client = AsyncParallel(
+        base_url=base_url,
+        api_key=api_key,
+        request_compression=RequestCompression(threshold=0),
+        response_cache=ResponseCache(ttls={"/v1/search": 600}),
+    )
+    route = respx_mock.post("/v1/search").mock(return_value=httpx.Response(200, json={"search_id": "search_1"}))
+
+    body = {"objective": "foo", "advanced_settings": {"fetch_policy": {"max_age_seconds": 0}}}
+    await client.post("/v1/search", body=body, cast_to=object)
+    await client.post("/v1/search", body=body, cast_to=object)
+
+    # `max_age_seconds` is read from the compressed body, so the response isn't cached
+    assert route.call_count == 2
+    assert json.loads(gzip.decompress(route.calls[0].request.content)) == body
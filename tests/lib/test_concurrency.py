@@ -0,0 +1,76 @@
+import anyio
+import pytest
+
+from parallel import AdaptiveConcurrencyLimiter
+
+
+async def test_limits_in_flight_requests() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2)
+    peak = 0
+
+    async def worker() -> None:
+        nonlocal peak
+        acquired_at = await limiter.acquire()
+        peak = max(peak, limiter.in_flight)
+        await anyio.sleep(0.01)
+        limiter.release(acquired_at)
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(10):
+            tg.start_soon(worker)
+
+    assert peak == 2
+    assert limiter.in_flight == 0
+    assert limiter.waiting == 0
+
+
+async def test_additive_increase() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=3)
+
+    # 2 -> 2.5 -> 2.9 -> 3.24
+    for _ in range(3):
+        limiter.release(await limiter.acquire(), succeeded=True)
+    assert limiter.limit == 3
+
+    for _ in range(10):
+        limiter.release(await limiter.acquire(), succeeded=True)
+    assert limiter.limit == 3
+
+
+async def test_multiplicative_decrease_once_per_window() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+
+    acquired = [await limiter.acquire() for _ in range(4)]
+    for acquired_at in acquired:
+        limiter.release(acquired_at, overloaded=True)
+
+    # all four requests were in flight together, so the limit is only cut once
+    assert limiter.limit == 4
+
+    limiter.release(await limiter.acquire(), overloaded=True)
+    assert limiter.limit == 2
+
+    for _ in range(5):
+        limiter.release(await limiter.acquire(), overloaded=True)
+    assert limiter.limit == 1
+
+
+async def test_cancelled_waiter_does_not_leak_slot() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+    acquired_at = await limiter.acquire()
+
+    with anyio.move_on_after(0.01):
+        await limiter.acquire()
+    assert limiter.waiting == 0
+
+    limiter.release(acquired_at)
+    limiter.release(await limiter.acquire())
+    assert limiter.in_flight == 0
+
+
+def test_invalid_limits() -> None:
+    with pytest.raises(ValueError, match="min_limit <= initial_limit <= max_limit"):
+        AdaptiveConcurrencyLimiter(initial_limit=200)
+
+    with pytest.raises(ValueError, match="multiplicative_decrease"):
+        AdaptiveConcurrencyLimiter(multiplicative_decrease=1)
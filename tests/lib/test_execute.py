@@ -0,0 +1,175 @@
+import os
+import json
+import time
+from typing import Any, Dict, List, Iterator
+
+import httpx
+import pytest
+
+from parallel import Parallel, AsyncParallel
+from parallel.lib._time import _LongPoll
+
+base_url = os.environ.get("TEST_API_BASE_URL", "http://127.0.0.1:4010")
+
+
+def _run(status: str) -> Dict[str, Any]:
+    return {
+        "run_id": "trun_1",
+        "interaction_id": "int_1",
+        "status": status,
+        "is_active": status in ("queued", "running"),
+        "processor": "base",
+    }
+
+
+class FakeRun:
+    """A task run that completes after its event stream was opened `streams_until_done` times."""
+
+    def __init__(self, streams_until_done: int = 1) -> None:
+        self.streams_until_done = streams_until_done
+        self.requests: List[str] = []
+
+    def events(self, done: bool) -> Iterator[bytes]:
+        progress = {"type": "task_run.progress_msg.plan", "message": "planning"}
+        yield f"event: task_run.progress_msg.plan\ndata: {json.dumps(progress)}\n\n".encode()
+        if done:
+            state = {"type": "task_run.state", "run": _run("completed")}
+            yield f"event: task_run.state\ndata: {json.dumps(state)}\n\n".encode()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.requests.append(f"{request.method} {path}")
+        if request.method == "POST":
+            return httpx.Response(202, json=_run("queued"))
+        if path.endswith("/events"):
+            self.streams_until_done -= 1
+            content = b"".join(self.events(done=self.streams_until_done <= 0))
+            return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=content)
+        if path.endswith("/result"):
+            return httpx.Response(
+                200, json={"run": _run("completed"), "output": {"type": "text", "content": "done", "basis": []}}
+            )
+        return httpx.Response(200, json=_run("running"))
+
+
+def test_execute_waits_for_terminal_event() -> None:
+    run = FakeRun(streams_until_done=2)
+    client = Parallel(
+        base_url=base_url, api_key="My API Key", http_client=httpx.Client(transport=httpx.MockTransport(run.handler))
+    )
+
+    result = client.task_run.execute(input="question", processor="base", wait_strategy="events", timeout=10)
+
+    assert result.run.status == "completed"
+    # the stream that ended early is followed by a check of the run, and the result is only fetched at the end
+    assert run.requests == [
+        "POST /v1/tasks/runs",
+        "GET /v1/tasks/runs/trun_1/events",
+        "GET /v1/tasks/runs/trun_1",
+        "GET /v1/tasks/runs/trun_1/events",
+        "GET /v1/tasks/runs/trun_1/result",
+    ]
+
+
+async def test_async_execute_waits_for_terminal_event() -> None:
+    run = FakeRun()
+    client = AsyncParallel(
+        base_url=base_url,
+        api_key="My API Key",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(run.handler)),
+    )
+
+    result = await client.task_run.execute(input="question", processor="base", wait_strategy="events", timeout=10)
+
+    assert result.run.status == "completed"
+    assert run.requests == [
+        "POST /v1/tasks/runs",
+        "GET /v1/tasks/runs/trun_1/events",
+        "GET /v1/tasks/runs/trun_1/result",
+    ]
+
+
+def test_execute_times_out_without_terminal_event() -> None:
+    run = FakeRun(streams_until_done=1_000_000)
+    client = Parallel(
+        base_url=base_url, api_key="My API Key", http_client=httpx.Client(transport=httpx.MockTransport(run.handler))
+    )
+
+    with pytest.raises(TimeoutError):
+        client.task_run.execute(input="question", processor="base", wait_strategy="events", timeout=0.1)
+    assert "GET /v1/tasks/runs/trun_1/result" not in run.requests
+
+
+def test_execute_backs_off_when_event_stream_ends_early(monkeypatch: pytest.MonkeyPatch) -> None:
+    delays: List[float] = []
+    backoff = _LongPoll.backoff
+
+    def spy(self: _LongPoll) -> float:
+        delays.append(backoff(self))
+        return delays[-1]
+
+    monkeypatch.setattr(_LongPoll, "backoff", spy)
+    run = FakeRun(streams_until_done=3)
+    client = Parallel(
+        base_url=base_url, api_key="My API Key", http_client=httpx.Client(transport=httpx.MockTransport(run.handler))
+    )
+
+    client.task_run.execute(input="question", processor="base", wait_strategy="events", timeout=10)
+    assert len(delays) == 2
+    assert all(0 <= delay <= 0.5 for delay in delays)
+
+
+def test_execute_retries_event_stream_connection_errors() -> None:
+    run = FakeRun()
+    failures = [httpx.ConnectError("connection refused")]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/events") and failures:
+            raise failures.pop()
+        return run.handler(request)
+
+    client = Parallel(
+        base_url=base_url,
+        api_key="My API Key",
+        max_retries=0,
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+    result = client.task_run.execute(input="question", processor="base", wait_strategy="events", timeout=10)
+    assert result.run.status == "completed"
+    assert run.requests == [
+        "POST /v1/tasks/runs",
+        "GET /v1/tasks/runs/trun_1/events",
+        "GET /v1/tasks/runs/trun_1/result",
+    ]
+
+
+def test_execute_long_polls_result_in_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    api_timeouts: List[str] = []
+    # the mock answers with a 408 straight away, which is backed off
+    monkeypatch.setattr(time, "sleep", lambda _seconds: None)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(202, json=_run("queued"))
+        api_timeouts.append(request.url.params["timeout"])
+        if len(api_timeouts) < 3:
+            return httpx.Response(408, json={"error": {"message": "timed out"}})
+        return httpx.Response(
+            200, json={"run": _run("completed"), "output": {"type": "text", "content": "done", "basis": []}}
+        )
+
+    client = Parallel(
+        base_url=base_url, api_key="My API Key", http_client=httpx.Client(transport=httpx.MockTransport(handler))
+    )
+
+    result = client.task_run.execute(input="question", processor="base", timeout=3600)
+
+    assert result.run.status == "completed"
+    # every 408 is retried by the long-poll, and not by the client's own retries
+    assert api_timeouts == ["60", "60", "60"]
+
+    # the client that waits without retries is only built once
+    client.task_run.execute(input="question", processor="base", timeout=3600)
+    assert client.task_run._long_poll_client is client.task_run._long_poll_client
+    assert client.task_run._long_poll_client.max_retries == 0
@@ -0,0 +1,187 @@
+import os
+import time
+import threading
+from typing import Any, Dict, List, Iterator, AsyncIterator
+
+import anyio
+import httpx
+import pytest
+
+from parallel import Parallel, AsyncParallel
+from parallel.lib._execute_many import execute_many, execute_many_async
+
+base_url = os.environ.get("TEST_API_BASE_URL", "http://127.0.0.1:4010")
+
+
+def test_execute_many_yields_in_completion_order() -> None:
+    def execute(input: object) -> str:
+        time.sleep({"slow": 0.2, "fast": 0.0}[str(input)])
+        return f"result for {input}"
+
+    items = list(execute_many(["slow", "fast"], execute, max_concurrency=2))
+
+    assert [(item.index, item.input, item.result) for item in items] == [
+        (1, "fast", "result for fast"),
+        (0, "slow", "result for slow"),
+    ]
+
+
+def test_execute_many_reports_errors_per_item() -> None:
+    def execute(input: object) -> str:
+        if input == "bad":
+            raise ValueError("bad input")
+        return "ok"
+
+    items = sorted(execute_many(["good", "bad", "good"], execute, max_concurrency=3), key=lambda item: item.index)
+
+    assert [item.ok for item in items] == [True, False, True]
+    assert isinstance(items[1].error, ValueError)
+    assert items[1].result is None
+
+
+def test_execute_many_bounds_concurrency_and_reads_inputs_lazily() -> None:
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+    taken: List[int] = []
+
+    def inputs() -> Iterator[str]:
+        for i in range(20):
+            taken.append(i)
+            yield str(i)
+
+    def execute(_input: object) -> None:
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+
+    items = execute_many(inputs(), execute, max_concurrency=3)
+    next(items)
+    # only the inputs of completed runs are replaced, instead of reading all inputs up front
+    assert 4 <= len(taken) <= 6
+    assert len(list(items)) == 19
+    assert max_running <= 3
+
+
+def test_execute_many_validates_max_concurrency() -> None:
+    with pytest.raises(ValueError, match="max_concurrency"):
+        execute_many([], lambda input: input, max_concurrency=0)
+
+
+async def test_execute_many_async_bounds_concurrency() -> None:
+    running = 0
+    max_running = 0
+
+    async def inputs() -> AsyncIterator[str]:
+        for i in range(10):
+            yield str(i)
+
+    async def execute(input: object) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await anyio.sleep(0.01 if input != "3" else 0.05)
+        running -= 1
+        if input == "5":
+            raise ValueError("bad input")
+        return int(str(input))
+
+    items = [item async for item in execute_many_async(inputs(), execute, max_concurrency=4)]
+
+    assert sorted(item.index for item in items) == list(range(10))
+    assert all(item.result == item.index for item in items if item.ok)
+    assert [item.index for item in items if not item.ok] == [5]
+    assert max_running == 4
+    # the slow run completes after runs that were started later
+    assert [item.index for item in items].index(3) > 4
+
+
+async def test_execute_many_async_cancels_runs_when_closed() -> None:
+    cancelled = 0
+
+    async def execute(_input: object) -> None:
+        nonlocal cancelled
+        try:
+            await anyio.sleep(10)
+        except anyio.get_cancelled_exc_class():
+            cancelled += 1
+            raise
+
+    async def fast_then_slow(input: object) -> None:
+        if input != "0":
+            await execute(input)
+
+    items = execute_many_async(["0", "1", "2"], fast_then_slow, max_concurrency=3)
+    async for _ in items:
+        break
+    await items.aclose()  # type: ignore[attr-defined]
+
+    assert cancelled == 2
+
+
+async def test_execute_many_async_raises_input_errors_after_started_runs() -> None:
+    async def inputs() -> AsyncIterator[str]:
+        yield "0"
+        yield "1"
+        raise ValueError("bad inputs")
+
+    async def execute(input: object) -> object:
+        await anyio.sleep(0.01)
+        return input
+
+    results: List[object] = []
+    with pytest.raises(ValueError, match="bad inputs"):
+        async for item in execute_many_async(inputs(), execute, max_concurrency=4):
+            results.append(item.result)
+
+    assert sorted(results) == ["0", "1"]  # type: ignore[type-var]
+
+
+def _run(run_id: str, status: str) -> Dict[str, Any]:
+    return {
+        "run_id": run_id,
+        "interaction_id": "int_1",
+        "status": status,
+        "is_active": status in ("queued", "running"),
+        "processor": "base",
+    }
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.method == "POST":
+        body = request.read().decode()
+        if "fail" in body:
+            return httpx.Response(422, json={"error": {"message": "invalid input"}})
+        return httpx.Response(202, json=_run(f"trun_{len(body)}", "queued"))
+    run_id = request.url.path.split("/")[4]
+    return httpx.Response(
+        200, json={"run": _run(run_id, "completed"), "output": {"type": "text", "content": run_id, "basis": []}}
+    )
+
+
+def test_task_run_execute_many() -> None:
+    client = Parallel(
+        base_url=base_url, api_key="My API Key", http_client=httpx.Client(transport=httpx.MockTransport(_handler))
+    )
+
+    items = list(client.task_run.execute_many(["a", "fail", "abc"], processor="base", max_concurrency=2))
+
+    by_index = {item.index: item for item in items}
+    assert sorted(by_index) == [0, 1, 2]
+    assert by_index[0].result is not None and by_index[0].result.run.status == "completed"
+    assert by_index[1].error is not None and "invalid input" in str(by_index[1].error)
+    assert by_index[2].input == "abc"
+
+
+async def test_async_task_run_execute_many() -> None:
+    client = AsyncParallel(
+        base_url=base_url, api_key="My API Key", http_client=httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    )
+
+    items = [item async for item in client.task_run.execute_many(["a", "fail"], processor="base", max_concurrency=2)]
+
+    assert sorted((item.index, item.ok) for item in items) == [(0, True), (1, False)]
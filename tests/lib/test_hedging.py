@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+from parallel import HedgingPolicy
+from parallel.lib._hedging import HedgingThreads
+
+
+def test_hedge_delay_percentile() -> None:
+    hedging = HedgingPolicy(percentile=0.9, min_samples=10)
+
+    for i in range(1, 10):
+        hedging.record_latency("/v1/search", i / 10)
+    assert hedging.hedge_delay("/v1/search") is None
+
+    hedging.record_latency("/v1/search", 1.0)
+    assert hedging.hedge_delay("/v1/search", {"mode": "fast"}) == pytest.approx(0.9)
+    assert hedging.hedge_delay("/v1/extract") is None
+    assert hedging.hedge_delay("/v1/tasks/runs") is None
+
+
+def test_hedge_search_modes() -> None:
+    hedging = HedgingPolicy(min_samples=1)
+    hedging.record_latency("/v1/search", 1.0)
+
+    assert hedging.hedge_delay("/v1/search", {"mode": "turbo"}) == 1.0
+    assert hedging.hedge_delay("/v1/search", {"mode": "fast"}) == 1.0
+    assert hedging.hedge_delay("/v1/search", {"mode": "advanced"}) is None
+    assert hedging.hedge_delay("/v1/search", {"objective": "foo"}) is None
+
+
+def test_hedging_threads_are_bounded() -> None:
+    threads = HedgingThreads(max_threads=2)
+    release = threading.Event()
+
+    first = threads.try_submit(release.wait)
+    second = threads.try_submit(release.wait)
+    assert first is not None and second is not None
+    assert threads.try_submit(release.wait) is None
+
+    release.set()
+    first.result()
+    second.result()
+    third = threads.try_submit(lambda: 3)
+    assert third is not None and third.result() == 3
+    threads.shutdown()
+
+
+def test_hedge_budget() -> None:
+    hedging = HedgingPolicy(max_hedge_ratio=0.25, max_burst=1)
+
+    results = []
+    for _ in range(8):
+        hedging.hedge_delay("/v1/extract")
+        results.append(hedging.acquire_hedge())
+
+    assert results == [False, False, False, True, False, False, False, True]
+    assert hedging.requests == 8
+    assert hedging.hedges == 2
+
+
+def test_invalid_options() -> None:
+    with pytest.raises(ValueError, match="percentile"):
+        HedgingPolicy(percentile=95)
+
+    with pytest.raises(ValueError, match="max_hedge_ratio"):
+        HedgingPolicy(max_hedge_ratio=0)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+from typing import Any, List, Union, Callable
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from parallel import RawJSON, Parallel, JSONCodec, OrjsonCodec, AsyncParallel, BadRequestError
+from parallel._models import BaseModel
+from parallel._streaming import Stream
+
+base_url = "http://127.0.0.1:4010"
+api_key = "My API Key"
+
+
+class Model(BaseModel):
+    foo: str
+
+
+BODY = {
+    "text": "naïve café ✓",
+    "created_at": datetime(2024, 3, 22, 18, 11, 19, 117000, tzinfo=timezone.utc),
+    "model": Model(foo="bar"),
+    "nested": [{"a": 1.5, "b": None, "c": True}],
+}
+
+
+def test_orjson_codec_matches_default_codec() -> None:
+    pytest.importorskip("orjson")
+
+    assert OrjsonCodec().dumps(BODY) == JSONCodec().dumps(BODY)
+
+    encoded = JSONCodec().dumps(BODY)
+    assert OrjsonCodec().loads(encoded) == JSONCodec().loads(encoded) == json.loads(encoded)
+    assert OrjsonCodec().loads(encoded.decode()) == json.loads(encoded)
+
+    raw = {"inputs": [RawJSON(b'{"input":"x"}'), {"input": "y"}], "model": Model(foo="bar")}
+    assert (
+        OrjsonCodec().dumps(raw)
+        == JSONCodec().dumps(raw)
+        == b'{"inputs":[{"input":"x"},{"input":"y"}],"model":{"foo":"bar"}}'
+    )
+    assert OrjsonCodec().dumps(RawJSON(b"[1, 2]")) == b"[1, 2]"
+
+
+class RecordingCodec(JSONCodec):
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def dumps(self, obj: Any) -> bytes:
+        self.calls.append("dumps")
+        return super().dumps(obj)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        self.calls.append("loads")
+        return super().loads(data)
+
+
+def test_codec_is_used_for_every_body() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/stream":
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                content=b'data: {"foo":1}\n\ndata: {"foo":2}\n\n',
+            )
+        return httpx.Response(200, json={"foo": "bar"})
+
+    codec = RecordingCodec()
+    client = Parallel(
+        base_url=base_url,
+        api_key=api_key,
+        json_codec=codec,
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+    assert client.post("/foo", body={"foo": "bar"}, cast_to=Model) == Model(foo="bar")
+    assert codec.calls == ["dumps", "loads"]
+
+    codec.calls.clear()
+    stream = client.get("/stream", cast_to=object, stream=True, stream_cls=Stream[object])
+    assert list(stream) == [{"foo": 1}, {"foo": 2}]
+    assert codec.calls == ["loads", "loads"]
+    assert client.with_options(max_retries=0)._json_codec is codec
+
+
+async def test_codec_is_used_for_error_bodies() -> None:
+    codec = RecordingCodec()
+    client = AsyncParallel(
+        base_url=base_url,
+        api_key=api_key,
+        json_codec=codec,
+        max_retries=0,
+        http_client=httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda _request: httpx.Response(400, json={"error": "bad"}))
+        ),
+    )
+
+    with pytest.raises(BadRequestError) as exc_info:
+        await client.post("/foo", body={}, cast_to=object)
+    assert exc_info.value.body == {"error": "bad"}
+    assert codec.calls == ["dumps", "loads"]
+
+
+@pytest.mark.parametrize("codec", [JSONCodec, OrjsonCodec])
+def test_raw_json_request_bodies(codec: Callable[[], JSONCodec]) -> None:
+    if codec is OrjsonCodec:
+        pytest.importorskip("orjson")
+
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) == 1:
+            return httpx.Response(500)
+        return httpx.Response(200, json={"status": {}, "run_ids": ["run_1", "run_2"]})
+
+    client = Parallel(
+        base_url=base_url,
+        api_key=api_key,
+        json_codec=codec(),
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+    client._calculate_retry_timeout = lambda *_args, **_kwargs: 0.0  # type: ignore[method-assign]
+
+    runs = [
+        b'{"input": {"company": "Parallel"}, "processor": "base"}',
+        '{"input": "café", "processor": "base"}'.encode(),
+    ]
+    client.task_group.add_runs("tgrp_1", inputs=[RawJSON(run) for run in runs], betas=["mcp-server-2025-07-17"])
+
+    # the runs are sent as they are, with the same body when the request is retried
+    assert len(requests) == 2
+    assert requests[0].content == requests[1].content == b'{"inputs":[' + b",".join(runs) + b"]}"
+    assert requests[1].headers["parallel-beta"] == "mcp-server-2025-07-17"
+
+    requests.clear()
+    client.task_group.add_runs("tgrp_1", inputs=RawJSON(b"[" + b",".join(runs) + b"]"))
+    assert requests[-1].content == b'{"inputs":[' + b",".join(runs) + b"]}"
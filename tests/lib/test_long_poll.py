@@ -0,0 +1,131 @@
+import time
+from typing import List, Tuple
+
+import httpx
+import pytest
+
+from parallel import APIStatusError, APITimeoutError, TaskRunTimeoutError
+from parallel.lib._time import long_poll, long_poll_async
+
+request = httpx.Request("GET", "https://api.parallel.ai/v1/tasks/runs/trun_1/result")
+
+
+def _status_error(status_code: int) -> APIStatusError:
+    return APIStatusError("error", response=httpx.Response(status_code, request=request), body=None)
+
+
+def test_long_poll_retries_server_timeouts_in_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[Tuple[int, float]] = []
+    delays: List[float] = []
+    clock = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(time, "sleep", delays.append)
+
+    def fetch(api_timeout: int, timeout: float) -> str:
+        calls.append((api_timeout, timeout))
+        if len(calls) < 3:
+            # the server holds the request for the whole `api_timeout`
+            clock[0] += api_timeout
+            raise _status_error(408)
+        return "result"
+
+    assert long_poll("trun_1", time.monotonic() + 3600, fetch, chunk=60) == "result"
+
+    # 408 means the server held the request for the whole chunk, so it's retried right away
+    assert delays == []
+    assert calls == [(60, 65.0), (60, 65.0), (60, 65.0)]
+
+
+def test_long_poll_backs_off_on_early_server_timeouts(monkeypatch: pytest.MonkeyPatch) -> None:
+    delays: List[float] = []
+    monkeypatch.setattr(time, "sleep", delays.append)
+    errors = [_status_error(408), _status_error(408)]
+
+    def fetch(_api_timeout: int, _timeout: float) -> str:
+        if errors:
+            raise errors.pop(0)
+        return "result"
+
+    assert long_poll("trun_1", time.monotonic() + 3600, fetch) == "result"
+
+    # a 408 that comes back straight away isn't the server holding the request, so it's backed off
+    assert len(delays) == 2
+    for failures, delay in enumerate(delays):
+        assert 0 <= delay <= 0.5 * 2**failures
+
+
+def test_long_poll_chunks_are_bounded_by_the_deadline() -> None:
+    calls: List[Tuple[int, float]] = []
+
+    def fetch(api_timeout: int, timeout: float) -> str:
+        calls.append((api_timeout, timeout))
+        return "result"
+
+    long_poll("trun_1", time.monotonic() + 10.5, fetch, chunk=60)
+
+    api_timeout, timeout = calls[0]
+    assert api_timeout == 10
+    assert timeout == pytest.approx(10.5, abs=0.1)
+
+
+def test_long_poll_backs_off_on_unavailable(monkeypatch: pytest.MonkeyPatch) -> None:
+    delays: List[float] = []
+    monkeypatch.setattr(time, "sleep", delays.append)
+    errors = [_status_error(503), _status_error(504), APITimeoutError(request=request)]
+
+    def fetch(_api_timeout: int, _timeout: float) -> str:
+        if errors:
+            raise errors.pop(0)
+        return "result"
+
+    assert long_poll("trun_1", time.monotonic() + 3600, fetch) == "result"
+
+    assert len(delays) == 3
+    for failures, delay in enumerate(delays):
+        assert 0 <= delay <= 0.5 * 2**failures
+
+
+def test_long_poll_retries_rate_limits_and_server_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    delays: List[float] = []
+    monkeypatch.setattr(time, "sleep", delays.append)
+    rate_limited = APIStatusError(
+        "error", response=httpx.Response(429, headers={"retry-after": "3"}, request=request), body=None
+    )
+    errors = [rate_limited, _status_error(500), _status_error(502)]
+
+    def fetch(_api_timeout: int, _timeout: float) -> str:
+        if errors:
+            raise errors.pop(0)
+        return "result"
+
+    assert long_poll("trun_1", time.monotonic() + 3600, fetch) == "result"
+
+    # the 429 waits as long as the API asks for, the server errors are backed off
+    assert len(delays) == 3
+    assert delays[0] == 3
+    for failures, delay in enumerate(delays[1:], start=1):
+        assert 0 <= delay <= 0.5 * 2**failures
+
+
+def test_long_poll_raises_other_errors() -> None:
+    def fetch(_api_timeout: int, _timeout: float) -> str:
+        raise _status_error(404)
+
+    with pytest.raises(APIStatusError):
+        long_poll("trun_1", time.monotonic() + 3600, fetch)
+
+
+async def test_long_poll_times_out_with_attempts() -> None:
+    async def fetch(_api_timeout: int, _timeout: float) -> str:
+        raise _status_error(408)
+
+    with pytest.raises(TaskRunTimeoutError) as exc_info:
+        await long_poll_async("trun_1", time.monotonic() + 0.2, fetch)
+
+    error = exc_info.value
+    assert isinstance(error, TimeoutError)
+    assert error.run_id == "trun_1"
+    assert len(error.attempts) >= 1
+    assert [attempt.number for attempt in error.attempts] == list(range(1, len(error.attempts) + 1))
+    assert all(attempt.api_timeout == 1 and attempt.elapsed >= 0 for attempt in error.attempts)
+    assert isinstance(error.__cause__, APIStatusError)
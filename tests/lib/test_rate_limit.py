@@ -0,0 +1,99 @@
+import time
+
+import anyio
+import pytest
+
+from parallel import RateLimiter
+
+
+def test_throttles_to_configured_rate() -> None:
+    limiter = RateLimiter({"/v1/search": 20}, burst=1)
+
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire("/v1/search")
+
+    # the first request goes out immediately, the remaining 4 are spaced 50ms apart
+    assert time.monotonic() - start == pytest.approx(0.2, abs=0.1)
+
+
+def test_longest_prefix_wins() -> None:
+    limiter = RateLimiter({"/v1/tasks": 1, "/v1/tasks/runs": 1000}, burst=1)
+
+    limiter.acquire("/v1/tasks/groups")
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire("/v1/tasks/runs/run_123/result?api_timeout=10")
+    assert time.monotonic() - start < 0.1
+
+
+def test_unmatched_endpoints_are_not_throttled() -> None:
+    limiter = RateLimiter({"/v1/search": 1}, burst=1)
+
+    start = time.monotonic()
+    for _ in range(10):
+        limiter.acquire("/v1/extract")
+    assert time.monotonic() - start < 0.1
+
+
+def test_pause_holds_back_endpoint() -> None:
+    limiter = RateLimiter()
+    limiter.pause("/v1/search", 0.2)
+
+    start = time.monotonic()
+    limiter.acquire("https://api.parallel.ai/v1/search")
+    assert time.monotonic() - start >= 0.2
+
+    start = time.monotonic()
+    limiter.acquire("/v1/search")
+    assert time.monotonic() - start < 0.1
+
+
+def test_pause_of_unmatched_path_is_not_shared() -> None:
+    limiter = RateLimiter({"/v1/search": 10}, default=100)
+    limiter.pause("/v1/extract", 10)
+
+    start = time.monotonic()
+    limiter.acquire("/v1/tasks/groups")
+    assert time.monotonic() - start < 0.1
+    assert limiter._bucket_for("/v1/extract").pause_remaining() > 0
+    assert limiter._bucket_for("/v1/tasks/groups") is not limiter._bucket_for("/v1/extract")
+
+
+def test_acquire_timeout() -> None:
+    limiter = RateLimiter({"/v1/search": 2}, burst=1)
+    assert limiter.acquire("/v1/search")
+
+    # the next token is 0.5s away, so it isn't taken
+    start = time.monotonic()
+    assert not limiter.acquire("/v1/search", timeout=0.1)
+    assert time.monotonic() - start < 0.1
+    assert limiter.acquire("/v1/search", timeout=1)
+
+
+def test_invalid_rate() -> None:
+    with pytest.raises(ValueError, match="Expected a positive rate limit"):
+        RateLimiter({"/v1/search": 0})
+
+    with pytest.raises(ValueError, match="Expected a positive rate limit"):
+        RateLimiter(default=-1)
+
+
+async def test_pause_applies_to_waiting_callers() -> None:
+    limiter = RateLimiter({"/v1/search": 10}, burst=1)
+    finished: list[float] = []
+
+    async def caller() -> None:
+        await limiter.aacquire("/v1/search")
+        finished.append(time.monotonic())
+
+    start = time.monotonic()
+    async with anyio.create_task_group() as tg:
+        for _ in range(3):
+            tg.start_soon(caller)
+        await anyio.sleep(0.01)
+        limiter.pause("/v1/search", 0.3)
+
+    assert len(finished) == 3
+    # the first caller was let through before the pause, everyone else waits for it to end
+    assert sorted(finished)[1] - start >= 0.3
@@ -0,0 +1,104 @@
+import json
+from typing import Any, List, Iterator, AsyncIterator
+
+import httpx
+import pytest
+
+from parallel import RawJSON, Parallel, AsyncParallel, InternalServerError
+from parallel._utils._json import openapi_dumps
+from parallel.lib._request_body import CHUNK_SIZE, iter_json_body
+
+base_url = "http://127.0.0.1:4010"
+api_key = "My API Key"
+
+RUN_RESPONSE = {"status": {}, "run_ids": ["run_1"]}
+
+
+def test_iter_json_body_is_lazy() -> None:
+    consumed: List[int] = []
+
+    def runs() -> Iterator[object]:
+        for i in range(100):
+            consumed.append(i)
+            yield {"input": "x" * 4096, "processor": "base"}
+
+    chunks = iter_json_body(
+        {"default_task_spec": {"output_schema": "text"}},
+        array_field="inputs",
+        items=runs(),
+        encode_item=openapi_dumps,
+        dumps=openapi_dumps,
+    )
+    first = next(chunks)
+    assert len(first) >= CHUNK_SIZE
+    assert len(consumed) < 100
+
+    body = json.loads(first + b"".join(chunks))
+    assert body["default_task_spec"] == {"output_schema": "text"}
+    assert len(body["inputs"]) == 100
+
+    assert (
+        b"".join(iter_json_body({}, array_field="inputs", items=[], encode_item=openapi_dumps, dumps=openapi_dumps))
+        == b'{"inputs":[]}'
+    )
+
+
+def test_add_runs_streams_iterators() -> None:
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        request.read()
+        requests.append(request)
+        return httpx.Response(500 if len(requests) > 1 else 200, json=RUN_RESPONSE)
+
+    client = Parallel(
+        base_url=base_url, api_key=api_key, http_client=httpx.Client(transport=httpx.MockTransport(handler))
+    )
+
+    def runs() -> Iterator[Any]:
+        yield {"input": "foo", "processor": "base", "mcp_servers": ({"name": "server", "url": "https://example.com"},)}
+        yield RawJSON(b'{"input":"bar","processor":"base"}')
+
+    client.task_group.add_runs(
+        "tgrp_1", inputs=runs(), default_task_spec={"output_schema": "text"}, extra_body={"foo": 1}
+    )
+
+    assert requests[0].headers["transfer-encoding"] == "chunked"
+    assert json.loads(requests[0].content) == {
+        "inputs": [
+            {"input": "foo", "processor": "base", "mcp_servers": [{"name": "server", "url": "https://example.com"}]},
+            {"input": "bar", "processor": "base"},
+        ],
+        "default_task_spec": {"output_schema": "text"},
+        "foo": 1,
+    }
+
+    # the body can't be sent again, so the request isn't retried
+    with pytest.raises(InternalServerError):
+        client.task_group.add_runs("tgrp_1", inputs=runs())
+    assert len(requests) == 2
+
+
+async def test_async_add_runs_streams_async_iterators() -> None:
+    requests: List[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        requests.append(request)
+        return httpx.Response(200, json=RUN_RESPONSE)
+
+    client = AsyncParallel(
+        base_url=base_url, api_key=api_key, http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+    async def runs() -> AsyncIterator[Any]:
+        for i in range(3):
+            yield {"input": f"run {i}", "processor": "base"}
+
+    await client.task_group.add_runs("tgrp_1", inputs=runs())
+    await client.task_group.add_runs("tgrp_1", inputs=iter([{"input": "run 3", "processor": "base"}]))
+
+    assert [json.loads(request.content) for request in requests] == [
+        {"inputs": [{"input": f"run {i}", "processor": "base"} for i in range(3)]},
+        {"inputs": [{"input": "run 3", "processor": "base"}]},
+    ]
@@ -0,0 +1,185 @@
+import os
+import json
+from typing import Any, Set, Dict, List, Callable, Iterable, Optional, AsyncIterator
+
+import anyio
+import httpx
+import pytest
+
+from parallel import AsyncParallel, NotFoundError, AuthenticationError
+from parallel.lib._run_watcher import AsyncRunWatcher, RunWatcherEvent
+
+base_url = os.environ.get("TEST_API_BASE_URL", "http://127.0.0.1:4010")
+
+
+def _run(run_id: str, status: str) -> Dict[str, Any]:
+    return {
+        "run_id": run_id,
+        "interaction_id": "int_1",
+        "status": status,
+        "is_active": status in ("queued", "running"),
+        "processor": "base",
+    }
+
+
+class FakeRuns:
+    """Serves task runs that keep running until the test finishes them with `finish()`."""
+
+    def __init__(
+        self, run_ids: Iterable[str], *, finished: Iterable[str] = (), poll_errors: Dict[str, List[int]] = {}
+    ) -> None:
+        self.run_ids = list(run_ids)
+        self.finished: Set[str] = set(finished)
+        # the status codes the next polls of a run fail with
+        self.poll_errors = {run_id: list(codes) for run_id, codes in poll_errors.items()}
+        self.watcher: Optional[AsyncRunWatcher] = None
+        self.max_open_streams = 0
+        self.streams_opened: List[str] = []
+        self.polls: List[str] = []
+        # created on first use, as they're bound to the running event loop
+        self._changed: Optional[anyio.Event] = None
+
+    def status(self, run_id: str) -> str:
+        return "completed" if run_id in self.finished else "running"
+
+    def finish(self, run_id: str) -> None:
+        self.finished.add(run_id)
+        self._notify()
+
+    async def wait_until(self, predicate: Callable[[], bool]) -> None:
+        """Waits until `predicate` holds, checking it again after every request and finished run."""
+        while not predicate():
+            if self._changed is None:
+                self._changed = anyio.Event()
+            await self._changed.wait()
+
+    def _notify(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    async def events(self, run_id: str) -> AsyncIterator[bytes]:
+        progress = {"type": "task_run.progress_msg.plan", "message": f"planning {run_id}"}
+        yield f"event: task_run.progress_msg.plan\ndata: {json.dumps(progress)}\n\n".encode()
+        await self.wait_until(lambda: run_id in self.finished)
+        state = {"type": "task_run.state", "run": _run(run_id, "completed")}
+        yield f"event: task_run.state\ndata: {json.dumps(state)}\n\n".encode()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        run_id = request.url.path.split("/")[4]
+        if request.url.path.endswith("/events"):
+            self.streams_opened.append(run_id)
+            if self.watcher is not None:
+                self.max_open_streams = max(self.max_open_streams, self.watcher.open_streams)
+            response = httpx.Response(200, headers={"content-type": "text/event-stream"}, content=self.events(run_id))
+        else:
+            self.polls.append(run_id)
+            errors = self.poll_errors.get(run_id)
+            if errors:
+                response = httpx.Response(errors.pop(0), json={"error": {"message": f"failed to poll {run_id}"}})
+            else:
+                response = httpx.Response(200, json=_run(run_id, self.status(run_id)))
+        self._notify()
+        return response
+
+
+def _client(runs: FakeRuns) -> AsyncParallel:
+    return AsyncParallel(
+        base_url=base_url,
+        api_key="My API Key",
+        # so that failed polls reach the watcher straight away
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(runs.handler)),
+    )
+
+
+async def test_run_watcher_merges_streams_and_polling() -> None:
+    run_ids = [f"trun_{i}" for i in range(6)]
+    runs = FakeRuns(run_ids)
+
+    async def finish_runs() -> None:
+        # streams are handed on to waiting runs, and the rest are polled in the meantime
+        await runs.wait_until(lambda: set(runs.streams_opened) == set(run_ids) and len(runs.polls) > 0)
+        for run_id in run_ids:
+            runs.finish(run_id)
+
+    events: List[RunWatcherEvent] = []
+    with anyio.fail_after(10):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(finish_runs)
+            async with AsyncRunWatcher(
+                _client(runs), run_ids, max_streams=2, stream_slice=0.02, poll_interval=0.01
+            ) as watcher:
+                runs.watcher = watcher
+                async for item in watcher:
+                    events.append(item)
+                    assert watcher.open_streams <= 2
+
+    finished = [item for item in events if item.event.type == "task_run.state"]
+    assert sorted(item.run_id for item in finished) == run_ids
+    assert all(not item.event.run.is_active for item in finished)  # type: ignore[union-attr]
+    assert watcher.active_runs == 0
+
+    assert runs.max_open_streams <= 2
+    assert any(item.event.type == "task_run.progress_msg.plan" for item in events)
+
+
+async def test_run_watcher_polls_only() -> None:
+    runs = FakeRuns(["trun_1", "trun_2"], finished=["trun_1"])
+
+    async def finish_runs() -> None:
+        # trun_2 only finishes after it was seen running alongside the finished trun_1
+        await runs.wait_until(lambda: "trun_1" in runs.polls and "trun_2" in runs.polls)
+        runs.finish("trun_2")
+
+    with anyio.fail_after(10):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(finish_runs)
+            async with AsyncRunWatcher(
+                _client(runs), ["trun_1", "trun_2"], max_streams=0, poll_interval=0.01
+            ) as watcher:
+                events = [item async for item in watcher]
+
+    assert [(item.run_id, item.source) for item in events] == [("trun_1", "poll"), ("trun_2", "poll")]
+    assert runs.streams_opened == []
+
+
+async def test_run_watcher_without_runs() -> None:
+    runs = FakeRuns([])
+    async with AsyncRunWatcher(_client(runs)) as watcher:
+        assert [item async for item in watcher] == []
+
+
+async def test_run_watcher_reports_unknown_runs() -> None:
+    runs = FakeRuns(["trun_1", "trun_2"], finished=["trun_2"], poll_errors={"trun_1": [404]})
+
+    with anyio.fail_after(10):
+        async with AsyncRunWatcher(_client(runs), ["trun_1", "trun_2"], max_streams=0, poll_interval=0.01) as watcher:
+            events = {item.run_id: item async for item in watcher}
+
+    # the unknown run is reported on its own, without ending the watcher for the other runs
+    assert isinstance(events["trun_1"].error, NotFoundError)
+    assert events["trun_1"].event is None
+    assert events["trun_2"].error is None
+    assert events["trun_2"].event is not None and events["trun_2"].event.type == "task_run.state"
+
+
+async def test_run_watcher_retries_transient_poll_errors() -> None:
+    runs = FakeRuns(["trun_1"], finished=["trun_1"], poll_errors={"trun_1": [503, 429]})
+
+    with anyio.fail_after(10):
+        async with AsyncRunWatcher(_client(runs), ["trun_1"], max_streams=0, poll_interval=0.01) as watcher:
+            events = [item async for item in watcher]
+
+    assert [(item.run_id, item.error) for item in events] == [("trun_1", None)]
+    assert runs.polls == ["trun_1"] * 3
+
+
+async def test_run_watcher_raises_authentication_errors() -> None:
+    runs = FakeRuns(["trun_1", "trun_2"], poll_errors={"trun_1": [401]})
+
+    with anyio.fail_after(10):
+        with pytest.raises(AuthenticationError):
+            async with AsyncRunWatcher(_client(runs), ["trun_1", "trun_2"], max_streams=0) as watcher:
+                async for _ in watcher:
+                    pass
@@ -0,0 +1,83 @@
+import time
+import threading
+from typing import List
+
+import anyio
+
+from parallel.lib._single_flight import SingleFlight, AsyncSingleFlight
+
+
+def test_single_flight_shares_result() -> None:
+    single_flight = SingleFlight()
+    calls: List[int] = []
+    results: List[int] = []
+
+    def fn() -> int:
+        calls.append(1)
+        time.sleep(0.1)
+        return len(calls)
+
+    threads = [threading.Thread(target=lambda: results.append(single_flight.do("key", fn))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == [1, 1, 1, 1]
+
+    # the key is released once the call has finished
+    assert single_flight.do("key", fn) == 2
+
+
+async def test_async_single_flight_shares_error() -> None:
+    single_flight = AsyncSingleFlight()
+    calls: List[int] = []
+
+    async def fn() -> int:
+        calls.append(1)
+        await anyio.sleep(0.1)
+        raise ValueError("boom")
+
+    errors: List[Exception] = []
+
+    async def call() -> None:
+        try:
+            await single_flight.do("key", fn)
+        except ValueError as err:
+            errors.append(err)
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(3):
+            tg.start_soon(call)
+
+    assert calls == [1]
+    assert len(errors) == 3
+
+
+async def test_async_single_flight_leader_cancelled() -> None:
+    single_flight = AsyncSingleFlight()
+    calls: List[int] = []
+
+    async def fn() -> int:
+        calls.append(1)
+        await anyio.sleep(0.1)
+        return len(calls)
+
+    async def leader() -> None:
+        with anyio.move_on_after(0.05):
+            await single_flight.do("key", fn)
+
+    results: List[int] = []
+
+    async def follower() -> None:
+        results.append(await single_flight.do("key", fn))
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(leader)
+        await anyio.sleep(0.01)
+        tg.start_soon(follower)
+
+    # the follower isn't cancelled along with the leader but makes the call itself
+    assert calls == [1, 1]
+    assert results == [2]
@@ -6,6 +6,7 @@ import gc
 import os
 import sys
 import json
+import time
 import asyncio
 import inspect
 import dataclasses
@@ -13,17 +14,33 @@ import tracemalloc
 from typing import Any, Union, TypeVar, Callable, Iterable, Iterator, Optional, Coroutine, cast
 from unittest import mock
 from typing_extensions import Literal, AsyncIterator, override
+from concurrent.futures import ThreadPoolExecutor
 
 import httpx
 import pytest
 from respx import MockRouter
 from pydantic import ValidationError
 
-from parallel import Parallel, AsyncParallel, APIResponseValidationError
+from parallel import (
+    Parallel,
+    RateLimiter,
+    AsyncParallel,
+    HedgingPolicy,
+    ResponseCache,
+    AdaptiveConcurrencyLimiter,
+    APIResponseValidationError,
+)
 from parallel._types import Omit
 from parallel._utils import asyncify
 from parallel._models import BaseModel, FinalRequestOptions
-from parallel._exceptions import ParallelError, APIStatusError, APITimeoutError, APIResponseValidationError
+from parallel._constants import DEFAULT_CONNECTION_LIMITS
+from parallel._exceptions import (
+    ParallelError,
+    APIStatusError,
+    APITimeoutError,
+    APIConnectionError,
+    APIResponseValidationError,
+)
 from parallel._base_client import (
     DEFAULT_TIMEOUT,
     HTTPX_DEFAULT_TIMEOUT,
@@ -365,6 +382,55 @@ class TestParallel:
 
             client.close()
 
+    def test_http2_option(self) -> None:
+        with pytest.raises(ValueError, match="can't be used together with a custom `http_client`"):
+            with httpx.Client() as http_client:
+                Parallel(base_url=base_url, api_key=api_key, http2=True, http_client=http_client)
+
+        with mock.patch.dict(sys.modules, {"h2": None}):
+            with pytest.raises(RuntimeError, match="`http2` extra"):
+                Parallel(base_url=base_url, api_key=api_key, http2=True)
+
+        pytest.importorskip("h2")
+        client = Parallel(
+            base_url=base_url, api_key=api_key, http2=True, connection_limits=httpx.Limits(max_connections=5)
+        )
+        pool = cast(Any, client._client._transport)._pool
+        assert pool._http2 is True
+        assert pool._max_connections == 5
+
+        # the connection pool is shared with copies, unless it is reconfigured
+        assert client.with_options(max_retries=0)._client is client._client
+        copy = client.with_options(http2=False)
+        assert cast(Any, copy._client._transport)._pool._http2 is False
+        client.close()
+        copy.close()
+
+    def test_copy_keeps_connection_pool_options(self) -> None:
+        pytest.importorskip("h2")
+        client = Parallel(base_url=base_url, api_key=api_key, http2=True)
+        copy = client.with_options(connection_limits=httpx.Limits(max_connections=5))
+        pool = cast(Any, copy._client._transport)._pool
+        assert pool._http2 is True
+        assert pool._max_connections == 5
+
+        # a copy that shares the pool still knows its options, for its own copies
+        shared = copy.with_options(max_retries=0)
+        assert shared._client is copy._client
+        third = shared.with_options(http2=False)
+        pool = cast(Any, third._client._transport)._pool
+        assert pool._http2 is False
+        assert pool._max_connections == 5
+
+        limited = Parallel(base_url=base_url, api_key=api_key, connection_limits=httpx.Limits(max_connections=5))
+        assert limited.with_options(http2=False)._client is limited._client
+        pool = cast(Any, limited.with_options(http2=True)._client._transport)._pool
+        assert pool._http2 is True
+        assert pool._max_connections == 5
+
+        for c in (client, copy, third, limited):
+            c.close()
+
     async def test_invalid_http_client(self) -> None:
         with pytest.raises(TypeError, match="Invalid `http_client` arg"):
             async with httpx.AsyncClient() as http_client:
@@ -1037,6 +1103,312 @@ class TestParallel:
         assert exc_info.value.response.status_code == 302
         assert exc_info.value.response.headers["Location"] == f"{base_url}/redirected"
 
+    @pytest.mark.respx(base_url=base_url)
+    def test_rate_limiter_pauses_endpoint_on_429(self, respx_mock: MockRouter) -> None:
+        limiter = RateLimiter()
+        client = Parallel(base_url=base_url, api_key=api_key, rate_limiter=limiter, max_retries=1)
+
+        respx_mock.post("/v1/search").mock(
+            side_effect=[
+                httpx.Response(429, headers={"retry-after-ms": "300"}),
+                httpx.Response(200, json={}),
+            ]
+        )
+
+        start = time.monotonic()
+        response = client.post("/v1/search", body={}, cast_to=httpx.Response)
+        assert response.status_code == 200
+        assert time.monotonic() - start >= 0.3
+
+        # the pause is over, so the next request goes through straight away
+        assert limiter._bucket_for("/v1/search").pause_remaining() == 0
+        assert client.with_options(max_retries=0)._rate_limiter is limiter
+
+    def test_hedging_uses_first_response(self) -> None:
+        calls: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.content.decode())
+            if len(calls) == 1:
+                time.sleep(0.5)
+                return httpx.Response(200, json={"winner": "primary"})
+            return httpx.Response(200, json={"winner": "hedge"})
+
+        hedging = HedgingPolicy(min_samples=1, max_hedge_ratio=1)
+        hedging.record_latency("/v1/search", 0.05)
+        client = Parallel(
+            base_url=base_url,
+            api_key=api_key,
+            hedging=hedging,
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+        start = time.monotonic()
+        response = client.post("/v1/search", body={"objective": "foo", "mode": "fast"}, cast_to=httpx.Response)
+        assert time.monotonic() - start < 0.4
+
+        assert response.json() == {"winner": "hedge"}
+        assert calls == ['{"objective":"foo","mode":"fast"}', '{"objective":"foo","mode":"fast"}']
+        assert hedging.hedges == 1
+
+        # other endpoints, and searches in the slower modes, are never hedged
+        calls.clear()
+        client.post("/v1/tasks/runs", body={}, cast_to=httpx.Response, options={"timeout": 5})
+        client.post("/v1/search", body={"objective": "foo", "mode": "advanced"}, cast_to=httpx.Response)
+        assert len(calls) == 2
+        assert hedging.hedges == 1
+
+    def test_hedging_goes_through_rate_limiter(self) -> None:
+        calls: list[float] = []
+
+        def handler(_request: httpx.Request) -> httpx.Response:
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                time.sleep(0.5)
+            return httpx.Response(200, json={})
+
+        hedging = HedgingPolicy(min_samples=1, max_hedge_ratio=1)
+        hedging.record_latency("/v1/search", 0.01)
+        # the burst of 1 is spent on the original request, so the hedge has to wait for a token
+        client = Parallel(
+            base_url=base_url,
+            api_key=api_key,
+            hedging=hedging,
+            rate_limiter=RateLimiter({"/v1/search": 5}, burst=1),
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+        client.post("/v1/search", body={"mode": "turbo"}, cast_to=httpx.Response)
+        assert hedging.hedges == 1
+        assert len(calls) == 2
+        assert calls[1] - calls[0] >= 0.15
+
+    def test_total_timeout_bounds_hedge_rate_limiter_wait(self) -> None:
+        calls: list[float] = []
+
+        def handler(_request: httpx.Request) -> httpx.Response:
+            calls.append(time.monotonic())
+            time.sleep(0.3)
+            return httpx.Response(200, json={})
+
+        hedging = HedgingPolicy(min_samples=1, max_hedge_ratio=1)
+        hedging.record_latency("/v1/search", 0.01)
+        # the next token only comes after 5 seconds, well past the total timeout
+        client = Parallel(
+            base_url=base_url,
+            api_key=api_key,
+            hedging=hedging,
+            total_timeout=2,
+            rate_limiter=RateLimiter({"/v1/search": 0.2}, burst=1),
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+        client.post("/v1/search", body={"mode": "turbo"}, cast_to=httpx.Response)
+        assert len(calls) == 1
+        # the skipped hedge gave its thread back instead of waiting for a token
+        slots = client._hedging_threads._slots
+        assert all(slots.acquire(blocking=False) for _ in range(client._hedging_threads._max_threads))
+
+    def test_coalesce_requests(self) -> None:
+        calls: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            time.sleep(0.2)
+            return httpx.Response(200, json={"foo": "bar"})
+
+        client = Parallel(
+            base_url=base_url,
+            api_key=api_key,
+            coalesce_requests=True,
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(client.get, "/v1/tasks/runs/run_1", cast_to=object) for _ in range(4)]
+            results = [future.result() for future in futures]
+
+        assert calls == ["/v1/tasks/runs/run_1"]
+        assert results == [{"foo": "bar"}] * 4
+
+        # writes are never merged
+        calls.clear()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(client.post, "/v1/tasks/runs", body={}, cast_to=object) for _ in range(2)]
+            for future in futures:
+                future.result()
+        assert len(calls) == 2
+
+        assert client.with_options(max_retries=0)._single_flight is client._single_flight
+        assert client.with_options(coalesce_requests=False)._single_flight is None
+
+        # copies share their in-flight requests, but only merge requests sent with the same options
+        calls.clear()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(client.get, "/v1/tasks/runs/run_1", cast_to=object),
+                executor.submit(client.with_options(timeout=30).get, "/v1/tasks/runs/run_1", cast_to=object),
+                executor.submit(client.with_options(max_retries=0).get, "/v1/tasks/runs/run_1", cast_to=object),
+                executor.submit(client.with_options(max_retries=0).get, "/v1/tasks/runs/run_1", cast_to=object),
+            ]
+            for future in futures:
+                future.result()
+        assert len(calls) == 3
+
+    @pytest.mark.respx(base_url=base_url)
+    def test_response_cache(self, respx_mock: MockRouter) -> None:
+        cache = ResponseCache()
+        client = Parallel(base_url=base_url, api_key=api_key, response_cache=cache)
+
+        route = respx_mock.post("/v1/search").mock(return_value=httpx.Response(200, json={"foo": "bar"}))
+
+        assert client.post("/v1/search", body={"objective": "foo"}, cast_to=object) == {"foo": "bar"}
+        assert client.post("/v1/search", body={"objective": "foo"}, cast_to=object) == {"foo": "bar"}
+        assert route.call_count == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        client.post(
+            "/v1/search", body={"objective": "foo"}, cast_to=object, options={"headers": {"Cache-Control": "no-cache"}}
+        )
+        assert route.call_count == 2
+        assert client.with_options(max_retries=0)._response_cache is cache
+
+    @mock.patch("parallel._base_client.BaseClient._calculate_retry_timeout", lambda *_args, **_kwargs: 0.3)
+    @pytest.mark.respx(base_url=base_url)
+    def test_total_timeout(self, respx_mock: MockRouter) -> None:
+        client = Parallel(base_url=base_url, api_key=api_key, timeout=30, total_timeout=0.5, max_retries=5)
+
+        route = respx_mock.post("/v1/search").mock(return_value=httpx.Response(500))
+
+        start = time.monotonic()
+        with pytest.raises(APIStatusError):
+            client.post("/v1/search", body={}, cast_to=httpx.Response)
+        assert time.monotonic() - start < 0.5
+
+        # the second retry can't finish before the deadline, so it isn't attempted
+        assert route.call_count == 2
+        first, second = (float(call.request.headers["x-stainless-read-timeout"]) for call in route.calls)
+        assert first <= 0.5
+        assert second <= 0.2
+
+        # overridden per request
+        route.reset()
+        with pytest.raises(APIStatusError):
+            client.post("/v1/search", body={}, cast_to=httpx.Response, options={"total_timeout": 10})
+        assert route.call_count == 6
+        assert client.with_options(max_retries=0).total_timeout == 0.5
+
+    def test_total_timeout_bounds_rate_limiter_wait(self) -> None:
+        calls: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200)
+
+        limiter = RateLimiter()
+        limiter.pause("/v1/search", 10)
+        client = Parallel(
+            base_url=base_url,
+            api_key=api_key,
+            total_timeout=0.5,
+            rate_limiter=limiter,
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+        start = time.monotonic()
+        with pytest.raises(APITimeoutError):
+            client.post("/v1/search", body={}, cast_to=httpx.Response)
+        assert time.monotonic() - start < 0.5
+        assert calls == []
+
+    @mock.patch("parallel._base_client.BaseClient._calculate_retry_timeout", lambda *_args, **_kwargs: 0.2)
+    def test_retried_response_is_closed_before_sleeping(self) -> None:
+        events: list[tuple[str, float]] = []
+
+        class Body(httpx.SyncByteStream):
+            def __iter__(self) -> Iterator[bytes]:
+                yield b"{}"
+
+            def close(self) -> None:
+                events.append(("closed", time.monotonic()))
+
+        def handler(_request: httpx.Request) -> httpx.Response:
+            events.append(("request", time.monotonic()))
+            if len(events) == 1:
+                return httpx.Response(503, stream=Body())
+            return httpx.Response(200, json={})
+
+        client = Parallel(
+            base_url=base_url, api_key=api_key, http_client=httpx.Client(transport=httpx.MockTransport(handler))
+        )
+        client.post("/v1/search", body={}, cast_to=httpx.Response)
+
+        assert [name for name, _ in events] == ["request", "closed", "request"]
+        assert events[2][1] - events[1][1] >= 0.15
+
+    @pytest.mark.respx(base_url=base_url)
+    def test_warmup(self, respx_mock: MockRouter) -> None:
+        client = Parallel(base_url=base_url, api_key=api_key)
+        route = respx_mock.head(base_url + "/").mock(return_value=httpx.Response(404))
+
+        assert client.warmup(n_connections=3) >= 0
+        assert route.call_count == 3
+
+        # capped at the number of connections the pool keeps alive
+        route.reset()
+        client.warmup(n_connections=1000)
+        assert route.call_count == DEFAULT_CONNECTION_LIMITS.max_keepalive_connections
+
+        route.reset()
+        limited = client.copy(connection_limits=httpx.Limits(max_connections=10, max_keepalive_connections=5))
+        limited.warmup(n_connections=1000)
+        assert route.call_count == 5
+
+        respx_mock.head(base_url + "/").mock(side_effect=httpx.ConnectError("refused"))
+        with pytest.raises(APIConnectionError):
+            client.warmup()
+
+    def test_build_request_reuses_static_parts(self) -> None:
+        client = Parallel(base_url=base_url, api_key=api_key, default_headers={"X-Foo": "bar"})
+        options = FinalRequestOptions(method="post", url="/v1/search", json_data={})
+
+        first = client._build_request(options)
+        second = client._build_request(options)
+        assert first.headers == second.headers
+        assert first.headers["X-Foo"] == "bar"
+        assert client._prepare_url("/v1/search") is client._prepare_url("/v1/search")
+
+        # the cached parts follow changes to the client
+        client.api_key = "other key"
+        client.base_url = "https://example.com/other"  # type: ignore[assignment]
+        request = client._build_request(options)
+        assert request.headers["x-api-key"] == "other key"
+        assert str(request.url) == "https://example.com/other/v1/search"
+
+        request = client._build_request(
+            FinalRequestOptions(method="post", url="/v1/search", headers={"X-Foo": Omit(), "X-Bar": "baz"})
+        )
+        assert "X-Foo" not in request.headers
+        assert request.headers["X-Bar"] == "baz"
+
+    def test_request_overhead(self) -> None:
+        # per-call work of a small request that should only be done once per client
+        body = json.dumps({"search_id": "search_1", "results": []}).encode()
+        transport = httpx.MockTransport(
+            lambda _request: httpx.Response(200, content=body, headers={"content-type": "application/json"})
+        )
+        client = Parallel(base_url=base_url, api_key=api_key, http_client=httpx.Client(transport=transport))
+        default_headers = client.default_headers
+
+        with mock.patch.object(
+            Parallel, "default_headers", new_callable=mock.PropertyMock, return_value=default_headers
+        ) as default_headers_property:
+            for _ in range(200):
+                client.post("/v1beta/search", body={"objective": "foo"}, cast_to=object)
+
+        # the default headers are only built once per client
+        assert default_headers_property.call_count == 1
+
 
 class TestAsyncParallel:
     @pytest.mark.respx(base_url=base_url)
@@ -1294,6 +1666,40 @@ class TestAsyncParallel:
 
             await client.close()
 
+    async def test_http2_option(self) -> None:
+        with pytest.raises(ValueError, match="can't be used together with a custom `http_client`"):
+            async with httpx.AsyncClient() as http_client:
+                AsyncParallel(
+                    base_url=base_url, api_key=api_key, connection_limits=httpx.Limits(), http_client=http_client
+                )
+
+        pytest.importorskip("h2")
+        client = AsyncParallel(
+            base_url=base_url, api_key=api_key, http2=True, connection_limits=httpx.Limits(max_connections=5)
+        )
+        pool = cast(Any, client._client._transport)._pool
+        assert pool._http2 is True
+        assert pool._max_connections == 5
+        await client.close()
+
+    async def test_copy_keeps_connection_pool_options(self) -> None:
+        pytest.importorskip("h2")
+        client = AsyncParallel(base_url=base_url, api_key=api_key, http2=True)
+        copy = client.with_options(connection_limits=httpx.Limits(max_connections=5))
+        pool = cast(Any, copy._client._transport)._pool
+        assert pool._http2 is True
+        assert pool._max_connections == 5
+
+        limited = AsyncParallel(base_url=base_url, api_key=api_key, connection_limits=httpx.Limits(max_connections=5))
+        assert limited.with_options(http2=False)._client is limited._client
+        other = limited.with_options(http2=True)
+        pool = cast(Any, other._client._transport)._pool
+        assert pool._http2 is True
+        assert pool._max_connections == 5
+
+        for c in (client, copy, limited, other):
+            await c.close()
+
     def test_invalid_http_client(self) -> None:
         with pytest.raises(TypeError, match="Invalid `http_client` arg"):
             with httpx.Client() as http_client:
@@ -1990,3 +2396,224 @@ class TestAsyncParallel:
 
         assert exc_info.value.response.status_code == 302
         assert exc_info.value.response.headers["Location"] == f"{base_url}/redirected"
+
+    @pytest.mark.respx(base_url=base_url)
+    async def test_rate_limiter_pauses_endpoint_on_429(self, respx_mock: MockRouter) -> None:
+        limiter = RateLimiter()
+        client = AsyncParallel(base_url=base_url, api_key=api_key, rate_limiter=limiter, max_retries=1)
+
+        respx_mock.post("/v1/search").mock(
+            side_effect=[
+                httpx.Response(429, headers={"retry-after-ms": "300"}),
+                httpx.Response(200, json={}),
+            ]
+        )
+
+        start = time.monotonic()
+        response = await client.post("/v1/search", body={}, cast_to=httpx.Response)
+        assert response.status_code == 200
+        assert time.monotonic() - start >= 0.3
+
+        # the pause is over, so the next request goes through straight away
+        assert limiter._bucket_for("/v1/search").pause_remaining() == 0
+        assert client.with_options(max_retries=0)._rate_limiter is limiter
+
+    @mock.patch("parallel._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+    @pytest.mark.respx(base_url=base_url)
+    async def test_concurrency_limiter_adapts_to_overload(self, respx_mock: MockRouter) -> None:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        client = AsyncParallel(base_url=base_url, api_key=api_key, concurrency_limiter=limiter, max_retries=1)
+
+        respx_mock.post("/v1/search").mock(side_effect=[httpx.Response(503), httpx.Response(200, json={})])
+
+        response = await client.post("/v1/search", body={}, cast_to=httpx.Response)
+        assert response.status_code == 200
+
+        # halved by the 503, then raised by 1/limit by the success
+        assert limiter.limit == 2
+        assert limiter.in_flight == 0
+        assert client.with_options(max_retries=0)._concurrency_limiter is limiter
+
+    async def test_hedging_uses_first_response(self) -> None:
+        calls: list[str] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.content.decode())
+            if len(calls) == 1:
+                await asyncio.sleep(0.5)
+                return httpx.Response(200, json={"winner": "primary"})
+            return httpx.Response(200, json={"winner": "hedge"})
+
+        hedging = HedgingPolicy(min_samples=1, max_hedge_ratio=1)
+        hedging.record_latency("/v1/search", 0.05)
+        client = AsyncParallel(
+            base_url=base_url,
+            api_key=api_key,
+            hedging=hedging,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+        start = time.monotonic()
+        response = await client.post("/v1/search", body={"objective": "foo", "mode": "fast"}, cast_to=httpx.Response)
+        assert time.monotonic() - start < 0.4
+
+        assert response.json() == {"winner": "hedge"}
+        assert calls == ['{"objective":"foo","mode":"fast"}', '{"objective":"foo","mode":"fast"}']
+        assert hedging.hedges == 1
+
+        # the hedge budget is spent, so the next slow request is not hedged
+        hedging.max_hedge_ratio = 0.5
+        calls.clear()
+        response = await client.post("/v1/search", body={"objective": "foo", "mode": "fast"}, cast_to=httpx.Response)
+        assert response.json() == {"winner": "primary"}
+        assert len(calls) == 1
+
+    async def test_hedging_goes_through_concurrency_limiter(self) -> None:
+        in_flight: list[int] = []
+
+        async def handler(_request: httpx.Request) -> httpx.Response:
+            in_flight.append(limiter.in_flight)
+            if len(in_flight) == 1:
+                await asyncio.sleep(0.5)
+            return httpx.Response(200, json={})
+
+        hedging = HedgingPolicy(min_samples=1, max_hedge_ratio=1)
+        hedging.record_latency("/v1/search", 0.01)
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=5)
+        client = AsyncParallel(
+            base_url=base_url,
+            api_key=api_key,
+            hedging=hedging,
+            concurrency_limiter=limiter,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+        await client.post("/v1/search", body={"mode": "turbo"}, cast_to=httpx.Response)
+        assert hedging.hedges == 1
+        # the hedge takes a slot of its own, and the cancelled original request gives its slot back
+        assert in_flight == [1, 2]
+        assert limiter.in_flight == 0
+
+    async def test_total_timeout_bounds_hedge_rate_limiter_wait(self) -> None:
+        calls: list[float] = []
+
+        async def handler(_request: httpx.Request) -> httpx.Response:
+            calls.append(time.monotonic())
+            await asyncio.sleep(0.3)
+            raise httpx.ConnectError("boom")
+
+        hedging = HedgingPolicy(min_samples=1, max_hedge_ratio=1)
+        hedging.record_latency("/v1/search", 0.01)
+        # the next token only comes after 5 seconds, well past the total timeout
+        client = AsyncParallel(
+            base_url=base_url,
+            api_key=api_key,
+            hedging=hedging,
+            max_retries=0,
+            total_timeout=2,
+            rate_limiter=RateLimiter({"/v1/search": 0.2}, burst=1),
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+        # the failed original request isn't held up by a hedge that is waiting for a token
+        start = time.monotonic()
+        with pytest.raises(APIConnectionError):
+            await client.post("/v1/search", body={"mode": "turbo"}, cast_to=httpx.Response)
+        assert time.monotonic() - start < 1
+        assert len(calls) == 1
+
+    async def test_coalesce_requests(self) -> None:
+        calls: list[str] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            await asyncio.sleep(0.2)
+            return httpx.Response(200, json={"foo": "bar"})
+
+        client = AsyncParallel(
+            base_url=base_url,
+            api_key=api_key,
+            coalesce_requests=True,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+        results = await asyncio.gather(*[client.get("/v1/tasks/runs/run_1", cast_to=object) for _ in range(4)])
+        assert calls == ["/v1/tasks/runs/run_1"]
+        assert results == [{"foo": "bar"}] * 4
+
+        # different query parameters are different requests
+        calls.clear()
+        await asyncio.gather(
+            client.get("/v1/tasks/runs/run_1", cast_to=object, options={"params": {"a": 1}}),
+            client.get("/v1/tasks/runs/run_1", cast_to=object, options={"params": {"a": 2}}),
+        )
+        assert len(calls) == 2
+
+        # copies share their in-flight requests, but only merge requests sent with the same options
+        calls.clear()
+        await asyncio.gather(
+            client.get("/v1/tasks/runs/run_1", cast_to=object),
+            client.with_options(max_retries=5).get("/v1/tasks/runs/run_1", cast_to=object),
+            client.with_options(max_retries=5).get("/v1/tasks/runs/run_1", cast_to=object),
+            client.get("/v1/tasks/runs/run_1", cast_to=object, options={"timeout": 5}),
+            client.with_options(api_key="other key").get("/v1/tasks/runs/run_1", cast_to=object),
+        )
+        assert len(calls) == 4
+
+    @pytest.mark.respx(base_url=base_url)
+    async def test_response_cache(self, respx_mock: MockRouter) -> None:
+        cache = ResponseCache()
+        client = AsyncParallel(base_url=base_url, api_key=api_key, response_cache=cache)
+
+        route = respx_mock.post("/v1/extract").mock(return_value=httpx.Response(200, json={"foo": "bar"}))
+
+        assert await client.post("/v1/extract", body={"urls": ["a"]}, cast_to=object) == {"foo": "bar"}
+        assert await client.post("/v1/extract", body={"urls": ["a"]}, cast_to=object) == {"foo": "bar"}
+        assert await client.post("/v1/extract", body={"urls": ["b"]}, cast_to=object) == {"foo": "bar"}
+        assert route.call_count == 2
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    @mock.patch("parallel._base_client.BaseClient._calculate_retry_timeout", lambda *_args, **_kwargs: 0.3)
+    @pytest.mark.respx(base_url=base_url)
+    async def test_total_timeout(self, respx_mock: MockRouter) -> None:
+        client = AsyncParallel(base_url=base_url, api_key=api_key, total_timeout=0.5, max_retries=5)
+
+        route = respx_mock.post("/v1/search").mock(
+            side_effect=[httpx.Response(503), httpx.ReadTimeout("timed out"), httpx.Response(200, json={})]
+        )
+
+        start = time.monotonic()
+        with pytest.raises(APITimeoutError):
+            await client.post("/v1/search", body={}, cast_to=httpx.Response)
+        assert time.monotonic() - start < 0.5
+
+        assert route.call_count == 2
+        assert float(route.calls[1].request.headers["x-stainless-read-timeout"]) <= 0.2
+
+    async def test_total_timeout_bounds_rate_limiter_wait(self) -> None:
+        limiter = RateLimiter()
+        limiter.pause("/v1/search", 10)
+        client = AsyncParallel(
+            base_url=base_url,
+            api_key=api_key,
+            total_timeout=0.5,
+            rate_limiter=limiter,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(lambda _request: httpx.Response(200))),
+        )
+
+        start = time.monotonic()
+        with pytest.raises(APITimeoutError):
+            await client.post("/v1/search", body={}, cast_to=httpx.Response)
+        assert time.monotonic() - start < 0.5
+
+    @pytest.mark.respx(base_url=base_url)
+    async def test_warmup(self, respx_mock: MockRouter) -> None:
+        client = AsyncParallel(base_url=base_url, api_key=api_key)
+        route = respx_mock.head(base_url + "/").mock(return_value=httpx.Response(404))
+
+        assert await client.warmup(n_connections=3) >= 0
+        assert route.call_count == 3
+
+        respx_mock.head(base_url + "/").mock(side_effect=httpx.ConnectTimeout("timed out"))
+        with pytest.raises(APITimeoutError):
+            await client.warmup(n_connections=2)
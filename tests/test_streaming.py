@@ -1,12 +1,43 @@
 from __future__ import annotations
 
-from typing import Iterator, AsyncIterator
+import gc
+import os
+import json
+import asyncio
+from typing import Any, Callable, Iterator, AsyncIterator
 
+import anyio
 import httpx
 import pytest
 
-from parallel import Parallel, AsyncParallel
-from parallel._streaming import Stream, AsyncStream, ServerSentEvent
+from parallel import (
+    Parallel,
+    JSONCodec,
+    AsyncParallel,
+    NotFoundError,
+    APITimeoutError,
+    ResumableStream,
+    AsyncResumableStream,
+    _streaming,
+)
+from parallel._streaming import (
+    Stream,
+    SSEDecoder,
+    AsyncStream,
+    ServerSentEvent,
+    IncrementalSSEDecoder,
+    _AsyncPrefetcher,
+)
+from parallel._base_client import BaseClient
+
+base_url = os.environ.get("TEST_API_BASE_URL", "http://127.0.0.1:4010")
+api_key = "My API Key"
+
+
+@pytest.fixture(params=[SSEDecoder, IncrementalSSEDecoder], ids=["decoder", "incremental_decoder"], autouse=True)
+def sse_decoder(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    decoder_cls = request.param
+    monkeypatch.setattr(BaseClient, "_make_sse_decoder", lambda _self: decoder_cls())
 
 
 @pytest.mark.asyncio
@@ -216,6 +247,517 @@ async def test_multi_byte_character_multiple_chunks(
     assert sse.json() == {"content": "известни"}
 
 
+@pytest.mark.parametrize("sync", [True, False], ids=["sync", "async"])
+async def test_line_endings_split_across_chunks(sync: bool, client: Parallel, async_client: AsyncParallel) -> None:
+    def body() -> Iterator[bytes]:
+        yield b"event: ping\r"
+        yield b"\ndata: foo\r"
+        yield b"data: bar\r\n"
+        yield b"id: 1\r"
+        yield b"\r"
+        yield b"data: baz\r\n\r\n"
+
+    iterator = make_event_iterator(content=body(), sync=sync, client=client, async_client=async_client)
+
+    sse = await iter_next(iterator)
+    assert sse.event == "ping"
+    assert sse.data == "foo\nbar"
+    assert sse.id == "1"
+
+    sse = await iter_next(iterator)
+    assert sse.event is None
+    assert sse.data == "baz"
+    assert sse.id == "1"
+
+    await assert_empty_iter(iterator)
+
+
+@pytest.mark.parametrize("sync", [True, False], ids=["sync", "async"])
+async def test_comments_and_fields(sync: bool, client: Parallel, async_client: AsyncParallel) -> None:
+    def body() -> Iterator[bytes]:
+        yield b": keep-alive\n"
+        yield b"\n"
+        yield b"unknown: field\nretry: 1500\nid: a\x00b\ndata\n"
+        yield b"\n"
+        yield b"retry: soon\ndata:no-space\n\n"
+
+    iterator = make_event_iterator(content=body(), sync=sync, client=client, async_client=async_client)
+
+    sse = await iter_next(iterator)
+    assert sse.data == ""
+    assert sse.retry == 1500
+    assert sse.id is None
+
+    sse = await iter_next(iterator)
+    assert sse.data == "no-space"
+    assert sse.retry is None
+
+    await assert_empty_iter(iterator)
+
+
+@pytest.mark.parametrize("sync", [True, False], ids=["sync", "async"])
+async def test_large_event_many_chunks(sync: bool, client: Parallel, async_client: AsyncParallel) -> None:
+    content = "x" * 200_000
+    encoded = b'event: result\ndata: {"content":"' + content.encode() + b'"}\n\n'
+
+    def body() -> Iterator[bytes]:
+        for i in range(0, len(encoded), 1000):
+            yield encoded[i : i + 1000]
+
+    iterator = make_event_iterator(content=body(), sync=sync, client=client, async_client=async_client)
+
+    sse = await iter_next(iterator)
+    assert sse.event == "result"
+    assert sse.json() == {"content": content}
+
+    await assert_empty_iter(iterator)
+
+
+def test_incremental_decoder_matches_decoder_at_every_split() -> None:
+    body = (
+        b": comment\r\nevent: a\rdata: 1\ndata:  2\r\nid: x\n\n"
+        b"retry: 10\r\r"
+        b'data: {"content":"\xd0\xb8\xd0\xb7"}\r\n\r\n'
+        b"event\ndata\n\ndata: trailing"
+    )
+
+    def decode(decoder: SSEDecoder | IncrementalSSEDecoder, chunks: list[bytes]) -> list[tuple[object, ...]]:
+        return [(sse.event, sse.data, sse.id, sse.retry) for sse in decoder.iter_bytes(iter(chunks))]
+
+    expected = decode(SSEDecoder(), [body])
+    assert len(expected) == 4
+
+    for i in range(len(body) + 1):
+        chunks = [body[:i], body[i:]]
+        assert decode(IncrementalSSEDecoder(), chunks) == expected, f"split at {i}"
+    assert decode(IncrementalSSEDecoder(), [bytes([b]) for b in body]) == expected
+
+
+def _status_event(event_id: str) -> bytes:
+    return (
+        b'event: task_group_status\ndata: {"type":"task_group_status","event_id":"'
+        + event_id.encode()
+        + b'","status":{"num_task_runs":1,"task_run_status_counts":{},"is_active":true,"status_message":null,"modified_at":null}}\n\n'
+    )
+
+
+def _sse_response(
+    request: httpx.Request,
+    chunks: list[bytes],
+    *,
+    sync: bool,
+    drop: bool,
+    error: type[httpx.TransportError] | None = None,
+) -> httpx.Response:
+    def body() -> Iterator[bytes]:
+        yield from chunks
+        if error is not None:
+            raise error("timed out")
+        if drop:
+            raise httpx.RemoteProtocolError("peer closed connection without sending complete message body")
+
+    async def abody() -> AsyncIterator[bytes]:
+        for chunk in body():
+            yield chunk
+
+    return httpx.Response(
+        200,
+        headers={"content-type": "text/event-stream"},
+        content=body() if sync else abody(),
+        request=request,
+    )
+
+
+def _make_client(
+    handler: Callable[[httpx.Request], httpx.Response], *, sync: bool, stream_idle_timeout: float | None = None
+) -> Parallel | AsyncParallel:
+    transport = httpx.MockTransport(handler)
+    if sync:
+        return Parallel(
+            base_url=base_url,
+            api_key=api_key,
+            max_retries=2,
+            stream_idle_timeout=stream_idle_timeout,
+            http_client=httpx.Client(transport=transport),
+        )
+    return AsyncParallel(
+        base_url=base_url,
+        api_key=api_key,
+        max_retries=2,
+        stream_idle_timeout=stream_idle_timeout,
+        http_client=httpx.AsyncClient(transport=transport),
+    )
+
+
+async def _collect(stream: Stream[Any] | AsyncStream[Any]) -> list[Any]:
+    if isinstance(stream, AsyncStream):
+        return [event async for event in stream]
+    return list(stream)
+
+
+@pytest.mark.parametrize("sync", [True, False], ids=["sync", "async"])
+async def test_resumable_stream_reconnects_from_last_event(sync: bool) -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) == 1:
+            # the server asks to wait 0ms before reconnecting, the partial third event is discarded
+            return _sse_response(
+                request, [b"retry: 0\n", _status_event("1"), _status_event("2"), b"data: {"], sync=sync, drop=True
+            )
+        return _sse_response(request, [_status_event("3")], sync=sync, drop=False)
+
+    client = _make_client(handler, sync=sync)
+    stream = client.task_group.events("tgrp_123", api_timeout=60)
+    if not isinstance(stream, ResumableStream):
+        stream = await stream
+
+    events = await _collect(stream)
+
+    assert [event.event_id for event in events] == ["1", "2", "3"]
+    assert stream.last_event_id == "3"
+    assert len(requests) == 2
+    assert "last_event_id" not in requests[0].url.params
+    assert requests[1].url.params["last_event_id"] == "2"
+    assert requests[1].url.params["timeout"] == "60"
+
+
+@pytest.mark.parametrize("sync", [True, False], ids=["sync", "async"])
+async def test_resumable_stream_gives_up_after_max_retries(sync: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_streaming, "_reconnect_delay", lambda _failures, *, retry: 0)  # noqa: ARG005
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) == 1:
+            return _sse_response(request, [_status_event("1")], sync=sync, drop=True)
+        # reconnects that fail before producing an event count against max_retries
+        return _sse_response(request, [], sync=sync, drop=True)
+
+    client = _make_client(handler, sync=sync)
+    stream = client.task_group.events("tgrp_123")
+    if not isinstance(stream, ResumableStream):
+        stream = await stream
+
+    events: list[Any] = []
+    with pytest.raises(httpx.RemoteProtocolError):
+        if isinstance(stream, AsyncResumableStream):
+            async for event in stream:
+                events.append(event)
+        else:
+            for event in stream:
+                events.append(event)
+
+    assert [event.event_id for event in events] == ["1"]
+    assert len(requests) == 3
+    assert all(request.url.params["last_event_id"] == "1" for request in requests[1:])
+
+
+@pytest.mark.parametrize("sync", [True, False], ids=["sync", "async"])
+async def test_resumable_stream_raises_non_retryable_status(sync: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_streaming, "_reconnect_delay", lambda _failures, *, retry: 0)  # noqa: ARG005
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) == 1:
+            return _sse_response(request, [_status_event("1")], sync=sync, drop=True)
+        return httpx.Response(404, json={"error": {"message": "not found"}}, request=request)
+
+    client = _make_client(handler, sync=sync)
+    stream = client.task_group.events("tgrp_123")
+    if not isinstance(stream, ResumableStream):
+        stream = await stream
+
+    with pytest.raises(NotFoundError):
+        await _collect(stream)
+    assert len(requests) == 2
+
+
+@pytest.mark.parametrize("sync", [True, False], ids=["sync", "async"])
+async def test_stream_idle_timeout(sync: bool) -> None:
+    timeouts: dict[str, Any] = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts[request.url.path] = request.extensions["timeout"]
+        if request.url.path.endswith("/events"):
+            return _sse_response(request, [_status_event("1")], sync=sync, drop=False)
+        return httpx.Response(200, json={"taskgroup_id": "tgrp_123"}, request=request)
+
+    client = _make_client(handler, sync=sync, stream_idle_timeout=15)
+    stream = client.task_group.events("tgrp_123")
+    if not isinstance(stream, ResumableStream):
+        stream = await stream
+    await _collect(stream)
+    if isinstance(client, AsyncParallel):
+        await client.task_group.retrieve("tgrp_123")
+        await client.with_options(stream_idle_timeout=None).task_group.events("tgrp_456")
+        await client.with_options(stream_idle_timeout=5000).task_group.events("tgrp_789")
+    else:
+        client.task_group.retrieve("tgrp_123")
+        client.with_options(stream_idle_timeout=None).task_group.events("tgrp_456")
+        client.with_options(stream_idle_timeout=5000).task_group.events("tgrp_789")
+
+    # only the read timeout of streams is shortened, and never lengthened
+    assert timeouts["/v1/tasks/groups/tgrp_123/events"]["read"] == 15
+    assert timeouts["/v1/tasks/groups/tgrp_123/events"]["connect"] == timeouts["/v1/tasks/groups/tgrp_123"]["connect"]
+    assert timeouts["/v1/tasks/groups/tgrp_123"]["read"] == 600
+    assert timeouts["/v1/tasks/groups/tgrp_456/events"]["read"] == 600
+    assert timeouts["/v1/tasks/groups/tgrp_789/events"]["read"] == 600
+
+
+@pytest.mark.parametrize("sync", [True, False], ids=["sync", "async"])
+async def test_resumable_stream_resumes_after_idle_timeout(sync: bool) -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) == 1:
+            return _sse_response(
+                request,
+                [b"retry: 0\n", _status_event("1"), b": heartbeat\n"],
+                sync=sync,
+                drop=False,
+                error=httpx.ReadTimeout,
+            )
+        return _sse_response(request, [_status_event("2")], sync=sync, drop=False)
+
+    client = _make_client(handler, sync=sync, stream_idle_timeout=15)
+    stream = client.task_group.events("tgrp_123")
+    if not isinstance(stream, ResumableStream):
+        stream = await stream
+
+    events = await _collect(stream)
+
+    assert [event.event_id for event in events] == ["1", "2"]
+    assert requests[1].url.params["last_event_id"] == "1"
+    assert requests[1].extensions["timeout"]["read"] == 15
+
+
+@pytest.mark.parametrize("sync", [True, False], ids=["sync", "async"])
+async def test_stream_idle_timeout_raises_api_timeout_error(sync: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_streaming, "_reconnect_delay", lambda _failures, *, retry: 0)  # noqa: ARG005
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return _sse_response(request, [b": heartbeat\n"], sync=sync, drop=False, error=httpx.ReadTimeout)
+
+    client = _make_client(handler, sync=sync, stream_idle_timeout=15)
+    stream = client.task_group.events("tgrp_123")
+    if not isinstance(stream, ResumableStream):
+        stream = await stream
+    with pytest.raises(APITimeoutError):
+        await _collect(stream)
+
+    # plain streams raise right away
+    response = _sse_response(httpx.Request("GET", base_url), [], sync=sync, drop=False, error=httpx.ReadTimeout)
+    plain_stream: Stream[object] | AsyncStream[object] = (
+        Stream(cast_to=object, client=client, response=response)
+        if isinstance(client, Parallel)
+        else AsyncStream(cast_to=object, client=client, response=response)
+    )
+    with pytest.raises(APITimeoutError):
+        await _collect(plain_stream)
+
+
+@pytest.mark.parametrize("sync", [True, False], ids=["sync", "async"])
+async def test_iter_json_and_iter_data(sync: bool) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return _sse_response(request, [_status_event("1"), _status_event("2")], sync=sync, drop=False)
+
+    client = _make_client(handler, sync=sync)
+    streams: list[Any] = []
+    for _ in range(2):
+        stream = client.task_group.events("tgrp_123")
+        streams.append(stream if isinstance(stream, ResumableStream) else await stream)
+
+    if sync:
+        payloads = list(streams[0].iter_json())
+        data = list(streams[1].iter_data())
+    else:
+        payloads = [payload async for payload in streams[0].iter_json()]
+        data = [chunk async for chunk in streams[1].iter_data()]
+
+    assert [type(payload) for payload in payloads] == [dict, dict]
+    assert [payload["event_id"] for payload in payloads] == ["1", "2"]
+    assert data == [_status_event(event_id).split(b"data: ")[1].rstrip(b"\n") for event_id in ["1", "2"]]
+    assert streams[0].response.is_closed
+    assert streams[1].response.is_closed
+
+
+@pytest.mark.parametrize("sync", [True, False], ids=["sync", "async"])
+async def test_resumable_stream_iter_data_resumes(sync: bool) -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) == 1:
+            return _sse_response(request, [b"retry: 0\n", _status_event("1")], sync=sync, drop=True)
+        return _sse_response(request, [_status_event("2")], sync=sync, drop=False)
+
+    client = _make_client(handler, sync=sync)
+    stream = client.task_group.events("tgrp_123")
+    if isinstance(stream, ResumableStream):
+        data = list(stream.iter_data())
+    else:
+        data = [chunk async for chunk in (await stream).iter_data()]
+
+    assert [json.loads(chunk)["event_id"] for chunk in data] == ["1", "2"]
+    assert requests[1].url.params["last_event_id"] == "1"
+
+
+def test_server_sent_event_raw_data() -> None:
+    sse = ServerSentEvent(data="caf\u00e9")
+    assert sse.raw_data == "caf\u00e9".encode()
+
+    sse = ServerSentEvent(data="caf\u00e9".encode())
+    assert sse.raw_data == "caf\u00e9".encode()
+    assert sse.data == "caf\u00e9"
+
+
+def test_server_sent_event_json_uses_client_codec(monkeypatch: pytest.MonkeyPatch) -> None:
+    # use the client's own decoder rather than the one the `sse_decoder` fixture sets
+    monkeypatch.undo()
+    loaded: list[str | bytes] = []
+
+    class RecordingCodec(JSONCodec):
+        def loads(self, data: str | bytes) -> Any:
+            loaded.append(data)
+            return super().loads(data)
+
+    client = Parallel(base_url=base_url, api_key=api_key, json_codec=RecordingCodec())
+    events = list(client._make_sse_decoder().iter_bytes(iter([b'data: {"foo": true}\n\n'])))
+
+    assert [sse.json() for sse in events] == [{"foo": True}]
+    assert loaded == [b'{"foo": true}']
+    assert ServerSentEvent(data='{"foo": 1}').json() == {"foo": 1}
+
+
+def _counting_body(n_events: int, reads: list[int]) -> AsyncIterator[bytes]:
+    async def body() -> AsyncIterator[bytes]:
+        for i in range(n_events):
+            reads.append(i)
+            yield f'data: {{"index": {i}}}\n\n'.encode()
+
+    return body()
+
+
+async def test_prefetch_reads_ahead_with_backpressure(async_client: AsyncParallel) -> None:
+    reads: list[int] = []
+    response = httpx.Response(200, content=_counting_body(10, reads))
+    stream = AsyncStream(cast_to=object, client=async_client, response=response).prefetch(3)
+
+    assert await stream.__anext__() == {"index": 0}
+    await asyncio.sleep(0.01)
+
+    # 3 events are buffered and the 5th is waiting for space, the rest of the body isn't read
+    assert len(reads) == 5
+    assert [item async for item in stream] == [{"index": i} for i in range(1, 10)]
+    assert response.is_closed
+
+
+async def test_prefetch_close_cancels_reading(async_client: AsyncParallel) -> None:
+    reads: list[int] = []
+    response = httpx.Response(200, content=_counting_body(10, reads))
+    stream = AsyncStream(cast_to=object, client=async_client, response=response).prefetch(2)
+
+    assert await stream.__anext__() == {"index": 0}
+    await asyncio.sleep(0.01)
+    prefetcher = stream._prefetcher
+    assert prefetcher is not None
+    assert prefetcher._task is not None and not prefetcher._task.done()
+
+    await stream.close()
+
+    assert prefetcher._task.done()
+    assert response.is_closed
+    assert len(reads) == 4
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+
+
+async def test_prefetch_iter_json_and_errors(async_client: AsyncParallel) -> None:
+    reads: list[int] = []
+    response = httpx.Response(200, content=_counting_body(5, reads))
+    stream = AsyncStream(cast_to=object, client=async_client, response=response).prefetch(2)
+    assert [item async for item in stream.iter_json()] == [{"index": i} for i in range(5)]
+
+    async def failing_body() -> AsyncIterator[bytes]:
+        yield b'data: {"index": 0}\n\n'
+        raise httpx.ReadTimeout("timed out")
+
+    response = httpx.Response(200, content=failing_body(), request=httpx.Request("GET", base_url))
+    stream = AsyncStream(cast_to=object, client=async_client, response=response).prefetch(2)
+    assert await stream.__anext__() == {"index": 0}
+    with pytest.raises(APITimeoutError):
+        await stream.__anext__()
+    assert response.is_closed
+
+
+async def test_prefetch_cancelled_task_ends_iteration(async_client: AsyncParallel) -> None:
+    reads: list[int] = []
+    response = httpx.Response(200, content=_counting_body(10, reads))
+    stream = AsyncStream(cast_to=object, client=async_client, response=response).prefetch(2)
+
+    assert await stream.__anext__() == {"index": 0}
+    prefetcher = stream._prefetcher
+    assert prefetcher is not None and prefetcher._task is not None
+    prefetcher._task.cancel()
+
+    # the buffered events are still delivered, and the consumer isn't left waiting after them
+    items: list[object] = []
+    with anyio.fail_after(1):
+        async for item in stream:
+            items.append(item)
+    assert items == [{"index": i} for i in range(1, len(items) + 1)]
+
+
+async def test_prefetch_is_cancelled_when_leaving_stream(async_client: AsyncParallel) -> None:
+    response = httpx.Response(200, content=_counting_body(10, []))
+    async with AsyncStream(cast_to=object, client=async_client, response=response).prefetch(2) as stream:
+        async for _ in stream.iter_json():
+            break
+        prefetcher = stream._prefetcher
+        assert prefetcher is not None and prefetcher._task is not None
+        await asyncio.sleep(0.01)
+        assert not prefetcher._task.done()
+
+    assert prefetcher._task.done()
+
+
+async def test_prefetch_is_cancelled_when_dropped() -> None:
+    async def events() -> AsyncIterator[int]:
+        i = 0
+        while True:
+            yield i
+            i += 1
+
+    prefetcher = _AsyncPrefetcher(events(), max_items=2)
+    assert await prefetcher.__anext__() == 0
+    task = prefetcher._task
+    assert task is not None
+
+    del prefetcher
+    gc.collect()
+    await asyncio.sleep(0.01)
+    assert task.cancelled()
+
+
+def test_prefetch_validates_max_events(async_client: AsyncParallel) -> None:
+    stream = AsyncStream(cast_to=object, client=async_client, response=httpx.Response(200, content=b""))
+    with pytest.raises(ValueError, match="max_events"):
+        stream.prefetch(0)
+
+
+def test_reconnect_delay() -> None:
+    assert _streaming._reconnect_delay(1, retry=3000) == 3.0
+    assert _streaming._reconnect_delay(2, retry=3000) == 6.0
+    assert _streaming._reconnect_delay(5, retry=3000) == 8.0
+    assert _streaming._reconnect_delay(5, retry=20_000) == 20.0
+    assert 0.375 <= _streaming._reconnect_delay(1, retry=None) <= 0.5
+    assert 6 <= _streaming._reconnect_delay(10, retry=None) <= 8
+
+
 async def to_aiter(iter: Iterator[bytes]) -> AsyncIterator[bytes]:
     for chunk in iter:
         yield chunk
@@ -2,18 +2,21 @@ from __future__ import annotations
 
 import io
 import pathlib
+import threading
 from typing import Any, Dict, List, Union, TypeVar, Iterable, Optional, cast
 from datetime import date, datetime
 from typing_extensions import Required, Annotated, TypedDict
 
 import pytest
 
-from parallel._types import Base64FileInput, omit, not_given
+from parallel._types import RawJSON, Base64FileInput, omit, not_given
 from parallel._utils import (
     PropertyInfo,
     transform as _transform,
     parse_datetime,
     async_transform as _async_transform,
+    maybe_transform as _maybe_transform,
+    async_maybe_transform as _async_maybe_transform,
 )
 from parallel._compat import PYDANTIC_V1
 from parallel._models import BaseModel
@@ -458,3 +461,143 @@ async def test_strips_notgiven(use_async: bool) -> None:
 async def test_strips_omit(use_async: bool) -> None:
     assert await transform({"foo_bar": "bar"}, Foo1, use_async) == {"fooBar": "bar"}
     assert await transform({"foo_bar": omit}, Foo1, use_async) == {}
+
+
+class PlainDict(TypedDict, total=False):
+    name: str
+    tags: List[str]
+    meta: Dict[str, Union[str, int]]
+
+
+class TreeNode(TypedDict, total=False):
+    node_name: Annotated[str, PropertyInfo(alias="nodeName")]
+    children: Iterable[TreeNode]
+
+
+@parametrize
+@pytest.mark.asyncio
+async def test_transform_skipping_typeddict(use_async: bool) -> None:
+    # nothing in this type needs to be transformed, so values are only copied
+    tags = ["a", "b"]
+    data: PlainDict = {"name": "foo", "tags": tags, "meta": {"a": 1}}
+    transformed = await transform({**data, "meta": not_given}, PlainDict, use_async)
+    assert transformed == {"name": "foo", "tags": ["a", "b"]}
+    assert transformed["tags"] is tags
+
+    assert await transform([data, data], List[PlainDict], use_async) == [data, data]
+    # values without anything to remove aren't copied at all
+    assert await transform(data, PlainDict, use_async) is data
+
+
+@parametrize
+@pytest.mark.asyncio
+async def test_transform_returns_unchanged_values_as_is(use_async: bool) -> None:
+    from parallel.types.task_group_add_runs_params import TaskGroupAddRunsParams
+
+    plain_run: Any = {"input": {"company": "Parallel"}, "processor": "core", "metadata": {"index": 0}}
+    dated_run: Any = {
+        "input": {"company": "Parallel"},
+        "processor": "core",
+        "source_policy": {"include_domains": ["example.com"], "after_date": date(2025, 1, 1)},
+    }
+    inputs = [plain_run, dated_run]
+    transformed = await transform({"inputs": inputs}, TaskGroupAddRunsParams, use_async)
+
+    # only the values that contain a formatted date are copied
+    assert transformed["inputs"] is not inputs
+    assert transformed["inputs"][0] is plain_run
+    assert transformed["inputs"][1] is not dated_run
+    assert transformed["inputs"][1]["input"] is dated_run["input"]
+    assert transformed["inputs"][1]["source_policy"] == {"include_domains": ["example.com"], "after_date": "2025-01-01"}
+    assert list(transformed["inputs"][1]) == ["input", "processor", "source_policy"]
+    assert dated_run["source_policy"]["after_date"] == date(2025, 1, 1)
+
+
+@parametrize
+@pytest.mark.asyncio
+async def test_recursive_typeddict(use_async: bool) -> None:
+    data: TreeNode = {"node_name": "root", "children": iter([{"node_name": "leaf", "children": []}])}
+    assert await transform(data, TreeNode, use_async) == {
+        "nodeName": "root",
+        "children": [{"nodeName": "leaf", "children": []}],
+    }
+
+
+@parametrize
+@pytest.mark.asyncio
+async def test_compiled_matches_recursive(use_async: bool) -> None:
+    from parallel._utils._transform import _transform_recursive
+    from parallel.types.task_group_add_runs_params import TaskGroupAddRunsParams
+
+    params: Any = {
+        "inputs": [
+            {
+                "input": {"company": f"Company {i}"},
+                "processor": "core",
+                "metadata": {"index": i},
+                "source_policy": {"include_domains": ["example.com"], "after_date": date(2025, 1, 1)},
+                "task_spec": {"output_schema": {"type": "json", "json_schema": {"type": "object"}}},
+                "mcp_servers": ({"name": "server", "url": "https://example.com"},),
+            }
+            for i in range(3)
+        ],
+        "default_task_spec": MyModel(foo="bar"),
+        "betas": ["mcp-server-2025-07-17"],
+    }
+    expected = _transform_recursive(params, annotation=TaskGroupAddRunsParams)
+    assert await transform(params, TaskGroupAddRunsParams, use_async) == expected
+    assert expected["inputs"][0]["source_policy"]["after_date"] == "2025-01-01"
+
+
+@parametrize
+@pytest.mark.asyncio
+async def test_maybe_transform_uses_compiled_transformers(use_async: bool) -> None:
+    from parallel._utils._transform import _compile
+    from parallel.types.task_group_add_runs_params import TaskGroupAddRunsParams
+
+    _compile.cache_clear()
+    run: Any = {"input": {"company": "Parallel"}, "processor": "core"}
+    params: Any = {"inputs": [run], "betas": not_given}
+    if use_async:
+        transformed = await _async_maybe_transform(params, TaskGroupAddRunsParams)
+        assert await _async_maybe_transform(None, TaskGroupAddRunsParams) is None
+    else:
+        transformed = _maybe_transform(params, TaskGroupAddRunsParams)
+        assert _maybe_transform(None, TaskGroupAddRunsParams) is None
+
+    assert transformed == {"inputs": [run]}
+    assert transformed["inputs"][0] is run
+    assert _compile.cache_info().currsize > 0
+
+
+class ThreadRecordingIO(io.BytesIO):
+    def __init__(self, initial_bytes: bytes) -> None:
+        super().__init__(initial_bytes)
+        self.read_from: list[threading.Thread] = []
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        self.read_from.append(threading.current_thread())
+        return super().read(size)
+
+
+@parametrize
+@pytest.mark.asyncio
+async def test_base64_file_input_thread(use_async: bool) -> None:
+    file = ThreadRecordingIO(b"Hello, world!")
+    assert await transform({"foo": file}, TypedDictBase64Input, use_async) == {"foo": "SGVsbG8sIHdvcmxkIQ=="}  # type: ignore[comparison-overlap]
+
+    # async transforms read files from a worker thread so the event loop isn't blocked
+    if use_async:
+        assert file.read_from[0] is not threading.current_thread()
+    else:
+        assert file.read_from == [threading.current_thread()]
+
+
+@parametrize
+@pytest.mark.asyncio
+async def test_raw_json_passthrough(use_async: bool) -> None:
+    raw = RawJSON(b'{"foo_bar": "bar"}')
+    assert await transform(raw, Foo1, use_async) is raw
+
+    transformed = await transform({"foo": [raw]}, TypedDictIterableUnion, use_async)
+    assert transformed == {"FOO": [raw]}
@@ -5,7 +5,7 @@ from typing import Union
 
 import pydantic
 
-from parallel import _compat
+from parallel import RawJSON, _compat
 from parallel._utils._json import openapi_dumps
 
 
@@ -124,3 +124,14 @@ class TestOpenapiDumps:
         data = {"model": model_with_values}
         json_bytes = openapi_dumps(data)
         assert json_bytes == b'{"model":{"name":"Frank","email":"frank@example.com","phone":null}}'
+
+    def test_raw_json(self) -> None:
+        assert openapi_dumps(RawJSON(b'{"a": [1, 2]}')) == b'{"a": [1, 2]}'
+
+        data = {
+            "inputs": [RawJSON(b'{"input": "x"}'), RawJSON("[1, 2]"), {"input": "y"}],
+            # strings that look like the placeholders for raw values are left alone
+            "text": "\x00 \\u0000 0:0",
+        }
+        json_bytes = openapi_dumps(data)
+        assert json_bytes == b'{"inputs":[{"input": "x"},[1, 2],{"input":"y"}],"text":"\\u0000 \\\\u0000 0:0"}'